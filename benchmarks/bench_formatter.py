@@ -0,0 +1,71 @@
+"""Records/sec of `JsonFormatter` against the original implementation
+
+    python -m benchmarks.bench_formatter [--records 100000]
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from datetime import datetime, timezone
+from typing import Any
+
+from sieve.logger import JSON_BACKEND, JsonFormatter
+
+
+class LegacyJsonFormatter(JsonFormatter):
+    """`JsonFormatter.format` as it was before the fast path"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "logger": {"name": record.name, "thread_name": record.threadName},
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "function_name": record.funcName,
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+        }
+        for extra in record.__dict__.keys() - JsonFormatter._RESERVED_ATTRIBUTES:
+            payload[extra] = getattr(record, extra)
+        return json.dumps(payload)
+
+
+def make_records(count: int, extras: bool) -> list[logging.LogRecord]:
+    records = []
+    for i in range(count):
+        record = logging.LogRecord(
+            "sieve.driver", logging.INFO, __file__, 1, "[driver] GET: %s", (f"/jobs/{i}",), None
+        )
+        if extras:
+            record.xpath = "//ul/li"
+            record.wait_seconds = 0.25
+        records.append(record)
+    return records
+
+
+def records_per_second(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"json encoder: {JSON_BACKEND}")
+    records_per_second(JsonFormatter(), make_records(1000, extras=True))  # warm up
+    for extras in (False, True):
+        records = make_records(args.records, extras)
+        legacy = records_per_second(LegacyJsonFormatter(), records)
+        fast = records_per_second(JsonFormatter(), records)
+        label = "with extras" if extras else "no extras"
+        print(
+            f"{label:>12}: legacy {legacy:>10,.0f}/s  fast {fast:>10,.0f}/s  ({fast / legacy:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
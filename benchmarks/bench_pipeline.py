@@ -0,0 +1,202 @@
+"""End-to-end scrape throughput against recorded pages served by `ReplayRemote`
+
+    python -m benchmarks.bench_pipeline [--pages 4] [--latency get=0.02] [--output run.json]
+    python -m benchmarks.bench_pipeline --update-baseline
+
+Each results page is loaded, its cards extracted in one call, then every card's detail page is
+opened and its description read through `Driver.element`. WebDriver commands sleep for the
+injected latency, so the numbers track round trips rather than the speed of this machine. The run
+exits with status 1 when a metric regresses past the tolerance stored in the baseline.
+"""
+
+import argparse
+import json
+import logging
+import math
+import resource
+import sys
+import tempfile
+import time
+
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from benchmarks.replay import ReplayRemote, page_loader
+from sieve.driver import Driver
+from sieve.screenshot import ScreenshotPolicy
+
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+BASELINE = Path(__file__).parent / "baselines" / "pipeline.json"
+
+RESULTS_URL = "https://www.linkedin.com/jobs/search?keywords=python&start="
+DETAIL_URL = "https://www.linkedin.com/jobs/view/"
+
+CARDS = "//ul[contains(@class, 'jobs-search__results-list')]/li"
+CARD_FIELDS = {
+    "title": ".//h3[contains(@class, 'base-search-card__title')]",
+    "company": ".//h4[contains(@class, 'base-search-card__subtitle')]",
+    "location": ".//span[contains(@class, 'job-search-card__location')]",
+    "salary": ".//span[contains(@class, 'job-search-card__salary-info')]",
+    "date": ".//time/@datetime",
+    "link": ".//a[contains(@class, 'base-card__full-link')]/@href",
+}
+DESCRIPTION = "//div[contains(@class, 'show-more-less-html__markup')]"
+
+# seconds per WebDriver command, roughly a browserless container on the same host; screenshot
+# commands are per 1000px of captured height
+DEFAULT_LATENCY = {
+    "default": 0.002,
+    "get": 0.02,
+    "element_screenshot": 0.012,
+    "screenshot": 0.012,
+    "cdp:Page.captureScreenshot": 0.012,
+}
+
+# metrics where a larger value is an improvement; every other metric should go down
+HIGHER_IS_BETTER = {"postings_per_sec"}
+DEFAULT_TOLERANCE = 0.2
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, `q` in [0, 100]"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run(
+    pages: int,
+    latency: Mapping[str, float],
+    screenshots: int,
+    screenshot_mode: str = "viewport",
+) -> dict[str, Any]:
+    loader = page_loader(
+        {
+            RESULTS_URL: (FIXTURES / "search_results.html").read_text(encoding="utf-8"),
+            DETAIL_URL: (FIXTURES / "job_detail.html").read_text(encoding="utf-8"),
+        }
+    )
+    remote = ReplayRemote(loader, latency)
+    screenshot_dir = tempfile.TemporaryDirectory()
+    policy = ScreenshotPolicy(mode=screenshot_mode, directory=screenshot_dir.name)  # type: ignore
+    driver = Driver(remote, policy)  # type: ignore[arg-type]
+
+    element_seconds: list[float] = []
+    postings = 0
+    start = time.perf_counter()
+    for page in range(pages):
+        driver.get(f"{RESULTS_URL}{page * 25}")
+        for card in driver.extract(CARDS, CARD_FIELDS):
+            driver.get(card["link"] or DETAIL_URL)
+            element_start = time.perf_counter()
+            driver.element(DESCRIPTION).text  # pylint: disable = expression-not-assigned
+            element_seconds.append(time.perf_counter() - element_start)
+            postings += 1
+    elapsed = time.perf_counter() - start
+    scrape_calls = sum(remote.calls.values())
+
+    screenshot_seconds: list[float] = []
+    for _ in range(screenshots):
+        screenshot_start = time.perf_counter()
+        driver.save_screenshot("ss.png")
+        screenshot_seconds.append(time.perf_counter() - screenshot_start)
+    if driver.last_screenshot:
+        driver.last_screenshot.result()
+    screenshot_dir.cleanup()
+
+    return {
+        "metrics": {
+            "postings_per_sec": round(postings / elapsed, 2),
+            "webdriver_calls_per_posting": round(scrape_calls / postings, 3),
+            "element_p50_ms": round(percentile(element_seconds, 50) * 1000, 3),
+            "element_p95_ms": round(percentile(element_seconds, 95) * 1000, 3),
+            "save_screenshot_p50_ms": round(percentile(screenshot_seconds, 50) * 1000, 3),
+            "save_screenshot_p95_ms": round(percentile(screenshot_seconds, 95) * 1000, 3),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        },
+        "postings": postings,
+        "calls": dict(remote.calls),
+        "latency": dict(latency),
+    }
+
+
+def regressions(
+    metrics: Mapping[str, float],
+    baseline: Mapping[str, float],
+    tolerance: Mapping[str, float],
+) -> list[str]:
+    """Describe every baseline metric that got worse by more than its tolerance"""
+    failures = []
+    for name, expected in baseline.items():
+        actual = metrics[name]
+        allowed = tolerance.get(name, tolerance.get("default", DEFAULT_TOLERANCE))
+        if name in HIGHER_IS_BETTER:
+            regressed = actual < expected * (1 - allowed)
+        else:
+            regressed = actual > expected * (1 + allowed)
+        if regressed:
+            failures.append(f"{name}: {actual} vs baseline {expected} (tolerance {allowed:.0%})")
+    return failures
+
+
+def parse_latency(values: Sequence[str]) -> dict[str, float]:
+    latency = dict(DEFAULT_LATENCY)
+    for value in values:
+        command, _, seconds = value.partition("=")
+        latency[command] = float(seconds)
+    return latency
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=4, help="results pages of 25 postings")
+    parser.add_argument("--screenshots", type=int, default=20)
+    parser.add_argument(
+        "--screenshot-mode", choices=["viewport", "full_page", "dom"], default="viewport"
+    )
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="COMMAND=SECONDS",
+        help="injected latency per WebDriver command, `default` applies to the rest",
+    )
+    parser.add_argument("--output", type=Path, help="write the results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    results = run(args.pages, parse_latency(args.latency), args.screenshots, args.screenshot_mode)
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+
+    if args.update_baseline:
+        tolerance = {"default": DEFAULT_TOLERANCE}
+        if args.baseline.exists():
+            tolerance = json.loads(args.baseline.read_text(encoding="utf-8"))["tolerance"]
+        baseline = {"metrics": results["metrics"], "tolerance": tolerance}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    failures = regressions(results["metrics"], baseline["metrics"], baseline["tolerance"])
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Query latency of `PostingSearch` against `ILIKE` scans on a synthetic `postings` table
+
+    python -m benchmarks.bench_search [--rows 1000000] [--keep] [--dsn DSN]
+
+Needs a Postgres server, the one of the docker setup (`DB_*` settings) unless `--dsn` is given;
+when none can be reached the benchmark reports itself skipped instead of failing. Rows are generated server side in a
+`sieve_bench` schema, which is dropped afterwards unless `--keep` is given, so the real
+`postings` table is never touched. Descriptions draw from a skewed vocabulary so common terms
+match a large share of the table and rare ones a few hundred rows.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import time
+
+from collections.abc import Callable
+
+from psycopg2 import OperationalError
+from psycopg2.pool import ThreadedConnectionPool
+
+from benchmarks.bench_pipeline import percentile
+from sieve.db import connection
+from sieve.search import PostingSearch, SearchCursor, like_pattern
+from sieve.settings import settings
+
+
+SCHEMA_NAME = "sieve_bench"
+
+# the table of docker/init_db.sh before `PostingSearch.ensure_schema`
+CREATE_TABLE = """
+CREATE TABLE postings (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(200) NOT NULL,
+    location VARCHAR(200) NOT NULL,
+    company VARCHAR(200) NOT NULL,
+    salary VARCHAR(200),
+    date DATE NOT NULL,
+    link TEXT NOT NULL,
+    job_desc TEXT,
+    tech VARCHAR(200) NOT NULL,
+    source VARCHAR(200) NOT NULL)
+"""
+
+# `power(random(), 3)` favours the start of the vocabulary, the generate_series bound references
+# the outer row so every row gets its own description
+INSERT_ROWS = """
+INSERT INTO postings (title, location, company, salary, date, link, job_desc, tech, source)
+SELECT
+    (%(titles)s)[1 + i %% array_length(%(titles)s, 1)] || ' ' || i,
+    'Remote',
+    'Company ' || i %% 20000,
+    NULL,
+    DATE '2022-01-01' + i %% 365,
+    'https://www.linkedin.com/jobs/view/' || i,
+    (
+        SELECT string_agg(
+            (%(words)s)[1 + floor(power(random(), 3) * array_length(%(words)s, 1))::int], ' '
+        )
+        FROM generate_series(1, 80 + i %% 40)
+    ),
+    '',
+    'bench'
+FROM generate_series(%(start)s, %(stop)s) AS i
+"""
+
+TITLES = [
+    "Software Engineer",
+    "Senior Python Developer",
+    "Data Engineer",
+    "Backend Engineer",
+    "Site Reliability Engineer",
+    "Machine Learning Engineer",
+    "Platform Engineer",
+    "Full Stack Developer",
+]
+WORDS = (
+    "the and with our team you will experience work build systems data services customers "
+    "python engineer cloud product design develop support remote scale reliable distributed "
+    "aws postgres docker kubernetes django fastapi react typescript kafka spark airflow "
+    "terraform redis graphql elasticsearch snowflake rust golang scala haskell elixir clojure"
+).split()
+
+QUERIES = ["python", "kubernetes terraform", '"distributed systems"', "rust -golang", "haskell"]
+
+BATCH_ROWS = 100_000
+
+
+def timed(func: Callable[[], object], repeat: int) -> list[float]:
+    """Milliseconds of each of `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+    }
+
+
+def bench_pool(dsn: str | None = None) -> ThreadedConnectionPool:
+    """Pool whose connections resolve `postings` to the benchmark schema"""
+    options = f"-c search_path={SCHEMA_NAME},public"
+    if dsn is not None:
+        return ThreadedConnectionPool(minconn=1, maxconn=2, dsn=dsn, options=options)
+    return ThreadedConnectionPool(
+        minconn=1,
+        maxconn=2,
+        dbname=settings.db_name,
+        user=settings.db_user.get_secret_value(),
+        password=settings.db_pass.get_secret_value(),
+        host=settings.db_host,
+        options=options,
+    )
+
+
+def load(pool: ThreadedConnectionPool, rows: int) -> float:
+    start = time.perf_counter()
+    with connection(pool) as conn, conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA_NAME} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA_NAME}")
+        cur.execute(CREATE_TABLE)
+        cur.execute("CREATE UNIQUE INDEX title_company ON postings (title, company)")
+    for batch_start in range(1, rows + 1, BATCH_ROWS):
+        with connection(pool) as conn, conn.cursor() as cur:
+            cur.execute(
+                INSERT_ROWS,
+                {
+                    "titles": TITLES,
+                    "words": WORDS,
+                    "start": batch_start,
+                    "stop": min(batch_start + BATCH_ROWS - 1, rows),
+                },
+            )
+    with connection(pool) as conn, conn.cursor() as cur:
+        cur.execute("ANALYZE postings")
+    return time.perf_counter() - start
+
+
+def scan(pool: ThreadedConnectionPool, term: str, limit: int) -> None:
+    """What a "postings mentioning X" query looked like before the search column"""
+    with connection(pool) as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT id FROM postings WHERE job_desc ILIKE %s ORDER BY id DESC LIMIT %s",
+            (like_pattern(term), limit),
+        )
+        cur.fetchall()
+
+
+def page_through(search: PostingSearch, query: str, pages: int) -> list[float]:
+    """Milliseconds per page when following cursors `pages` deep"""
+    samples = []
+    after: SearchCursor | None = None
+    for _ in range(pages):
+        start = time.perf_counter()
+        page = search.search(query, after=after)
+        samples.append((time.perf_counter() - start) * 1000)
+        if page.next is None:
+            break
+        after = page.next
+    return samples
+
+
+def run(pool: ThreadedConnectionPool, rows: int, repeat: int, pages: int, keep: bool) -> dict:
+    search = PostingSearch(pool)
+    results: dict = {"rows": rows}
+    try:
+        results["load_seconds"] = round(load(pool, rows), 1)
+        results["ilike_scan"] = {
+            term: summary(timed(functools.partial(scan, pool, term, search.PAGE_SIZE), repeat))
+            for term in ("python", "haskell")
+        }
+
+        start = time.perf_counter()
+        search.ensure_schema()
+        with connection(pool) as conn, conn.cursor() as cur:
+            cur.execute("ANALYZE postings")
+        results["ensure_schema_seconds"] = round(time.perf_counter() - start, 1)
+
+        results["first_page"] = {
+            query: summary(timed(functools.partial(search.search, query), repeat))
+            for query in QUERIES
+        }
+        results["keyset_pages"] = {
+            query: summary(page_through(search, query, pages)) for query in QUERIES[:2]
+        }
+        results["trigram_filter"] = summary(
+            timed(functools.partial(search.search, "python", title="reliability"), repeat)
+        )
+    finally:
+        if not keep:
+            with connection(pool) as conn, conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA_NAME} CASCADE")
+        pool.closeall()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each query")
+    parser.add_argument("--pages", type=int, default=40, help="keyset pages to follow")
+    parser.add_argument("--keep", action="store_true", help="leave the benchmark schema behind")
+    parser.add_argument("--dsn", help="libpq connection string, defaults to the DB_* settings")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    try:
+        pool = bench_pool(args.dsn)
+    except OperationalError as e:
+        print(json.dumps({"skipped": f"no Postgres reachable: {str(e).strip()}"}, indent=2))
+        return
+    print(json.dumps(run(pool, args.rows, args.repeat, args.pages, args.keep), indent=2))
+
+
+if __name__ == "__main__":
+    main()
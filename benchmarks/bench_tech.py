@@ -0,0 +1,94 @@
+"""Descriptions/sec of `TechTagger` against one regex per alias
+
+    python -m benchmarks.bench_tech [--descriptions 200] [--dictionary-size 100 500]
+
+Descriptions are synthetic: about 400 words of filler with a handful of technologies mixed in.
+Larger dictionaries pad the default one with made up technologies, the cost the regex loop pays
+for every alias and the automaton does not.
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+
+from collections.abc import Iterable, Mapping
+
+from sieve.tech import DEFAULT_DICTIONARY, TechTagger
+
+
+FILLER = (
+    "we are looking for an engineer to join our team and build reliable services that scale "
+    "you will work with product and design on features for customers across the world with "
+    "experience in distributed systems testing and code review as well as strong communication"
+).split()
+
+
+class NaiveTagger:
+    """The obvious implementation: a word-bounded regex per alias, each scanning the whole text"""
+
+    def __init__(self, dictionary: Mapping[str, Iterable[str]]) -> None:
+        self.patterns = [
+            (tech, re.compile(rf"(?<!\w){re.escape(alias)}(?!\w)", re.IGNORECASE))
+            for tech, aliases in dictionary.items()
+            for alias in {tech, *aliases}
+        ]
+
+    def tag(self, text: str) -> list[str]:
+        found: dict[str, int] = {}
+        for tech, pattern in self.patterns:
+            match = pattern.search(text)
+            if match is not None:
+                found[tech] = min(found.get(tech, match.start()), match.start())
+        return sorted(found, key=found.__getitem__)
+
+
+def dictionary_of(size: int) -> dict[str, list[str]]:
+    dictionary = {tech: list(aliases) for tech, aliases in DEFAULT_DICTIONARY.items()}
+    for i in range(size - len(dictionary)):
+        dictionary[f"techno{i}"] = [f"techno{i}js"]
+    return dictionary
+
+
+def make_descriptions(count: int, dictionary: Mapping[str, Iterable[str]]) -> list[str]:
+    rng = random.Random(42)
+    names = list(dictionary)
+    descriptions = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=400)
+        for tech in rng.sample(names, 8):
+            words.insert(rng.randrange(len(words)), tech.title())
+        descriptions.append(" ".join(words) + ".")
+    return descriptions
+
+
+def per_second(tagger: TechTagger | NaiveTagger, descriptions: list[str]) -> float:
+    start = time.perf_counter()
+    for description in descriptions:
+        tagger.tag(description)
+    return len(descriptions) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--descriptions", type=int, default=200)
+    parser.add_argument("--dictionary-size", type=int, nargs="+", default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    for size in args.dictionary_size:
+        dictionary = dictionary_of(size)
+        descriptions = make_descriptions(args.descriptions, dictionary)
+        tagger, naive = TechTagger(dictionary), NaiveTagger(dictionary)
+        mismatches = sum(tagger.tag(text) != naive.tag(text) for text in descriptions[:100])
+        automaton = per_second(tagger, descriptions)
+        regex = per_second(naive, descriptions)
+        print(
+            f"{len(dictionary):>5} techs: regex {regex:>8,.0f}/s  automaton {automaton:>8,.0f}/s  "
+            f"({automaton / regex:.1f}x, {mismatches} mismatches)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Fake `selenium.webdriver.Remote` that replays recorded HTML pages"""
+
+import base64
+import time
+
+from collections import Counter
+from collections.abc import Callable, Mapping
+
+from lxml import html
+
+from sieve.driver import EXTRACT_SCRIPT
+from sieve.snapshot import SnapshotDriver, node_text, parse_html
+from sieve.wait import OBSERVER_SCRIPT
+
+
+class ReplayWebElement:
+    def __init__(self, remote: "ReplayRemote", element: html.HtmlElement) -> None:
+        self._remote = remote
+        self._element = element
+
+    @property
+    def text(self) -> str:
+        self._remote.command("get_element_text")
+        return node_text(self._element) or ""
+
+    def screenshot(self, filename: str) -> bool:
+        self._remote.command("element_screenshot", self._remote.window_height)
+        return True
+
+
+class ReplayRemote:
+    """Serves pages from `loader(url)` and sleeps `latency[command]` seconds per WebDriver call
+
+    Every call is counted in `calls`, so a run can report WebDriver round trips per posting. CDP
+    calls are counted as `cdp:<method>`. Screenshot latencies are per 1000px of captured height.
+    """
+
+    PAGE_HEIGHT = 4000
+
+    def __init__(self, loader: Callable[[str], str], latency: Mapping[str, float]) -> None:
+        self._loader = loader
+        self.latency = dict(latency)
+        self.calls: Counter[str] = Counter()
+        self.current_url = "about:blank"
+        self.page_source = "<html></html>"
+        self._tree = parse_html(self.page_source)
+        self.window_handles = ["tab-0"]
+        self._window = {"width": 1200, "height": 800}
+        self.command_executor = ReplayCommandExecutor()
+
+    @property
+    def window_height(self) -> float:
+        return self._window["height"] / 1000
+
+    def command(self, name: str, scale: float = 1) -> None:
+        self.calls[name] += 1
+        delay = self.latency.get(name, self.latency.get("default", 0))
+        if delay:
+            time.sleep(delay * scale)
+
+    def get(self, url: str) -> None:
+        self.command("get")
+        self.current_url = url
+        self.page_source = self._loader(url)
+        self._tree = parse_html(self.page_source, url)
+
+    def find_elements(self, by: str, value: str) -> list[ReplayWebElement]:
+        self.command("find_elements")
+        return self._elements(value)
+
+    def execute_script(self, script: str, *args: object) -> object:
+        self.command("execute_script")
+        if script == EXTRACT_SCRIPT:
+            container_xpath, fields = args
+            snapshot = SnapshotDriver.from_html(self.page_source)
+            return snapshot.extract(str(container_xpath), fields)  # type: ignore[arg-type]
+        if "offsetWidth" in script:
+            return 1920
+        if "offsetHeight" in script:
+            return self.PAGE_HEIGHT
+        return None
+
+    def execute_async_script(self, script: str, *args: object) -> object:
+        self.command("execute_async_script")
+        if script == OBSERVER_SCRIPT:
+            elements = self._elements(str(args[0]))
+            return elements[0] if elements else None
+        return None
+
+    def execute(self, driver_command: str, params: dict) -> dict:
+        cmd = params["cmd"]
+        if cmd == "Page.getLayoutMetrics":
+            self.command(f"cdp:{cmd}")
+            size = {"x": 0, "y": 0, "width": 1920, "height": self.PAGE_HEIGHT}
+            return {"value": {"cssContentSize": size}}
+        if cmd == "Page.captureScreenshot":
+            clip = params["params"].get("clip", {"height": self._window["height"]})
+            self.command(f"cdp:{cmd}", clip["height"] / 1000)
+            return {"value": {"data": base64.b64encode(b"replay").decode()}}
+        self.command(f"cdp:{cmd}")
+        return {"value": {}}
+
+    def get_screenshot_as_png(self) -> bytes:
+        self.command("screenshot", self.window_height)
+        return b"replay"
+
+    def get_window_size(self) -> dict[str, int]:
+        self.command("get_window_size")
+        return dict(self._window)
+
+    def set_window_size(self, width: int, height: int) -> None:
+        self.command("set_window_size")
+        self._window = {"width": width, "height": height}
+
+    def quit(self) -> None:
+        self.command("quit")
+
+    def _elements(self, xpath: str) -> list[ReplayWebElement]:
+        return [
+            ReplayWebElement(self, node)
+            for node in self._tree.xpath(xpath)
+            if isinstance(node, html.HtmlElement)
+        ]
+
+
+class ReplayCommandExecutor:
+    def __init__(self) -> None:
+        self._commands: dict[str, tuple[str, str]] = {}
+
+
+def page_loader(pages: Mapping[str, str], default: str | None = None) -> Callable[[str], str]:
+    """Loader over `{url prefix: html}`; the longest matching prefix wins"""
+    prefixes = sorted(pages, key=len, reverse=True)
+
+    def load(url: str) -> str:
+        for prefix in prefixes:
+            if url.startswith(prefix):
+                return pages[prefix]
+        if default is None:
+            raise KeyError(url)
+        return default
+
+    return load
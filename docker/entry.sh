@@ -10,4 +10,9 @@ set -euo pipefail
 # env variables for cron here. https://stackoverflow.com/a/41938139
 printenv > /etc/environment
 
+# SIEVE_MODE=daemon keeps one resident process instead of a cron tick
+if [ "${SIEVE_MODE:-cron}" = "daemon" ]; then
+    exec python3 -m sieve daemon
+fi
+
 cron -f
@@ -11,6 +11,7 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
     CREATE DATABASE $DB_NAME WITH OWNER $DB_USER;
     GRANT ALL PRIVILEGES ON DATABASE $DB_NAME to $DB_USER;
     \c $DB_NAME $DB_USER;
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
     CREATE TABLE postings (
         id SERIAL PRIMARY KEY,
         title VARCHAR(200) NOT NULL,
@@ -21,6 +22,33 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
         link TEXT NOT NULL,
         job_desc TEXT,
         tech VARCHAR(200) NOT NULL,
-        source VARCHAR(200) NOT NULL);
+        source VARCHAR(200) NOT NULL,
+        search tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(company, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(job_desc, '')), 'C')) STORED,
+        content_hash BYTEA,
+        last_changed TIMESTAMPTZ NOT NULL DEFAULT now());
     CREATE UNIQUE INDEX title_company ON postings (title, company);
+    CREATE INDEX postings_search ON postings USING GIN (search);
+    CREATE INDEX postings_title_trgm ON postings USING GIN (title gin_trgm_ops);
+    CREATE INDEX postings_company_trgm ON postings USING GIN (company gin_trgm_ops);
+    CREATE TABLE posting_signatures (
+        posting_id INTEGER PRIMARY KEY REFERENCES postings (id) ON DELETE CASCADE,
+        content_hash BYTEA NOT NULL,
+        desc_signature BYTEA,
+        card_signature BYTEA);
+    CREATE TABLE posting_buckets (
+        bucket BIGINT NOT NULL,
+        posting_id INTEGER NOT NULL REFERENCES postings (id) ON DELETE CASCADE,
+        PRIMARY KEY (bucket, posting_id));
+    CREATE INDEX posting_buckets_posting_id ON posting_buckets (posting_id);
+    CREATE TABLE posting_seen (
+        posting_id INTEGER PRIMARY KEY REFERENCES postings (id) ON DELETE CASCADE,
+        last_seen TIMESTAMPTZ NOT NULL DEFAULT now());
+    CREATE TABLE crawl_marks (
+        query VARCHAR(200) PRIMARY KEY,
+        newest_date DATE,
+        newest_keys TEXT[] NOT NULL DEFAULT '{}',
+        last_full_sweep TIMESTAMPTZ);
 EOSQL
@@ -1,11 +1,53 @@
+import argparse
+
+from typing import TYPE_CHECKING
+
 from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+if TYPE_CHECKING:
+    from sieve.pool import DriverPool
 
 
 logger = get_logger(__name__)
 
 
-def main() -> None:
-    logger.info("MESSAGE")
+def run(pool: "DriverPool | None" = None) -> None:
+    if pool is None:
+        logger.info("MESSAGE")
+        return
+    # a daemon tick works on a warm session; checkout also recycles stale ones
+    with pool.session():
+        logger.info("MESSAGE")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="sieve")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report per-module import times of a cold start and exit",
+    )
+    commands = parser.add_subparsers(dest="command")
+    daemon = commands.add_parser("daemon", help="stay resident and run on an interval")
+    daemon.add_argument("--interval", type=float, default=settings.daemon_interval_seconds)
+    args = parser.parse_args(argv)
+
+    # pylint: disable = import-outside-toplevel
+    if args.profile_startup:
+        from sieve.profiling import format_report, profile_startup
+
+        print(format_report(profile_startup()))
+        return
+
+    if args.command == "daemon":
+        from sieve.daemon import Daemon
+
+        Daemon(run, interval=args.interval).run()
+        return
+
+    run()
 
 
 if __name__ == "__main__":
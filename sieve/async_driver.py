@@ -0,0 +1,256 @@
+import asyncio
+import base64
+import time
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+import httpx
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from sieve.driver import EXTRACT_SCRIPT, Driver, Record
+from sieve.logger import get_logger
+from sieve.profiles import PROFILES
+from sieve.screenshot import ScreenshotPolicy, ScreenshotWriter, capture_params
+from sieve.settings import settings
+from sieve.wait import BY_XPATH, OBSERVER_SCRIPT, XPathWaiter
+
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+logger = get_logger(__name__)
+
+
+WEBDRIVER_URL = "http://browserless:3000/webdriver"
+
+# W3C web element reference key
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class AsyncElementProtocol(Protocol):
+    async def text(self) -> str:
+        ...
+
+    async def screenshot(self, filename: str) -> bool:
+        ...
+
+
+class AsyncDriverProtocol(Protocol):
+    async def get(self, url: str) -> None:
+        ...
+
+    async def element(self, xpath: str) -> AsyncElementProtocol:
+        ...
+
+    async def extract(self, container_xpath: str, fields: Mapping[str, str]) -> list[Record]:
+        ...
+
+    async def save_screenshot(self, filename: str) -> bool:
+        ...
+
+    async def quit(self) -> None:
+        ...
+
+
+def webdriver_client(url: str = WEBDRIVER_URL, max_connections: int = 100) -> httpx.AsyncClient:
+    """`httpx.AsyncClient` for browserless, meant to be shared by every `AsyncDriver` of a loop"""
+    return httpx.AsyncClient(
+        base_url=url,
+        # the observer wait holds a request open for up to `WAIT_TIME_SECONDS`
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(max_connections=max_connections),
+    )
+
+
+class AsyncElement:
+    def __init__(self, driver: "AsyncDriver", element_id: str) -> None:
+        self._driver = driver
+        self.id = element_id
+
+    async def text(self) -> str:
+        text: str = await self._driver.command("GET", f"/element/{self.id}/text")
+        return text
+
+    async def screenshot(self, filename: str) -> bool:
+        data = await self._driver.command("GET", f"/element/{self.id}/screenshot")
+        await asyncio.to_thread(Path(filename).write_bytes, base64.b64decode(data))
+        return True
+
+
+class AsyncDriver:
+    """`DriverProtocol` counterpart for asyncio, speaking W3C WebDriver to browserless over httpx
+
+    A session holds no thread, only its id, so one event loop can drive as many sessions as
+    browserless will run, all multiplexed over the connection pool of one shared client.
+    """
+
+    POLL_INTERVAL = Driver.POLL_INTERVAL
+    WAIT_TIME_SECONDS = Driver.WAIT_TIME_SECONDS
+    INITIAL_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        session_id: str,
+        screenshot_policy: ScreenshotPolicy | None = None,
+    ) -> None:
+        self.client = client
+        self.session_id = session_id
+        self._waiter = XPathWaiter()
+        self.screenshot_policy = screenshot_policy or ScreenshotPolicy.from_settings()
+        self._screenshots = ScreenshotWriter(self.screenshot_policy)
+        self.last_screenshot: "Future[Path] | None" = None
+
+    @classmethod
+    async def start(
+        cls,
+        client: httpx.AsyncClient,
+        option_overrides: dict | None = None,
+        profile: str | None = None,
+    ) -> "AsyncDriver":
+        """Open a new browserless session configured like `init_driver`"""
+        driver_profile = PROFILES[profile or settings.driver_profile]
+        options = Driver.DRIVER_BASE_CONFIG | driver_profile.options | (option_overrides or {})
+        chrome_options: dict[str, Any] = {"args": [arg for arg in options.values() if arg]}
+        if driver_profile.prefs:
+            chrome_options["prefs"] = driver_profile.prefs
+        capabilities = {"browserName": "chrome", "goog:chromeOptions": chrome_options}
+
+        response = await client.post(
+            "/session", json={"capabilities": {"alwaysMatch": capabilities}}
+        )
+        value = cls._value(response)
+        driver = cls(client, value["sessionId"])
+        logger.info("[driver] async session %s started", driver.session_id)
+
+        await driver.command(
+            "POST",
+            "/window/rect",
+            {"width": settings.driver_width, "height": settings.driver_height},
+        )
+        if driver_profile.blocked_urls:
+            try:
+                await driver.cdp("Network.enable")
+                await driver.cdp("Network.setBlockedURLs", {"urls": driver_profile.blocked_urls})
+            except WebDriverException:
+                logger.warning("[driver] CDP unavailable, resources will not be blocked")
+        return driver
+
+    async def command(self, method: str, path: str, payload: dict | None = None) -> Any:
+        """Send one WebDriver command for this session and return its `value`"""
+        response = await self.client.request(
+            method, f"/session/{self.session_id}{path}", json=payload
+        )
+        return self._value(response)
+
+    @staticmethod
+    def _value(response: httpx.Response) -> Any:
+        try:
+            value = response.json().get("value")
+        except ValueError as exc:
+            raise WebDriverException(f"{response.status_code}: {response.text}") from exc
+        if response.is_success:
+            return value
+        error = value.get("error", "") if isinstance(value, dict) else ""
+        message = value.get("message", response.text) if isinstance(value, dict) else response.text
+        if error == "no such element":
+            raise NoSuchElementException(message)
+        raise WebDriverException(f"{error or response.status_code}: {message}")
+
+    async def cdp(self, cmd: str, params: dict | None = None) -> dict[str, Any]:
+        """Run a Chrome DevTools Protocol command through chromedriver's vendor endpoint"""
+        result: dict[str, Any] = await self.command(
+            "POST", "/goog/cdp/execute", {"cmd": cmd, "params": params or {}}
+        )
+        return result
+
+    async def get(self, url: str) -> None:
+        """Navigate to `url`"""
+        logger.info("[driver] GET: %s", url)
+        await self.command("POST", "/url", {"url": url})
+
+    async def element(self, xpath: str) -> AsyncElement:
+        """Will return the first located `AsyncElement` that matches the `xpath`"""
+        element = await self._wait(xpath)
+        if element is not None:
+            return element
+
+        await self.save_screenshot("ss.png")
+        raise NoSuchElementException(f"No elements found: {xpath}")
+
+    @property
+    def wait_stats(self) -> list[dict]:
+        """Per-XPath wait times recorded by `element`"""
+        return self._waiter.summary()
+
+    async def _wait(self, xpath: str) -> AsyncElement | None:
+        start = time.monotonic()
+        element = await self._find(xpath, deadline=start + self.WAIT_TIME_SECONDS)
+        self._waiter.record(xpath, time.monotonic() - start, found=element is not None)
+        return element
+
+    async def _find(self, xpath: str, deadline: float) -> AsyncElement | None:
+        # same strategy as `XPathWaiter`: an in-page MutationObserver, polling when it cannot run
+        try:
+            found = await self.command(
+                "POST",
+                "/execute/async",
+                {"script": OBSERVER_SCRIPT, "args": [xpath, int(self.WAIT_TIME_SECONDS * 1000)]},
+            )
+            return AsyncElement(self, found[ELEMENT_KEY]) if found else None
+        except WebDriverException:
+            logger.debug("[driver] observer wait failed, polling: %s", xpath, exc_info=True)
+
+        interval = self.INITIAL_POLL_INTERVAL
+        while True:
+            elements = await self.command("POST", "/elements", {"using": BY_XPATH, "value": xpath})
+            if elements:
+                return AsyncElement(self, elements[0][ELEMENT_KEY])
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(interval, self.POLL_INTERVAL, remaining))
+            interval *= 2
+
+    async def extract(self, container_xpath: str, fields: Mapping[str, str]) -> list[Record]:
+        """Same contract as `Driver.extract`"""
+        records: list[Record] = await self.command(
+            "POST",
+            "/execute/sync",
+            {"script": EXTRACT_SCRIPT, "args": [container_xpath, dict(fields)]},
+        )
+        return records
+
+    async def save_screenshot(self, filename: str) -> bool:
+        """Capture the page as `screenshot_policy` describes, written off the event loop"""
+        try:
+            data, extension = await self._capture(self.screenshot_policy)
+        except Exception:
+            logger.exception("[driver] async session %s failed to save screenshot", self.session_id)
+            return False
+        self.last_screenshot = self._screenshots.write(filename, data, extension)
+        return True
+
+    async def _capture(self, policy: ScreenshotPolicy) -> tuple[bytes, str]:
+        if policy.mode == "dom":
+            source: str = await self.command("GET", "/source")
+            return source.encode(), "html"
+
+        try:
+            content = None
+            if policy.mode == "full_page":
+                content = (await self.cdp("Page.getLayoutMetrics"))["cssContentSize"]
+            result = await self.cdp("Page.captureScreenshot", capture_params(policy, content))
+            data = result["data"]
+            return base64.b64decode(data), policy.format
+        except WebDriverException:
+            logger.debug("[driver] CDP screenshot unavailable, using WebDriver", exc_info=True)
+        return base64.b64decode(await self.command("GET", "/screenshot")), "png"
+
+    async def quit(self) -> None:
+        await self.command("DELETE", "")
+        logger.info("[driver] async session %s closed", self.session_id)
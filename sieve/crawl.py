@@ -0,0 +1,173 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta, timezone
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from sieve.db import connection
+from sieve.dedupe import posting_key
+from sieve.driver import Record
+from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+logger = get_logger(__name__)
+
+
+def card_key(card: Record) -> str:
+    return posting_key(card["title"] or "", card["company"] or "").hex()
+
+
+def card_date(card: Record) -> date | None:
+    try:
+        return date.fromisoformat(card["date"] or "")
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class CrawlMark:
+    """High-water mark of a search query: the newest posting date seen and the postings seen on it
+
+    Listing dates only have day resolution, so the keys of every posting on the newest date are
+    kept to tell the ones already crawled from those posted later that same day.
+    """
+
+    query: str
+    newest_date: date | None = None
+    newest_keys: frozenset[str] = field(default_factory=frozenset)
+    last_full_sweep: datetime | None = None
+
+    def seen(self, card: Record) -> bool:
+        posted = card_date(card)
+        if self.newest_date is None or posted is None:
+            return False
+        if posted != self.newest_date:
+            return posted < self.newest_date
+        return card_key(card) in self.newest_keys
+
+    def advance(self, cards: Iterable[Record]) -> "CrawlMark":
+        """Mark with the newest date among `cards` (and among what was already marked)"""
+        newest, keys = self.newest_date, set(self.newest_keys)
+        for card in cards:
+            posted = card_date(card)
+            if posted is None or (newest is not None and posted < newest):
+                continue
+            if posted != newest:
+                newest, keys = posted, set()
+            keys.add(card_key(card))
+        return replace(self, newest_date=newest, newest_keys=frozenset(keys))
+
+    def sweep_due(self, now: datetime, interval: timedelta) -> bool:
+        return self.last_full_sweep is None or now - self.last_full_sweep >= interval
+
+
+class CrawlMarks:
+    """`crawl_marks` table access"""
+
+    def __init__(self, pool: ThreadedConnectionPool | None = None) -> None:
+        self.pool = pool
+
+    def get(self, query: str) -> CrawlMark:
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT newest_date, newest_keys, last_full_sweep FROM crawl_marks WHERE query = %s",
+                (query,),
+            )
+            row = cur.fetchone()
+        if row is None:
+            return CrawlMark(query)
+        newest_date, newest_keys, last_full_sweep = row
+        return CrawlMark(query, newest_date, frozenset(newest_keys or ()), last_full_sweep)
+
+    def save(self, mark: CrawlMark) -> None:
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO crawl_marks (query, newest_date, newest_keys, last_full_sweep)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (query) DO UPDATE SET
+                newest_date = EXCLUDED.newest_date,
+                newest_keys = EXCLUDED.newest_keys,
+                last_full_sweep = EXCLUDED.last_full_sweep
+                """,
+                (mark.query, mark.newest_date, sorted(mark.newest_keys), mark.last_full_sweep),
+            )
+
+
+@dataclass
+class CrawlResult:
+    """`mark` is where the next run should start, saved by `IncrementalCrawl.commit`"""
+
+    query: str
+    cards: list[Record]
+    pages: int
+    full_sweep: bool
+    mark: CrawlMark
+
+
+class IncrementalCrawl:
+    """Pages through a newest-first search only until it reaches postings crawled by a past run
+
+    A page whose last card is already behind the query's `CrawlMark` ends the crawl, as every page
+    after it is older. Every `full_sweep_interval` a run ignores the mark and pages to `max_pages`
+    so edited or re-dated postings are still picked up.
+
+    `crawl` does not move the mark itself: once the cards are stored, `commit` saves the mark of
+    the result, so a run that fails in between crawls the same postings again next time.
+    """
+
+    def __init__(
+        self,
+        marks: CrawlMarks | None = None,
+        max_pages: int | None = None,
+        full_sweep_interval: timedelta | None = None,
+    ) -> None:
+        self.marks = marks or CrawlMarks()
+        self.max_pages = max_pages or settings.crawl_max_pages
+        self.full_sweep_interval = full_sweep_interval or timedelta(
+            hours=settings.crawl_full_sweep_hours
+        )
+
+    def crawl(self, query: str, fetch_page: Callable[[int], list[Record]]) -> CrawlResult:
+        """Collect the unseen cards of `query`, `fetch_page(n)` returns the cards on page `n`
+
+        The advanced mark is returned in the result, not saved; see `commit`.
+        """
+        now = datetime.now(timezone.utc)
+        mark = self.marks.get(query)
+        full_sweep = mark.sweep_due(now, self.full_sweep_interval)
+
+        fetched: list[Record] = []
+        new: list[Record] = []
+        pages = 0
+        while pages < self.max_pages:
+            cards = fetch_page(pages)
+            pages += 1
+            if not cards:
+                break
+            fetched += cards
+            if full_sweep:
+                new += cards
+                continue
+            unseen = [card for card in cards if not mark.seen(card)]
+            new += unseen
+            if not unseen or mark.seen(cards[-1]):
+                break
+
+        advanced = mark.advance(fetched)
+        if full_sweep:
+            advanced = replace(advanced, last_full_sweep=now)
+        logger.info(
+            "[crawl] %s: %s new postings over %s pages%s",
+            query,
+            len(new),
+            pages,
+            " (full sweep)" if full_sweep else "",
+            extra={"query": query, "new_postings": len(new), "pages": pages},
+        )
+        return CrawlResult(query, new, pages, full_sweep, advanced)
+
+    def commit(self, result: CrawlResult) -> None:
+        """Save the mark of `result`, once its cards have been stored"""
+        self.marks.save(result.mark)
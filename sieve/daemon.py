@@ -0,0 +1,88 @@
+import math
+import signal
+import threading
+import time
+
+from collections.abc import Callable, Sequence
+from types import FrameType
+
+from sieve.db import ensure_schema
+from sieve.logger import get_logger, start_logging_workers
+from sieve.pool import DriverPool
+
+
+logger = get_logger(__name__)
+
+
+class Daemon:
+    """Runs `job` every `interval` seconds in a resident process
+
+    Ticks are scheduled against the start time rather than the end of the previous run, so they do
+    not drift; ticks missed by an overrunning job are skipped, not queued. SIGTERM/SIGINT stop the
+    loop once the in-flight job has finished, then the warm `DriverPool` is closed.
+
+    Before the first tick `warmers` start the driver sessions, the Postgres pool (bringing the
+    schema up to date) and the Datadog worker, so no run pays for them; one that fails is logged
+    and left to the first job.
+    """
+
+    def __init__(
+        self,
+        job: Callable[[DriverPool], None],
+        interval: float,
+        pool: DriverPool | None = None,
+        warmers: Sequence[Callable[[], object]] | None = None,
+    ) -> None:
+        self.job = job
+        self.interval = interval
+        self.pool = pool or DriverPool()
+        self.warmers = (
+            (self.pool.warm, ensure_schema, start_logging_workers) if warmers is None else warmers
+        )
+        self.ticks = 0
+        self._stopping = threading.Event()
+
+    def stop(self, signum: int | None = None, frame: FrameType | None = None) -> None:
+        if not self._stopping.is_set():
+            logger.info("[daemon] stopping after in-flight work (signal=%s)", signum)
+        self._stopping.set()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info("[daemon] started, running every %ss", self.interval)
+
+        try:
+            self.warm()
+            start = time.monotonic()
+            tick = 0
+            while not self._stopping.is_set():
+                self._run_job()
+                tick += 1
+                elapsed = time.monotonic() - start
+                if self.interval and elapsed > tick * self.interval:
+                    missed = math.ceil(elapsed / self.interval) - tick
+                    logger.warning("[daemon] job overran its interval, skipping %s ticks", missed)
+                    tick += missed
+                self._stopping.wait(start + tick * self.interval - time.monotonic())
+        finally:
+            self.pool.close()
+            logger.info("[daemon] stopped after %s runs", self.ticks)
+
+    def warm(self) -> None:
+        for warmer in self.warmers:
+            if self._stopping.is_set():
+                return
+            try:
+                warmer()
+            except Exception:
+                logger.exception(
+                    "[daemon] warming %s failed", getattr(warmer, "__qualname__", warmer)
+                )
+
+    def _run_job(self) -> None:
+        self.ticks += 1
+        try:
+            self.job(self.pool)
+        except Exception:
+            logger.exception("[daemon] run %s failed", self.ticks)
@@ -0,0 +1,256 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, fields
+from datetime import date
+from hashlib import blake2b
+from urllib.parse import urlsplit
+
+from psycopg2.extensions import connection as Connection
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+logger = get_logger(__name__)
+
+
+DB_POOL: ThreadedConnectionPool | None = None
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Shared connection pool, created on first use"""
+    # pylint: disable = global-statement
+    global DB_POOL
+    if DB_POOL is None:
+        DB_POOL = ThreadedConnectionPool(
+            minconn=1,
+            maxconn=settings.db_pool_size,
+            dbname=settings.db_name,
+            user=settings.db_user.get_secret_value(),
+            password=settings.db_pass.get_secret_value(),
+            host=settings.db_host,
+        )
+    return DB_POOL
+
+
+@contextmanager
+def connection(pool: ThreadedConnectionPool | None = None) -> Iterator[Connection]:
+    """Borrow a pooled connection for one transaction; commits on success, rolls back on error"""
+    pool = pool or get_pool()
+    conn = pool.getconn()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.putconn(conn)
+
+
+# Idempotent, so safe against a volume created before any of these existed: docker/init_db.sh only
+# runs on a fresh one. The search column and its indexes are `sieve.search.SCHEMA`.
+SCHEMA = (
+    "ALTER TABLE postings ADD COLUMN IF NOT EXISTS content_hash BYTEA",
+    "ALTER TABLE postings ADD COLUMN IF NOT EXISTS last_changed TIMESTAMPTZ NOT NULL DEFAULT now()",
+    """
+    CREATE TABLE IF NOT EXISTS posting_seen (
+        posting_id INTEGER PRIMARY KEY REFERENCES postings (id) ON DELETE CASCADE,
+        last_seen TIMESTAMPTZ NOT NULL DEFAULT now())
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS posting_signatures (
+        posting_id INTEGER PRIMARY KEY REFERENCES postings (id) ON DELETE CASCADE,
+        content_hash BYTEA NOT NULL,
+        desc_signature BYTEA,
+        card_signature BYTEA)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS posting_buckets (
+        bucket BIGINT NOT NULL,
+        posting_id INTEGER NOT NULL REFERENCES postings (id) ON DELETE CASCADE,
+        PRIMARY KEY (bucket, posting_id))
+    """,
+    "CREATE INDEX IF NOT EXISTS posting_buckets_posting_id ON posting_buckets (posting_id)",
+    """
+    CREATE TABLE IF NOT EXISTS crawl_marks (
+        query VARCHAR(200) PRIMARY KEY,
+        newest_date DATE,
+        newest_keys TEXT[] NOT NULL DEFAULT '{}',
+        last_full_sweep TIMESTAMPTZ)
+    """,
+)
+
+
+def ensure_schema(pool: ThreadedConnectionPool | None = None) -> None:
+    """Add the tables and columns of `SCHEMA` if missing, in one transaction"""
+    with connection(pool) as conn, conn.cursor() as cur:
+        for statement in SCHEMA:
+            cur.execute(statement)
+    logger.info("[db] schema ready")
+
+
+@dataclass
+class Posting:
+    title: str
+    location: str
+    company: str
+    salary: str | None
+    date: date
+    link: str
+    job_desc: str | None
+    tech: str
+    source: str
+
+
+POSTING_COLUMNS = tuple(field.name for field in fields(Posting))
+_UPDATE_COLUMNS = tuple(name for name in POSTING_COLUMNS if name not in ("title", "company"))
+_STAGED_COLUMNS = (*POSTING_COLUMNS, "content_hash")
+
+
+def content_hash(posting: Posting) -> bytes:
+    """Digest of the fields an upsert would overwrite, whitespace-normalized
+
+    The query string of `link` is left out, it carries tracking parameters that change per crawl.
+    """
+    link = urlsplit(posting.link)._replace(query="", fragment="").geturl()
+    values = (
+        posting.location,
+        posting.salary,
+        posting.date.isoformat(),
+        link,
+        posting.job_desc,
+        posting.tech,
+        posting.source,
+    )
+    normalized = "\x1f".join(" ".join(value.split()) if value else "" for value in values)
+    return blake2b(normalized.encode(), digest_size=16).digest()
+
+
+_CREATE_STAGING = f"""
+CREATE TEMP TABLE postings_staging ON COMMIT DROP AS
+SELECT {", ".join(_STAGED_COLUMNS)} FROM postings WITH NO DATA
+"""
+
+_INSERT_STAGING = f"INSERT INTO postings_staging ({', '.join(_STAGED_COLUMNS)}) VALUES %s"
+
+# `DISTINCT ON` keeps the newest copy of a posting seen twice in one batch (an upsert may not
+# touch the same row twice) and comparing `content_hash` turns re-seen, unchanged postings into
+# no-ops, so their `job_desc` is never rewritten
+_UPSERT = f"""
+INSERT INTO postings ({", ".join(_STAGED_COLUMNS)}, last_changed)
+SELECT DISTINCT ON (title, company) {", ".join(_STAGED_COLUMNS)}, now()
+FROM postings_staging
+ORDER BY title, company, date DESC
+ON CONFLICT (title, company) DO UPDATE SET
+{", ".join(f"{name} = EXCLUDED.{name}" for name in _UPDATE_COLUMNS)},
+content_hash = EXCLUDED.content_hash,
+last_changed = EXCLUDED.last_changed
+WHERE postings.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+RETURNING (xmax = 0) AS inserted
+"""
+
+# `last_seen` lives in `posting_seen`: any update of a `postings` row recomputes the stored
+# `search` tsvector, which detoasts `job_desc`, so touching it there would rewrite every re-seen
+# posting. A seen row is refreshed at most once per interval.
+_TOUCH = """
+INSERT INTO posting_seen (posting_id, last_seen)
+SELECT DISTINCT postings.id, now()
+FROM postings JOIN postings_staging AS staged
+ON postings.title = staged.title AND postings.company = staged.company
+ON CONFLICT (posting_id) DO UPDATE SET last_seen = EXCLUDED.last_seen
+WHERE posting_seen.last_seen < now() - %s * interval '1 second'
+"""
+
+
+@dataclass
+class FlushResult:
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: "FlushResult") -> "FlushResult":
+        return FlushResult(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.skipped + other.skipped,
+        )
+
+
+class PostingWriter:
+    """Buffers postings and upserts them into `postings` a batch per transaction
+
+    Each flush loads the batch into a temporary staging table with `execute_values` and merges it
+    with a single `INSERT ... ON CONFLICT (title, company) DO UPDATE`, which only rewrites rows
+    whose `content_hash` differs. Unchanged rows count as skipped; when each posting was last
+    seen is kept in the narrow `posting_seen` table, refreshed at most every `LAST_SEEN_INTERVAL`
+    seconds. The first flush also runs `SCHEMA`, so an older database gains the tables it needs.
+    """
+
+    BATCH_SIZE = 5000
+    PAGE_SIZE = 1000
+    LAST_SEEN_INTERVAL = 24 * 3600
+
+    def __init__(
+        self,
+        pool: ThreadedConnectionPool | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.pool = pool
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.totals = FlushResult()
+        self._buffer: list[Posting] = []
+        self._schema_ready = False
+
+    def add(self, posting: Posting) -> FlushResult | None:
+        """Buffer `posting`, flushing when the batch is full"""
+        self._buffer.append(posting)
+        if len(self._buffer) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> FlushResult:
+        """Write every buffered posting in one transaction
+
+        The postings stay buffered until the transaction commits, so a failed flush can be retried.
+        """
+        batch = list(self._buffer)
+        if not batch:
+            return FlushResult()
+
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            if not self._schema_ready:
+                for statement in SCHEMA:
+                    cur.execute(statement)
+            cur.execute(_CREATE_STAGING)
+            execute_values(
+                cur,
+                _INSERT_STAGING,
+                [(*astuple(posting), content_hash(posting)) for posting in batch],
+                page_size=self.PAGE_SIZE,
+            )
+            cur.execute(_UPSERT)
+            rows = cur.fetchall()
+            cur.execute(_TOUCH, (self.LAST_SEEN_INTERVAL,))
+        self._schema_ready = True
+        del self._buffer[: len(batch)]
+
+        inserted = sum(1 for (was_inserted,) in rows if was_inserted)
+        result = FlushResult(inserted, len(rows) - inserted, len(batch) - len(rows))
+        self.totals += result
+        logger.info(
+            "[db] flushed %s postings: %s inserted, %s updated, %s skipped",
+            len(batch),
+            result.inserted,
+            result.updated,
+            result.skipped,
+        )
+        return result
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "PostingWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,153 @@
+import math
+import os
+import struct
+
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+from pathlib import Path
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from sieve.db import connection
+from sieve.driver import Record
+from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+logger = get_logger(__name__)
+
+
+def posting_key(title: str, company: str) -> bytes:
+    """Stable key for the `(title, company)` unique index, whitespace-normalized"""
+    normalized = f"{' '.join(title.split())}\x1f{' '.join(company.split())}"
+    return blake2b(normalized.encode(), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` keys at `error_rate` false positives"""
+
+    _HEADER = struct.Struct("!4sQQIQ")
+    _MAGIC = b"SVBF"
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        # double hashing (Kirsch & Mitzenmacher) over the two halves of the 128 bit key
+        h1 = int.from_bytes(key[:8], "big")
+        h2 = int.from_bytes(key[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def to_bytes(self) -> bytes:
+        header = self._HEADER.pack(self._MAGIC, self.capacity, self.size, self.hashes, self.count)
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, error_rate: float) -> "BloomFilter":
+        magic, capacity, size, hashes, count = cls._HEADER.unpack_from(data)
+        bits = data[cls._HEADER.size :]
+        if magic != cls._MAGIC or len(bits) != (size + 7) // 8:
+            raise ValueError("Not a BloomFilter snapshot")
+        bloom = cls.__new__(cls)
+        bloom.capacity, bloom.error_rate, bloom.size, bloom.hashes = (
+            capacity,
+            error_rate,
+            size,
+            hashes,
+        )
+        bloom.count = count
+        bloom._bits = bytearray(bits)
+        return bloom
+
+
+class KnownPostings:
+    """Keys of postings already in the `postings` table
+
+    Listing cards are checked against it before the driver opens their detail page. The filter is
+    persisted with the highest `postings.id` it covers, so a warm start only reads newer rows.
+    """
+
+    ITERSIZE = 10_000
+    _LAST_ID = struct.Struct("!Q")
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        error_rate: float | None = None,
+        snapshot_path: str | Path | None = None,
+    ) -> None:
+        self.capacity = capacity or settings.dedupe_capacity
+        self.error_rate = error_rate or settings.dedupe_error_rate
+        self.snapshot_path = Path(snapshot_path or settings.dedupe_snapshot_path)
+        self.last_id = 0
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+
+    def __len__(self) -> int:
+        return self._bloom.count
+
+    def __contains__(self, title_company: tuple[str, str]) -> bool:
+        return posting_key(*title_company) in self._bloom
+
+    def add(self, title: str, company: str) -> None:
+        self._bloom.add(posting_key(title, company))
+
+    def unseen(self, cards: Iterable[Record]) -> Iterator[Record]:
+        """Yield the listing cards whose `(title, company)` is not already stored"""
+        for card in cards:
+            if (card["title"] or "", card["company"] or "") not in self:
+                yield card
+
+    def load(self, pool: ThreadedConnectionPool | None = None) -> None:
+        """Restore the last snapshot, then add postings stored since it was taken"""
+        self._restore()
+        if len(self) >= self._bloom.capacity:
+            # past capacity the false positive rate climbs, start over with room to grow
+            logger.info("[dedupe] snapshot is over capacity, rebuilding")
+            self.capacity = max(self.capacity, len(self) * 2)
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self.last_id = 0
+
+        with connection(pool) as conn, conn.cursor(name="known_postings") as cur:
+            cur.itersize = self.ITERSIZE
+            cur.execute(
+                "SELECT id, title, company FROM postings WHERE id > %s ORDER BY id",
+                (self.last_id,),
+            )
+            for posting_id, title, company in cur:
+                self.add(title, company)
+                self.last_id = posting_id
+        logger.info("[dedupe] %s known postings loaded", len(self))
+
+    def save(self) -> None:
+        """Atomically write the filter and the last covered id to `snapshot_path`"""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.snapshot_path.with_suffix(".tmp")
+        temp_path.write_bytes(self._LAST_ID.pack(self.last_id) + self._bloom.to_bytes())
+        os.replace(temp_path, self.snapshot_path)
+
+    def _restore(self) -> None:
+        try:
+            data = self.snapshot_path.read_bytes()
+            bloom = BloomFilter.from_bytes(data[self._LAST_ID.size :], self.error_rate)
+        except FileNotFoundError:
+            return
+        except (ValueError, struct.error):
+            logger.warning("[dedupe] ignoring unreadable snapshot: %s", self.snapshot_path)
+            return
+        (self.last_id,) = self._LAST_ID.unpack_from(data)
+        self._bloom = bloom
@@ -1,20 +1,69 @@
-import time
+import base64
 
-from datetime import datetime, timedelta
-from typing import Protocol, TypeVar
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
 
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver import ChromeOptions, Remote
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 
 from sieve.logger import get_logger
+from sieve.profiles import PROFILES, DriverProfile
+from sieve.screenshot import ScreenshotPolicy, ScreenshotWriter, capture_params
 from sieve.settings import settings
+from sieve.wait import XPathWaiter
+
+
+# `selenium.webdriver` imports every browser binding; only load it once a driver is started
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from selenium.webdriver import Remote
+    from selenium.webdriver.remote.webelement import WebElement
 
 
 logger = get_logger(__name__)
 
 
+Record = dict[str, str | None]
+
+
+# Evaluates every field XPath relative to each container match inside the page so a whole results
+# list comes back in a single round trip
+EXTRACT_SCRIPT = """
+const [containerXPath, fields] = arguments;
+const text = (node) => {
+  if (!node) return null;
+  const value = node.nodeType === Node.ELEMENT_NODE ? node.innerText : node.textContent;
+  return value == null ? null : value.trim();
+};
+const containers = document.evaluate(
+  containerXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const records = [];
+for (let i = 0; i < containers.snapshotLength; i++) {
+  const container = containers.snapshotItem(i);
+  const record = {};
+  for (const [name, xpath] of Object.entries(fields)) {
+    record[name] = text(
+      document.evaluate(
+        xpath, container, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+      ).singleNodeValue
+    );
+  }
+  records.push(record);
+}
+return records;
+"""
+
+# Bytes the current page has pulled over the network so far, document included. Cross-origin
+# responses without `Timing-Allow-Origin` report 0, so this is a lower bound
+TRANSFER_SCRIPT = """
+return performance.getEntriesByType("navigation")
+  .concat(performance.getEntriesByType("resource"))
+  .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+
 class ElementProtocol(Protocol):
     @property
     def text(self) -> str:
@@ -25,7 +74,7 @@ class ElementProtocol(Protocol):
 
 
 class Element:
-    def __init__(self, element: WebElement) -> None:
+    def __init__(self, element: "WebElement") -> None:
         self._element = element
 
     @property
@@ -50,6 +99,9 @@ class DriverProtocol(Protocol[T_co]):
     def element(self, xpath: str) -> ElementProtocol:
         ...
 
+    def extract(self, container_xpath: str, fields: Mapping[str, str]) -> list[Record]:
+        ...
+
     def save_screenshot(self, filename: str) -> bool:
         ...
 
@@ -69,59 +121,152 @@ class Driver:
         "dev_shm": "--disable-dev-shm-usage",
     }
 
-    def __init__(self, driver: Remote) -> None:
+    # chromedriver's vendor endpoint for raw DevTools commands, which `Remote` does not register
+    CDP_COMMAND = ("executeCdpCommand", "POST", "/session/$sessionId/goog/cdp/execute")
+
+    def __init__(
+        self,
+        driver: "Remote",
+        screenshot_policy: ScreenshotPolicy | None = None,
+        track_transfer: bool = False,
+    ) -> None:
         self._driver = driver
+        self._waiter = XPathWaiter()
+        self.screenshot_policy = screenshot_policy or ScreenshotPolicy.from_settings()
+        self._screenshots = ScreenshotWriter(self.screenshot_policy)
+        self.last_screenshot: "Future[Path] | None" = None
+        self.track_transfer = track_transfer
+        self.bytes_transferred = 0
+        self.pages = 0
 
     @property
-    def driver(self) -> Remote:
+    def driver(self) -> "Remote":
         return self._driver
 
     def get(self, url: str) -> None:
         """Make an HTTP GET request"""
         logger.info("[driver] GET: %s", url)
+        if self.track_transfer:
+            self._record_transfer()
         self.driver.get(url=url)
+        self.pages += 1
 
     def element(self, xpath: str) -> Element:
         """Will return the first located `Element` that matches the `xpath`"""
-        timeout = datetime.now() + timedelta(seconds=self.WAIT_TIME_SECONDS)
-        while datetime.now() < timeout:
-            elements = self._find_elements(xpath)
-            if elements:
-                return elements[0]
-            time.sleep(self.POLL_INTERVAL)
+        element = self._waiter.wait(
+            self.driver,
+            xpath,
+            timeout=self.WAIT_TIME_SECONDS,
+            max_interval=self.POLL_INTERVAL,
+        )
+        if element is not None:
+            return Element(element)
 
         self.save_screenshot("ss.png")
         raise NoSuchElementException(f"No elements found: {xpath}")
 
-    def _find_elements(self, xpath: str) -> list[Element]:
-        elements = self.driver.find_elements(by=By.XPATH, value=xpath)
-        return [Element(e) for e in elements]
+    def extract(self, container_xpath: str, fields: Mapping[str, str]) -> list[Record]:
+        """Read `fields` (name -> XPath relative to the container) for every `container_xpath` match
 
-    def save_screenshot(self, filename: str) -> bool:
-        """Save a PNG screenshot of the browser viewport at max resolution"""
-        w, h = self.driver.get_window_size().values()
-        body_w = self.driver.execute_script("return document.body.offsetWidth")
-        body_h = self.driver.execute_script("return document.body.offsetHeight")
-        self.driver.set_window_size(body_w, min(body_h, 12000))
+        Values are the trimmed visible text of the first matching node, or `None` when a field does
+        not match inside that container.
+        """
+        records: list[Record] = self.driver.execute_script(
+            EXTRACT_SCRIPT, container_xpath, dict(fields)
+        )
+        return records
+
+    @property
+    def wait_stats(self) -> list[dict]:
+        """Per-XPath wait times recorded by `element`"""
+        return self._waiter.summary()
+
+    def cdp(self, cmd: str, params: dict | None = None) -> dict[str, Any]:
+        """Run a Chrome DevTools Protocol command and return its result"""
+        name, method, path = self.CDP_COMMAND
+        commands = self.driver.command_executor._commands  # pylint: disable = protected-access
+        commands.setdefault(name, (method, path))
+        result: dict[str, Any] = self.driver.execute(name, {"cmd": cmd, "params": params or {}})
+        value: dict[str, Any] = result["value"]
+        return value
+
+    def block_urls(self, patterns: list[str]) -> bool:
+        """Have the browser refuse requests matching `patterns` for the rest of the session"""
         try:
-            self.element("//body").screenshot(filename)
+            self.cdp("Network.enable")
+            self.cdp("Network.setBlockedURLs", {"urls": patterns})
             return True
+        except WebDriverException:
+            logger.warning("[driver] CDP unavailable, resources will not be blocked", exc_info=True)
+            return False
+
+    def _record_transfer(self) -> None:
+        # read just before leaving a page, so requests made after load are counted too
+        try:
+            self.bytes_transferred += int(self.driver.execute_script(TRANSFER_SCRIPT) or 0)
+        except WebDriverException:
+            logger.debug("[driver] could not read transfer sizes", exc_info=True)
+
+    def save_screenshot(self, filename: str) -> bool:
+        """Capture the page as `screenshot_policy` describes and write it on a background thread
+
+        `filename` only names the capture, which lands in the policy directory with a unique suffix.
+        """
+        try:
+            data, extension = self._capture(self.screenshot_policy)
         except Exception:
             logger.exception("Error saving screenshot")
             return False
+        self.last_screenshot = self._screenshots.write(filename, data, extension)
+        return True
+
+    def _capture(self, policy: ScreenshotPolicy) -> tuple[bytes, str]:
+        if policy.mode == "dom":
+            return self.driver.page_source.encode(), "html"
+
+        try:
+            content = None
+            if policy.mode == "full_page":
+                content = self.cdp("Page.getLayoutMetrics")["cssContentSize"]
+            data = self.cdp("Page.captureScreenshot", capture_params(policy, content))["data"]
+            return base64.b64decode(data), policy.format
+        except WebDriverException:
+            logger.debug("[driver] CDP screenshot unavailable, using WebDriver", exc_info=True)
+
+        if policy.mode == "viewport":
+            return self.driver.get_screenshot_as_png(), "png"
+
+        w, h = self.driver.get_window_size().values()
+        body_w = self.driver.execute_script("return document.body.offsetWidth")
+        body_h = self.driver.execute_script("return document.body.offsetHeight")
+        self.driver.set_window_size(body_w, min(body_h, policy.max_height))
+        try:
+            return self.driver.get_screenshot_as_png(), "png"
         finally:
             self.driver.set_window_size(w, h)
 
     def quit(self) -> None:
+        if self.track_transfer:
+            self._record_transfer()
+            logger.info(
+                "[driver] %s bytes transferred over %s pages",
+                self.bytes_transferred,
+                self.pages,
+                extra={"bytes_transferred": self.bytes_transferred, "pages": self.pages},
+            )
         self.driver.quit()
 
 
-def init_driver(option_overrides: dict | None = None) -> DriverProtocol:
-    # pylint: disable = expression-not-assigned
+def init_driver(option_overrides: dict | None = None, profile: str | None = None) -> DriverProtocol:
+    # pylint: disable = expression-not-assigned, import-outside-toplevel
+    from selenium.webdriver import ChromeOptions, Remote
 
-    options = Driver.DRIVER_BASE_CONFIG | (option_overrides or {})
+    driver_profile: DriverProfile = PROFILES[profile or settings.driver_profile]
+    options = Driver.DRIVER_BASE_CONFIG | driver_profile.options | (option_overrides or {})
     chrome_options = ChromeOptions()
     [chrome_options.add_argument(arg) for arg in options.values() if arg]
+    if driver_profile.prefs:
+        chrome_options.add_experimental_option("prefs", driver_profile.prefs)
 
     if settings.is_dev:
         logger.info("[driver] dev driver connecting")
@@ -137,5 +282,18 @@ def init_driver(option_overrides: dict | None = None) -> DriverProtocol:
             options=chrome_options,
         )
 
+    if settings.driver_instrument:
+        from sieve.instrument import InstrumentedRemote
+
+        driver = InstrumentedRemote(driver)  # type: ignore[assignment]
+
     driver.set_window_size(settings.driver_width, settings.driver_height)
-    return Driver(driver)
+    wrapped = Driver(driver, track_transfer=settings.driver_track_transfer)
+    if driver_profile.blocked_urls:
+        wrapped.block_urls(driver_profile.blocked_urls)
+    if settings.session_cache_enabled:
+        from sieve.session import get_session_cache
+
+        get_session_cache().rehydrate(wrapped)
+    logger.info("[driver] using the %s profile", driver_profile.name)
+    return wrapped
@@ -0,0 +1,145 @@
+import importlib.util
+import re
+import time
+
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+import httpx
+
+from sieve.driver import DriverProtocol, init_driver
+from sieve.http import BROWSER_HEADERS
+from sieve.logger import get_logger
+from sieve.metrics import LatencyStat, url_pattern
+from sieve.snapshot import SnapshotDriver
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class FetchRule:
+    """Urls matching `pattern` (regex search) go straight to the browser when `browser` is set"""
+
+    pattern: str
+    browser: bool = True
+
+    def matches(self, url: str) -> bool:
+        return re.search(self.pattern, url) is not None
+
+
+@dataclass
+class FetchStat:
+    http: LatencyStat = field(default_factory=LatencyStat)
+    browser: LatencyStat = field(default_factory=LatencyStat)
+    fallbacks: int = 0
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.fallbacks / self.http.count if self.http.count else 0.0
+
+
+class Fetcher:
+    """Fetches pages over plain HTTP and only falls back to the browser when it has to
+
+    A page is fetched with a pooled `httpx.Client` unless a `FetchRule` routes it to the browser.
+    If the response fails or any of the `require`d XPaths are missing from the static HTML (the
+    content is rendered by JavaScript) the page is loaded through a lazily started `Driver`
+    instead. Either way a `SnapshotDriver` of the page is returned.
+    """
+
+    TIMEOUT_SECONDS = 10.0
+    MAX_CONNECTIONS = 20
+    HEADERS = BROWSER_HEADERS
+
+    def __init__(
+        self,
+        rules: Sequence[FetchRule] = (),
+        client: httpx.Client | None = None,
+        driver_factory: Callable[[], DriverProtocol] | None = None,
+    ) -> None:
+        self.rules = list(rules)
+        self.stats: defaultdict[str, FetchStat] = defaultdict(FetchStat)
+        self._client = client or httpx.Client(
+            headers=self.HEADERS,
+            timeout=self.TIMEOUT_SECONDS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.MAX_CONNECTIONS),
+            # HTTP/2 needs the optional `h2` package
+            http2=importlib.util.find_spec("h2") is not None,
+        )
+        self._driver_factory = driver_factory or init_driver
+        self._driver: DriverProtocol | None = None
+
+    @property
+    def driver(self) -> DriverProtocol:
+        if self._driver is None:
+            self._driver = self._driver_factory()
+        return self._driver
+
+    def fetch(self, url: str, require: Sequence[str] = ()) -> SnapshotDriver:
+        """Return a snapshot of `url` that contains every XPath in `require`"""
+        stat = self.stats[url_pattern(url)]
+        if not self._needs_browser(url):
+            page = self._fetch_http(url, stat)
+            if page is not None and all(page.elements(xpath) for xpath in require):
+                return page
+            stat.fallbacks += 1
+            logger.debug("[fetch] falling back to browser: %s", url)
+        return self._fetch_browser(url, require, stat)
+
+    def summary(self) -> list[dict]:
+        """Per url pattern request counts, mean latency and browser fallback rate"""
+        return [
+            {
+                "path": path,
+                "http_count": stat.http.count,
+                "http_mean_seconds": round(stat.http.mean, 4),
+                "browser_count": stat.browser.count,
+                "browser_mean_seconds": round(stat.browser.mean, 4),
+                "fallback_rate": round(stat.fallback_rate, 4),
+            }
+            for path, stat in sorted(self.stats.items())
+        ]
+
+    def close(self) -> None:
+        self._client.close()
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+    def __enter__(self) -> "Fetcher":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _needs_browser(self, url: str) -> bool:
+        for rule in self.rules:
+            if rule.matches(url):
+                return rule.browser
+        return False
+
+    def _fetch_http(self, url: str, stat: FetchStat) -> SnapshotDriver | None:
+        logger.info("[fetch] GET: %s", url)
+        start = time.perf_counter()
+        try:
+            response = self._client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            logger.debug("[fetch] HTTP GET failed: %s %r", url, exc)
+            return None
+        finally:
+            stat.http.record(time.perf_counter() - start)
+        return SnapshotDriver.from_html(response.text, url=str(response.url))
+
+    def _fetch_browser(self, url: str, require: Sequence[str], stat: FetchStat) -> SnapshotDriver:
+        start = time.perf_counter()
+        try:
+            self.driver.get(url)
+            for xpath in require:
+                self.driver.element(xpath)
+            return SnapshotDriver.from_html(self.driver.driver.page_source, url=url)
+        finally:
+            stat.browser.record(time.perf_counter() - start)
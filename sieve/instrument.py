@@ -0,0 +1,153 @@
+import time
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from sieve.driver import EXTRACT_SCRIPT
+from sieve.logger import get_logger
+from sieve.metrics import Histogram, url_pattern
+from sieve.wait import OBSERVER_SCRIPT
+
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Remote
+    from selenium.webdriver.remote.webelement import WebElement
+
+
+logger = get_logger(__name__)
+
+
+T = TypeVar("T")
+
+# (command, url pattern, xpath)
+CommandKey = tuple[str, str, str]
+
+
+class CommandStats:
+    """Latency histogram per WebDriver command, url pattern and XPath"""
+
+    def __init__(self) -> None:
+        self.histograms: dict[CommandKey, Histogram] = {}
+
+    def record(self, key: CommandKey, seconds: float) -> None:
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.record(seconds)
+
+    def summary(self) -> list[dict]:
+        """Per-command statistics, largest total time first"""
+        return [
+            {
+                "command": command,
+                "url_pattern": pattern,
+                "xpath": xpath,
+                "count": histogram.count,
+                "total_ms": round(histogram.total * 1000, 3),
+                "mean_ms": round(histogram.mean * 1000, 3),
+                "p50_ms": round(histogram.percentile(50) * 1000, 3),
+                "p95_ms": round(histogram.percentile(95) * 1000, 3),
+                "max_ms": round(histogram.max * 1000, 3),
+            }
+            for (command, pattern, xpath), histogram in sorted(
+                self.histograms.items(), key=lambda item: -item[1].total
+            )
+        ]
+
+    def log(self) -> None:
+        """Emit the summary through `sieve.logger`, one record per command so Datadog can facet it"""
+        summary = self.summary()
+        total_ms = sum(row["total_ms"] for row in summary)
+        calls = sum(row["count"] for row in summary)
+        logger.info(
+            "[instrument] %s webdriver calls, %.0fms",
+            calls,
+            total_ms,
+            extra={"webdriver_calls": calls, "webdriver_ms": round(total_ms, 3)},
+        )
+        for row in summary:
+            logger.info(
+                "[instrument] %s %s %s", row["command"], row["url_pattern"], row["xpath"], extra=row
+            )
+
+
+class InstrumentedWebElement:
+    def __init__(self, element: "WebElement", remote: "InstrumentedRemote", xpath: str) -> None:
+        self._element = element
+        self._remote = remote
+        self._xpath = xpath
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._element, name)
+
+    @property
+    def text(self) -> str:
+        return self._remote.timed("text", self._xpath, lambda: self._element.text)
+
+    def screenshot(self, filename: str) -> bool:
+        return self._remote.timed("screenshot", self._xpath, self._element.screenshot, filename)
+
+
+class InstrumentedRemote:
+    """Proxy for `Remote` that times each WebDriver command into `stats`
+
+    Commands are tagged with the pattern of the last url passed to `get` (tracked locally, reading
+    `current_url` would cost a round trip) and the XPath they evaluate. Commands that are not
+    instrumented pass straight through.
+    """
+
+    def __init__(self, remote: "Remote", stats: CommandStats | None = None) -> None:
+        self._remote = remote
+        self.stats = stats or CommandStats()
+        self._url_pattern = "about:blank"
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._remote, name)
+
+    def timed(self, command: str, xpath: str, func: Callable[..., T], *args: Any) -> T:
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stats.record((command, self._url_pattern, xpath), time.perf_counter() - start)
+
+    def get(self, url: str) -> None:
+        self._url_pattern = url_pattern(url)
+        self.timed("get", "", self._remote.get, url)
+
+    def find_elements(self, by: str, value: str) -> list[InstrumentedWebElement]:
+        elements = self.timed("find_elements", value, self._remote.find_elements, by, value)
+        return [InstrumentedWebElement(element, self, value) for element in elements]
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        xpath = str(args[0]) if script == EXTRACT_SCRIPT else ""
+        return self.timed("execute_script", xpath, self._remote.execute_script, script, *args)
+
+    def execute_async_script(self, script: str, *args: Any) -> Any:
+        xpath = str(args[0]) if script == OBSERVER_SCRIPT else ""
+        result = self.timed(
+            "execute_async_script", xpath, self._remote.execute_async_script, script, *args
+        )
+        if hasattr(result, "screenshot"):
+            return InstrumentedWebElement(result, self, xpath)
+        return result
+
+    def execute(self, driver_command: str, params: dict | None = None) -> Any:
+        # raw commands only reach the proxy for CDP calls, tag them with the DevTools method
+        cmd = (params or {}).get("cmd", "")
+        return self.timed(driver_command, cmd, self._remote.execute, driver_command, params)
+
+    def get_screenshot_as_png(self) -> bytes:
+        return self.timed("screenshot", "", self._remote.get_screenshot_as_png)
+
+    def set_window_size(self, width: int, height: int) -> None:
+        self.timed("set_window_size", "", self._remote.set_window_size, width, height)
+
+    def get_window_size(self) -> dict:
+        return self.timed("get_window_size", "", self._remote.get_window_size)
+
+    def quit(self) -> None:
+        try:
+            self.timed("quit", "", self._remote.quit)
+        finally:
+            self.stats.log()
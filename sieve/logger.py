@@ -1,21 +1,31 @@
+import atexit
+import copy
+import functools
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
 
+from collections.abc import Callable
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler as _QueueHandler
+from logging.handlers import QueueListener as _QueueListener
 from logging.handlers import RotatingFileHandler as _RotatingFileHandler
+from multiprocessing.pool import ApplyResult
 from types import SimpleNamespace
-from typing import Any, TextIO
-
-from datadog_api_client import Configuration, ThreadedApiClient
-from datadog_api_client.v2.api.logs_api import LogsApi
-from datadog_api_client.v2.model.http_log import HTTPLog
-from datadog_api_client.v2.model.http_log_item import HTTPLogItem
+from typing import TYPE_CHECKING, Any, TextIO
 
 from sieve.settings import settings
 
 
+# `datadog_api_client` is slow to import; it is loaded by the first `DatadogHandler`
+if TYPE_CHECKING:
+    from datadog_api_client.v2.api.logs_api import LogsApi
+
+
 # set root logger level
 logging.getLogger().setLevel(settings.log_level)
 
@@ -24,31 +34,196 @@ DATADOG_CLIENT = None
 
 
 class DatadogHandler(logging.StreamHandler):
-    # pylint: disable = global-statement
+    """Ships formatted records to Datadog in batches from a background thread
 
-    def __init__(self, stream: TextIO | None = None):
+    Records are queued in memory and sent as multi-item `HTTPLog` requests once a batch reaches
+    `BATCH_MAX_ITEMS`, `BATCH_MAX_BYTES` or has been open for `FLUSH_INTERVAL_SECONDS`. When the
+    queue is full new records are dropped and counted in `dropped` rather than blocking the caller.
+    """
+
+    # pylint: disable = global-statement, import-outside-toplevel
+
+    # Datadog rejects payloads over 1000 entries or 5MB
+    BATCH_MAX_ITEMS = 1000
+    BATCH_MAX_BYTES = 5 * 1024 * 1024
+    FLUSH_INTERVAL_SECONDS = 2.0
+    QUEUE_MAX_SIZE = 10_000
+    CLOSE_TIMEOUT_SECONDS = 10.0
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, stream: TextIO | None = None, close_at_exit: bool = True):
         global DATADOG_CLIENT
         if all([not DATADOG_CLIENT, not settings.is_test, settings.dd_api_key, settings.dd_site]):
+            from datadog_api_client import Configuration, ThreadedApiClient
+
             DATADOG_CLIENT = ThreadedApiClient(Configuration())
         assert DATADOG_CLIENT, "INVALID DATADOG_CLIENT"
         super().__init__(stream=stream)
         self.setFormatter(JsonFormatter())
 
+        self.dropped = 0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=self.QUEUE_MAX_SIZE)
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
+        # a handler owned by a `QueueListener` is closed by `shutdown_logging` once the listener
+        # has drained; exit handlers run last-registered first, so its own would run too early
+        if close_at_exit:
+            atexit.register(self.close)
+
     def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._start_worker()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every queued record has been sent, for up to `CLOSE_TIMEOUT_SECONDS`
+
+        Returns early if the worker dies, as nothing would be left to send the records.
+        """
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            return
+        deadline = time.monotonic() + self.CLOSE_TIMEOUT_SECONDS
+        try:
+            self._queue.put(self._FLUSH, timeout=self.CLOSE_TIMEOUT_SECONDS)
+        except queue.Full:
+            return
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and worker.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._queue.all_tasks_done.wait(min(remaining, 0.1))
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            if self._worker and self._worker.is_alive():
+                try:
+                    self._queue.put(self._STOP, timeout=self.CLOSE_TIMEOUT_SECONDS)
+                except queue.Full:
+                    sys.stderr.write("DatadogHandler failed to stop, its queue is still full\n")
+                else:
+                    self._worker.join(timeout=self.CLOSE_TIMEOUT_SECONDS)
+            atexit.unregister(self.close)
+        super().close()
+
+    def start(self) -> None:
+        """Start the sending thread, which `emit` otherwise does for the first record"""
+        self._start_worker()
+
+    def _start_worker(self) -> None:
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="DatadogHandler", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self) -> None:
+        from datadog_api_client.v2.api.logs_api import LogsApi
+
         api = LogsApi(DATADOG_CLIENT)
-        api.submit_log(
-            body=HTTPLog(
-                [
-                    HTTPLogItem(
-                        message=self.format(record),
-                        hostname=settings.hostname,
-                        service=settings.app_name,
-                        ddsource="python",
-                        ddtags=f"env:{settings.app_env}",
-                    ),
-                ]
+        batch: list[str] = []
+        batch_bytes = 0
+        deadline: float | None = None
+
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                self._send(api, batch)
+                batch, batch_bytes, deadline = [], 0, None
+
+            try:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+            if item is self._FLUSH or item is self._STOP:
+                self._send(api, batch)
+                batch, batch_bytes, deadline = [], 0, None
+                self._queue.task_done()
+                if item is self._STOP:
+                    return
+                continue
+
+            size = len(item.encode())
+            if batch and batch_bytes + size > self.BATCH_MAX_BYTES:
+                self._send(api, batch)
+                batch, batch_bytes = [], 0
+            if not batch:
+                deadline = time.monotonic() + self.FLUSH_INTERVAL_SECONDS
+            batch.append(item)
+            batch_bytes += size
+
+            if len(batch) >= self.BATCH_MAX_ITEMS:
+                self._send(api, batch)
+                batch, batch_bytes, deadline = [], 0, None
+
+    def _send(self, api: "LogsApi", batch: list[str]) -> None:
+        from datadog_api_client.v2.model.http_log import HTTPLog
+        from datadog_api_client.v2.model.http_log_item import HTTPLogItem
+
+        if not batch:
+            return
+        try:
+            result = api.submit_log(
+                body=HTTPLog(
+                    [
+                        HTTPLogItem(
+                            message=message,
+                            hostname=settings.hostname,
+                            service=settings.app_name,
+                            ddsource="python",
+                            ddtags=f"env:{settings.app_env}",
+                        )
+                        for message in batch
+                    ]
+                )
             )
-        )
+            # `ThreadedApiClient` returns an `ApplyResult`; wait on it so failures surface here
+            if isinstance(result, ApplyResult):
+                result.get()
+        except Exception as exc:
+            self.dropped += len(batch)
+            sys.stderr.write(f"DatadogHandler failed to send {len(batch)} records: {exc!r}\n")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+def _json_encoder() -> tuple[str, Callable[[Any], str]]:
+    """Name and encoder of the fastest JSON backend available: `orjson` when installed, else
+    the stdlib
+
+    The stdlib fallback is set up to write what `orjson` writes: compact separators and non-ASCII
+    characters left as is.
+    """
+    try:
+        import orjson  # pylint: disable = import-outside-toplevel
+    except ImportError:
+        return "json", functools.partial(json.dumps, separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(payload: Any) -> str:
+        return orjson.dumps(payload).decode()  # pylint: disable = no-member
+
+    return "orjson", dumps
+
+
+# which backend `JsonFormatter` encodes with, `orjson` is an optional extra
+JSON_BACKEND, _dumps = _json_encoder()
 
 
 class JsonFormatter(logging.Formatter):
@@ -78,17 +253,29 @@ class JsonFormatter(logging.Formatter):
         "timestamp",
         "processName",
         "process",
+        "taskName",
     }
 
+    # attributes every `LogRecord` starts with; a record with no more than these has no extras
+    _RECORD_ATTRIBUTE_COUNT = len(vars(logging.LogRecord("", 0, "", 0, "", (), None)))
+    _LOGGER_CACHE_SIZE = 1024
+
+    dumps = staticmethod(_dumps)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._loggers: dict[tuple[str, str | None], dict[str, str | None]] = {}
+        self._timestamp: tuple[int, str] = (-1, "")
+
     def format(self, record: logging.LogRecord) -> str:
         """Format `logging.LogRecord` into Datadog compatible payload"""
 
         payload: dict[str, Any] = {
-            "logger": {"name": record.name, "thread_name": record.threadName},
+            "logger": self._logger_fields(record.name, record.threadName),
             "level": record.levelname,
             "message": record.getMessage(),
             "function_name": record.funcName,
-            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
         }
 
         # exception details
@@ -103,11 +290,37 @@ class JsonFormatter(logging.Formatter):
         if record.stack_info:
             payload["stack_info"] = self.formatStack(record.stack_info)
 
-        # extras
-        for extra in record.__dict__.keys() - JsonFormatter._RESERVED_ATTRIBUTES:
-            payload[extra] = getattr(record, extra)
-
-        return json.dumps(payload)
+        # extras; `asctime`/`message` are the attributes other formatters add to a record
+        attributes = record.__dict__
+        added = len(attributes) - ("asctime" in attributes) - ("message" in attributes)
+        if added > self._RECORD_ATTRIBUTE_COUNT:
+            for extra in attributes.keys() - JsonFormatter._RESERVED_ATTRIBUTES:
+                payload[extra] = attributes[extra]
+
+        return self.dumps(payload)
+
+    def _logger_fields(self, name: str, thread_name: str | None) -> dict[str, str | None]:
+        key = (name, thread_name)
+        fields = self._loggers.get(key)
+        if fields is None:
+            if len(self._loggers) >= self._LOGGER_CACHE_SIZE:
+                self._loggers.clear()
+            fields = self._loggers[key] = {"name": name, "thread_name": thread_name}
+        return fields
+
+    def _format_timestamp(self, created: float) -> str:
+        """ISO 8601 UTC timestamp; the date/time part is formatted once per second"""
+        seconds = int(created)
+        micros = round((created - seconds) * 1_000_000)
+        cached_seconds, prefix = self._timestamp
+        if seconds != cached_seconds:
+            prefix = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._timestamp = (seconds, prefix)
+        if micros == 1_000_000:
+            return datetime.fromtimestamp(created, tz=timezone.utc).isoformat()
+        if micros:
+            return f"{prefix}.{micros:06d}+00:00"
+        return f"{prefix}+00:00"
 
 
 class StreamFormatter(logging.Formatter):
@@ -117,14 +330,14 @@ class StreamFormatter(logging.Formatter):
         level_name = add_color(f"[{record.levelname}]", COLOR.WARNING)
 
         record.asctime = self.formatTime(record, self.datefmt)
-        time = add_color(record.asctime, COLOR.PURPLE)
+        timestamp = add_color(record.asctime, COLOR.PURPLE)
 
         location = f"{record.name}.{record.lineno}"
         if len(location) < 30:
             location = f"{location:30}"
         location = add_color(location, COLOR.OKBLUE)
 
-        log_message = f"{time:35} {level_name:20} {location} {message}"
+        log_message = f"{timestamp:35} {level_name:20} {location} {message}"
 
         if record.exc_info and not record.exc_text:
             record.exc_text = self.formatException(record.exc_info)
@@ -187,24 +400,142 @@ def add_color(message: str, color: str) -> str:
     return f"{color}{message}{COLOR.END}"
 
 
+class QueueHandler(_QueueHandler):
+    """Hands records to the shared `QueueListener` without blocking on formatting or I/O
+
+    The queue is bounded; when it is full records are dropped and counted in `dropped`, or the
+    caller waits for room when `overflow` is "block".
+    """
+
+    def __init__(self, queue_: "queue.Queue[Any]", overflow: str = "drop"):
+        super().__init__(queue_)
+        # the base class types `queue` as a protocol without the blocking `put`
+        self._log_queue = queue_
+        self.overflow = overflow
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self._log_queue.put(record)
+            return
+        try:
+            self._log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the listener runs in this process, so unlike the stdlib version `exc_info` is kept for
+        # the formatters' exception fields; only the message is rendered on the calling thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+class QueueListener(_QueueListener):
+    """`QueueListener` whose `stop` waits for room in a full queue instead of raising
+
+    The stdlib version enqueues its stop sentinel with `put_nowait`, which raises `queue.Full`
+    when records are backed up. Waiting is bounded by `STOP_TIMEOUT_SECONDS`, after which the
+    remaining records are abandoned.
+    """
+
+    STOP_TIMEOUT_SECONDS = 10.0
+
+    # what the base class' monitor thread stops on
+    _sentinel = None
+
+    def __init__(
+        self, queue_: "queue.Queue[Any]", *handlers: logging.Handler, respect_handler_level: bool
+    ):
+        super().__init__(queue_, *handlers, respect_handler_level=respect_handler_level)
+        self._log_queue = queue_
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._log_queue.put(self._sentinel, timeout=self.STOP_TIMEOUT_SECONDS)
+        except queue.Full:
+            sys.stderr.write("QueueListener failed to stop, log queue is still full\n")
+        else:
+            thread.join(timeout=self.STOP_TIMEOUT_SECONDS)
+        self._thread = None
+
+
+# shared handlers per configuration so `get_logger` never reopens files or respawns workers
+_HANDLERS: dict[tuple[bool, bool], list[logging.Handler]] = {}
+_LISTENERS: list[QueueListener] = []
+
+
+def _handlers(datadog: bool) -> list[logging.Handler]:
+    key = (datadog, settings.log_queue_enabled)
+    if key not in _HANDLERS:
+        handlers: list[logging.Handler] = [StreamHandler()]
+        if datadog:
+            handlers.append(DatadogHandler(close_at_exit=not settings.log_queue_enabled))
+        else:
+            os.makedirs("logs", exist_ok=True)
+            handlers.append(RotatingFileHandler())
+
+        if settings.log_queue_enabled:
+            log_queue: queue.Queue[Any] = queue.Queue(maxsize=settings.log_queue_size)
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _LISTENERS.append(listener)
+            handlers = [QueueHandler(log_queue, overflow=settings.log_queue_overflow)]
+
+        _HANDLERS[key] = handlers
+    return _HANDLERS[key]
+
+
+def start_logging_workers() -> None:
+    """Start the Datadog workers of the shared handlers now rather than on their first record"""
+    owned = [handler for listener in _LISTENERS for handler in listener.handlers]
+    for handler in [*owned, *(handler for handlers in _HANDLERS.values() for handler in handlers)]:
+        if isinstance(handler, DatadogHandler):
+            handler.start()
+
+
+def shutdown_logging() -> None:
+    """Drain queued records, then close every shared handler, those behind a listener included"""
+    while _LISTENERS:
+        listener = _LISTENERS.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    for handlers in _HANDLERS.values():
+        for handler in handlers:
+            handler.close()
+    _HANDLERS.clear()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str, level: str | None = None) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.handlers.clear()
     logger.setLevel(level or settings.log_level)
-    logger.addHandler(StreamHandler())
 
     # datadog config
-    if all([not settings.is_test, settings.dd_api_key, settings.dd_site]):
-        logger.addHandler(DatadogHandler())
+    datadog = all([not settings.is_test, settings.dd_api_key, settings.dd_site])
+    built = (datadog, settings.log_queue_enabled) not in _HANDLERS
+    handlers = _handlers(datadog)
+    if logger.handlers == handlers:
         return logger
 
-    if not settings.is_test:
+    logger.handlers.clear()
+    for handler in handlers:
+        logger.addHandler(handler)
+
+    # once per process, when the shared handlers are built
+    if built and not datadog and not settings.is_test:
         logger.warning(
             "%s* * * DD_API_KEY & DD_SITE REQUIRED -> Using RotatingFileHandler * * *%s",
             COLOR.WARNING,
             COLOR.END,
         )
 
-    os.makedirs("logs", exist_ok=True)
-    logger.addHandler(RotatingFileHandler())
     return logger
@@ -0,0 +1,52 @@
+import re
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+
+@dataclass
+class LatencyStat:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+# upper bounds in seconds, roughly 1-2.5-5 steps from 1ms to 10s; slower samples share a last bucket
+HISTOGRAM_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class Histogram(LatencyStat):
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS) + 1))
+
+    def record(self, seconds: float) -> None:
+        super().record(seconds)
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS, seconds)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q`th percentile, capped at the observed max"""
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BOUNDS, self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+_ID_SEGMENT = re.compile(r"(?<=/)[^/]*\d[^/]*(?=/|$)")
+
+
+def url_pattern(url: str) -> str:
+    """Collapse a url to its path with id-like segments replaced, e.g. `/jobs/view/:id`"""
+    return _ID_SEGMENT.sub(":id", urlsplit(url).path) or "/"
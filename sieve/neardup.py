@@ -0,0 +1,345 @@
+import random
+import re
+import struct
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from hashlib import blake2b
+from typing import Literal
+
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from sieve.db import Posting, connection, content_hash
+from sieve.driver import Record
+from sieve.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+SignatureKind = Literal["desc", "card"]
+
+_WORDS = re.compile(r"\w+")
+
+# Mersenne prime for the universal hash family
+_PRIME = (1 << 61) - 1
+_MASK = 0xFFFFFFFF
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def description_shingles(text: str, size: int = 5) -> set[str]:
+    """Overlapping runs of `size` words, ignoring case and punctuation"""
+    words = _WORDS.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def card_shingles(title: str, company: str, location: str, size: int = 3) -> set[str]:
+    """Character `size`-grams of a listing card, so a reworded or reordered title still overlaps"""
+    text = " ".join(_WORDS.findall(f"{title} {company} {location}".lower()))
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHash:
+    """MinHash signatures of shingle sets, packed as `permutations` 32 bit big-endian integers
+
+    The share of positions two signatures agree on estimates the Jaccard similarity of their sets.
+    Permutations are seeded, so signatures stay comparable across processes and releases.
+    """
+
+    def __init__(self, permutations: int = 128, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.permutations = permutations
+        self._coefficients = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(permutations)
+        ]
+        self._struct = struct.Struct(f"!{permutations}I")
+
+    def signature(self, shingles: Iterable[str]) -> bytes | None:
+        """`None` for an empty set, which has no meaningful similarity to anything"""
+        hashes = [_hash(shingle) for shingle in shingles]
+        if not hashes:
+            return None
+        return self._struct.pack(
+            *(min((a * x + b) % _PRIME for x in hashes) & _MASK for a, b in self._coefficients)
+        )
+
+    def similarity(self, first: bytes, second: bytes) -> float:
+        matches: int = sum(
+            x == y for x, y in zip(self._struct.unpack(first), self._struct.unpack(second))
+        )
+        return matches / self.permutations
+
+
+class LshBands:
+    """Splits signatures into `bands` of `rows` and hashes each band to a bucket
+
+    Two signatures share a bucket when any band is identical, which happens with probability
+    1 - (1 - s^rows)^bands for Jaccard similarity s: 16 bands of 8 rows pass about 60% of pairs at
+    s = 0.7, 95% at s = 0.8 and 99% at s = 0.85, but only 6% at s = 0.5.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 8) -> None:
+        self.bands = bands
+        self.rows = rows
+
+    def buckets(self, signature: bytes, kind: SignatureKind) -> list[int]:
+        """Signed 64 bit bucket per band, distinct across bands and signature kinds"""
+        width = self.rows * 4
+        return [
+            int.from_bytes(
+                blake2b(
+                    signature[band * width : (band + 1) * width],
+                    digest_size=8,
+                    person=f"{kind}{band}".encode(),
+                ).digest(),
+                "big",
+                signed=True,
+            )
+            for band in range(self.bands)
+        ]
+
+
+class LshIndex:
+    """In-memory bucket index, e.g. to catch near-duplicates within one crawl"""
+
+    def __init__(self, minhash: MinHash, bands: LshBands, threshold: float) -> None:
+        self.minhash = minhash
+        self.bands = bands
+        self.threshold = threshold
+        self._signatures: dict[object, bytes] = {}
+        self._buckets: defaultdict[int, list[object]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: object, signature: bytes, kind: SignatureKind = "desc") -> None:
+        self._signatures[key] = signature
+        for bucket in self.bands.buckets(signature, kind):
+            self._buckets[bucket].append(key)
+
+    def query(self, signature: bytes, kind: SignatureKind = "desc") -> list[tuple[object, float]]:
+        """Keys at or above `threshold`, most similar first"""
+        candidates = {
+            key for bucket in self.bands.buckets(signature, kind) for key in self._buckets[bucket]
+        }
+        return _ranked(
+            self.minhash,
+            signature,
+            ((key, self._signatures[key]) for key in candidates),
+            self.threshold,
+        )
+
+
+def _ranked(
+    minhash: MinHash, signature: bytes, candidates: Iterable[tuple], threshold: float
+) -> list[tuple]:
+    scored = [(key, minhash.similarity(signature, other)) for key, other in candidates]
+    return sorted(
+        ((key, score) for key, score in scored if score >= threshold),
+        key=lambda pair: pair[1],
+        reverse=True,
+    )
+
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE signatures_staging (
+    title VARCHAR(200) NOT NULL,
+    company VARCHAR(200) NOT NULL,
+    content_hash BYTEA NOT NULL,
+    desc_signature BYTEA,
+    card_signature BYTEA)
+ON COMMIT DROP
+"""
+
+_INSERT_STAGING = """
+INSERT INTO signatures_staging (title, company, content_hash, desc_signature, card_signature)
+VALUES %s
+"""
+
+# Only the version of a posting that is actually stored is signed, and a posting whose
+# `content_hash` was already signed is left alone, so a re-seen posting costs no write at all.
+# The signatures live beside `postings`: updating a `postings` row recomputes its `search`
+# tsvector, which detoasts `job_desc`.
+_UPSERT = """
+INSERT INTO posting_signatures (posting_id, content_hash, desc_signature, card_signature)
+SELECT DISTINCT ON (postings.id)
+    postings.id, staged.content_hash, staged.desc_signature, staged.card_signature
+FROM signatures_staging AS staged JOIN postings
+ON postings.title = staged.title
+AND postings.company = staged.company
+AND postings.content_hash = staged.content_hash
+ORDER BY postings.id
+ON CONFLICT (posting_id) DO UPDATE SET
+content_hash = EXCLUDED.content_hash,
+desc_signature = EXCLUDED.desc_signature,
+card_signature = EXCLUDED.card_signature
+WHERE posting_signatures.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+RETURNING posting_id, desc_signature, card_signature
+"""
+
+
+class NearDuplicates:
+    """Postings that are near, not just exact, duplicates of stored ones
+
+    Every stored posting gets a MinHash signature of its description and one of its listing card
+    in `posting_signatures`, and a row per LSH band in `posting_buckets`, so a lookup only compares
+    against postings sharing a bucket instead of scanning the table. The card signature lets
+    `novel` skip a reposted job from its listing card, before its detail page is fetched.
+    """
+
+    DESC_THRESHOLD = 0.8
+    CARD_THRESHOLD = 0.85
+    PAGE_SIZE = 1000
+
+    _COLUMNS = {"desc": "desc_signature", "card": "card_signature"}
+
+    def __init__(
+        self,
+        pool: ThreadedConnectionPool | None = None,
+        minhash: MinHash | None = None,
+        bands: LshBands | None = None,
+    ) -> None:
+        self.pool = pool
+        self.minhash = minhash or MinHash()
+        self.bands = bands or LshBands()
+
+    def card_signature(self, card: Mapping[str, str | None]) -> bytes | None:
+        shingles = card_shingles(card["title"] or "", card["company"] or "", card["location"] or "")
+        return self.minhash.signature(shingles)
+
+    def desc_signature(self, job_desc: str | None) -> bytes | None:
+        return self.minhash.signature(description_shingles(job_desc or ""))
+
+    def find(self, signature: bytes, kind: SignatureKind) -> list[tuple[int, float]]:
+        """Ids of stored postings similar to `signature`, most similar first"""
+        threshold = self.DESC_THRESHOLD if kind == "desc" else self.CARD_THRESHOLD
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT posting_id, {self._COLUMNS[kind]} FROM posting_signatures
+                WHERE posting_id IN (
+                    SELECT posting_id FROM posting_buckets WHERE bucket = ANY(%s)
+                )
+                """,
+                (self.bands.buckets(signature, kind),),
+            )
+            candidates = [(posting_id, bytes(other)) for posting_id, other in cur if other]
+        return _ranked(self.minhash, signature, candidates, threshold)
+
+    def novel(self, cards: Iterable[Record]) -> Iterator[Record]:
+        """Yield the listing cards that are not a near-duplicate of a stored posting
+
+        The buckets of all `cards`, typically one results page, are looked up in a single query.
+        """
+        signed = []
+        for card in cards:
+            signature = self.card_signature(card)
+            buckets = self.bands.buckets(signature, "card") if signature else []
+            signed.append((card, signature, buckets))
+        stored = self._bucket_members([bucket for _, _, buckets in signed for bucket in buckets])
+
+        for card, signature, buckets in signed:
+            candidates = {
+                posting_id: other for bucket in buckets for posting_id, other in stored[bucket]
+            }
+            matches = (
+                _ranked(self.minhash, signature, candidates.items(), self.CARD_THRESHOLD)
+                if signature
+                else []
+            )
+            if matches:
+                logger.debug(
+                    "[neardup] %s at %s repeats posting %s",
+                    card["title"],
+                    card["company"],
+                    matches[0][0],
+                )
+                continue
+            yield card
+
+    def _bucket_members(self, buckets: list[int]) -> defaultdict[int, list[tuple[int, bytes]]]:
+        """Stored postings with a card signature in each of `buckets`, as `(id, signature)`"""
+        members: defaultdict[int, list[tuple[int, bytes]]] = defaultdict(list)
+        if not buckets:
+            return members
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT b.bucket, s.posting_id, s.card_signature
+                FROM posting_buckets AS b JOIN posting_signatures AS s USING (posting_id)
+                WHERE b.bucket = ANY(%s) AND s.card_signature IS NOT NULL
+                """,
+                (sorted(set(buckets)),),
+            )
+            for bucket, posting_id, signature in cur:
+                members[bucket].append((posting_id, bytes(signature)))
+        return members
+
+    def duplicate_of(self, job_desc: str | None) -> int | None:
+        """Id of the stored posting whose description is the closest match, if any"""
+        signature = self.desc_signature(job_desc)
+        matches = self.find(signature, "desc") if signature else []
+        return matches[0][0] if matches else None
+
+    def add(self, postings: Sequence[Posting]) -> int:
+        """Sign and index stored `postings`, typically a batch a `PostingWriter` just flushed
+
+        One transaction per call: the signatures are staged and merged in bulk, and only the
+        postings whose content changed since they were last signed get their buckets rewritten.
+        Postings that are not stored are ignored. Returns how many postings were (re)indexed.
+        """
+        if not postings:
+            return 0
+        staged = [
+            (
+                posting.title,
+                posting.company,
+                content_hash(posting),
+                self.desc_signature(posting.job_desc),
+                self.card_signature(
+                    {
+                        "title": posting.title,
+                        "company": posting.company,
+                        "location": posting.location,
+                    }
+                ),
+            )
+            for posting in postings
+        ]
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            cur.execute(_CREATE_STAGING)
+            execute_values(cur, _INSERT_STAGING, staged, page_size=self.PAGE_SIZE)
+            cur.execute(_UPSERT)
+            signed = cur.fetchall()
+            if not signed:
+                return 0
+            # a re-signed posting has a new description, its old buckets would only mislead
+            cur.execute(
+                "DELETE FROM posting_buckets WHERE posting_id = ANY(%s)",
+                ([posting_id for posting_id, _, _ in signed],),
+            )
+            buckets = []
+            for posting_id, desc, card in signed:
+                signatures: dict[SignatureKind, bytes | None] = {"desc": desc, "card": card}
+                buckets += [
+                    (bucket, posting_id)
+                    for kind, signature in signatures.items()
+                    if signature is not None
+                    for bucket in self.bands.buckets(bytes(signature), kind)
+                ]
+            execute_values(
+                cur,
+                "INSERT INTO posting_buckets (bucket, posting_id) VALUES %s ON CONFLICT DO NOTHING",
+                buckets,
+                page_size=self.PAGE_SIZE,
+            )
+        logger.debug("[neardup] indexed %s of %s postings", len(signed), len(postings))
+        return len(signed)
@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sieve.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# end of stream marker, one per worker of the receiving stage
+_DONE = object()
+
+
+@dataclass
+class StageStat:
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def throughput(self) -> float:
+        """Items consumed per second of work"""
+        return self.items_in / self.busy_seconds if self.busy_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a `Pipeline`: `func` turns each input item into zero or more output items
+
+    `workers` threads run `func` concurrently and share a bounded input queue of `queue_size`.
+    `close` runs once after the last item has gone through, e.g. to flush a buffered sink.
+    """
+
+    name: str
+    func: Callable[[Any], Iterable[Any]]
+    workers: int = 1
+    queue_size: int = 100
+    close: Callable[[], None] | None = None
+
+    @classmethod
+    def map(cls, name: str, func: Callable[[Any], Any], **kwargs: Any) -> "Stage":
+        return cls(name, lambda item: (func(item),), **kwargs)
+
+    @classmethod
+    def filter(cls, name: str, predicate: Callable[[Any], bool], **kwargs: Any) -> "Stage":
+        return cls(name, lambda item: (item,) if predicate(item) else (), **kwargs)
+
+    @classmethod
+    def sink(cls, name: str, func: Callable[[Any], Any], **kwargs: Any) -> "Stage":
+        def consume(item: Any) -> tuple[()]:
+            func(item)
+            return ()
+
+        return cls(name, consume, **kwargs)
+
+
+class Pipeline:
+    """Streams items through `stages` on worker threads linked by bounded queues
+
+    A full queue blocks the stage feeding it, so a slow stage (typically the Postgres sink)
+    throttles every stage upstream of it down to the source, and at most the queued items are in
+    memory at once however long the source is. An item whose stage raises is logged and dropped.
+    """
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.stats = [StageStat(stage.name) for stage in self.stages]
+        self._queues: list[queue.Queue] = [queue.Queue(stage.queue_size) for stage in self.stages]
+        self._remaining: list[int] = []
+        self._lock = threading.Lock()
+
+    def run(self, source: Iterable[Any]) -> list[StageStat]:
+        """Push every item of `source` through the stages and wait until the last one finishes"""
+        self._remaining = [stage.workers for stage in self.stages]
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(index,),
+                name=f"pipeline-{stage.name}-{worker}",
+                daemon=True,
+            )
+            for index, stage in enumerate(self.stages)
+            for worker in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        start = time.monotonic()
+        try:
+            for item in source:
+                self._queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        self._log(time.monotonic() - start)
+        return self.stats
+
+    def _work(self, index: int) -> None:
+        stage, stat, inbox = self.stages[index], self.stats[index], self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self.stages) else None
+        while (item := inbox.get()) is not _DONE:
+            blocked = 0.0
+            produced = 0
+            errored = False
+            start = time.perf_counter()
+            try:
+                for output in stage.func(item):
+                    produced += 1
+                    if outbox is not None:
+                        put_start = time.perf_counter()
+                        outbox.put(output)
+                        blocked += time.perf_counter() - put_start
+            except Exception:
+                errored = True
+                logger.exception("[pipeline] %s failed on an item", stage.name)
+            busy = time.perf_counter() - start - blocked
+            with stat.lock:
+                stat.items_in += 1
+                stat.items_out += produced
+                stat.errors += errored
+                stat.busy_seconds += busy
+                stat.blocked_seconds += blocked
+        self._finish(index)
+
+    def _finish(self, index: int) -> None:
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if not last:
+            return
+        stage = self.stages[index]
+        try:
+            if stage.close is not None:
+                stage.close()
+        except Exception:
+            logger.exception("[pipeline] closing %s failed", stage.name)
+        finally:
+            if index + 1 < len(self.stages):
+                for _ in range(self.stages[index + 1].workers):
+                    self._queues[index + 1].put(_DONE)
+
+    def _log(self, elapsed: float) -> None:
+        for stat in self.stats:
+            logger.info(
+                "[pipeline] %s: %s in, %s out, %s errors, %.1f/s, %.2fs blocked downstream",
+                stat.name,
+                stat.items_in,
+                stat.items_out,
+                stat.errors,
+                stat.throughput,
+                stat.blocked_seconds,
+                extra={
+                    "stage": stat.name,
+                    "items_in": stat.items_in,
+                    "items_out": stat.items_out,
+                    "errors": stat.errors,
+                    "items_per_second": round(stat.throughput, 2),
+                    "blocked_seconds": round(stat.blocked_seconds, 3),
+                },
+            )
+        logger.info("[pipeline] finished in %.2fs", elapsed)
@@ -0,0 +1,170 @@
+import threading
+import time
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from sieve.driver import DriverProtocol, init_driver
+from sieve.exceptions import SystemException
+from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PooledSession:
+    driver: DriverProtocol
+    created: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+class DriverPool:
+    """Keeps up to `size` warm browserless sessions and hands them out one job at a time
+
+    Sessions are health-checked on checkout, reset (extra tabs closed, cookies cleared) on return
+    and recycled once they exceed `max_age` seconds or `max_uses` jobs.
+    """
+
+    RESET_URL = "about:blank"
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_age: float | None = None,
+        max_uses: int | None = None,
+        factory: Callable[[], DriverProtocol] | None = None,
+    ) -> None:
+        self.size = size or settings.max_concurrent_sessions
+        self.max_age = max_age or settings.driver_max_age_seconds
+        self.max_uses = max_uses or settings.driver_max_uses
+        self._factory = factory or init_driver
+        self._idle: list[PooledSession] = []
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def warm(self) -> None:
+        """Start sessions until the pool is full"""
+        sessions = []
+        with self._cond:
+            missing = self.size - self._open
+            self._open += missing
+        try:
+            for _ in range(missing):
+                sessions.append(PooledSession(self._factory()))
+        finally:
+            with self._cond:
+                self._open -= missing - len(sessions)
+                self._idle.extend(sessions)
+                self._cond.notify_all()
+
+    @contextmanager
+    def session(self, timeout: float | None = None) -> Iterator[DriverProtocol]:
+        """Check out a driver for the duration of the `with` block"""
+        pooled = self._acquire(timeout)
+        try:
+            yield pooled.driver
+        finally:
+            self._release(pooled)
+
+    def close(self) -> None:
+        """Quit idle sessions; sessions still checked out are quit when returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _acquire(self, timeout: float | None) -> PooledSession:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise SystemException("DriverPool is closed")
+                if self._idle:
+                    pooled: PooledSession | None = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    pooled = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise SystemException(
+                        "Timed out waiting for a driver session", extra={"size": self.size}
+                    )
+                self._cond.wait(remaining)
+
+        try:
+            if pooled and (self._expired(pooled) or not self._healthy(pooled)):
+                self._quit(pooled)
+                pooled = None
+            return pooled or PooledSession(self._factory())
+        except Exception:
+            self._discard()
+            raise
+
+    def _release(self, pooled: PooledSession) -> None:
+        pooled.uses += 1
+        if self._closed or self._expired(pooled) or not self._reset(pooled):
+            self._quit(pooled)
+            self._discard()
+            return
+
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def _discard(self) -> None:
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _expired(self, pooled: PooledSession) -> bool:
+        return pooled.uses >= self.max_uses or pooled.age >= self.max_age
+
+    def _healthy(self, pooled: PooledSession) -> bool:
+        try:
+            return bool(pooled.driver.driver.window_handles)
+        except Exception:
+            logger.warning("[pool] unhealthy session discarded", exc_info=True)
+            return False
+
+    def _reset(self, pooled: PooledSession) -> bool:
+        remote = pooled.driver.driver
+        try:
+            handles = remote.window_handles
+            for handle in handles[1:]:
+                remote.switch_to.window(handle)
+                remote.close()
+            remote.switch_to.window(handles[0])
+            # with the session cache on, the cookies are the login `init_driver` restored
+            if not settings.session_cache_enabled:
+                remote.delete_all_cookies()
+            remote.get(self.RESET_URL)
+            return True
+        except Exception:
+            logger.warning("[pool] session reset failed", exc_info=True)
+            return False
+
+    @staticmethod
+    def _quit(pooled: PooledSession) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception:
+            logger.warning("[pool] error quitting session", exc_info=True)
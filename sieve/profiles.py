@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+# `Network.setBlockedURLs` patterns (`*` wildcards) per kind of resource
+RESOURCE_PATTERNS: dict[str, tuple[str, ...]] = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"),
+    "font": ("*.woff*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"),
+    "tracker": (
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*facebook.net*",
+        "*px.ads.linkedin.com*",
+        "*snap.licdn.com*",
+    ),
+}
+
+# chrome content settings, 2 = block
+IMAGES_DISABLED_PREF = "profile.managed_default_content_settings.images"
+JAVASCRIPT_DISABLED_PREF = "profile.managed_default_content_settings.javascript"
+
+
+@dataclass(frozen=True)
+class DriverProfile:
+    """Browser options layered over `Driver.DRIVER_BASE_CONFIG` for one kind of scrape
+
+    `options` entries replace base config entries with the same key, `option_overrides` passed to
+    `init_driver` still win over both. Requests matching `block_resources`/`block_urls` are refused
+    by the browser for the whole session.
+    """
+
+    name: str
+    options: dict[str, str] = field(default_factory=dict)
+    block_resources: tuple[str, ...] = ()
+    block_urls: tuple[str, ...] = ()
+    disable_images: bool = False
+    disable_javascript: bool = False
+
+    @property
+    def blocked_urls(self) -> list[str]:
+        patterns = [pattern for kind in self.block_resources for pattern in RESOURCE_PATTERNS[kind]]
+        return patterns + list(self.block_urls)
+
+    @property
+    def prefs(self) -> dict[str, Any]:
+        prefs = {}
+        if self.disable_images:
+            prefs[IMAGES_DISABLED_PREF] = 2
+        if self.disable_javascript:
+            # page scripts only, WebDriver `execute_script` keeps working
+            prefs[JAVASCRIPT_DISABLED_PREF] = 2
+        return prefs
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        # everything a normal browser loads
+        DriverProfile("full"),
+        # rendered pages without the heavy or third-party requests
+        DriverProfile(
+            "lite",
+            options={"blink_settings": "--blink-settings=imagesEnabled=false"},
+            block_resources=("image", "font", "media", "tracker"),
+            disable_images=True,
+        ),
+        # server-rendered markup only, for pages that need no scripts to show their content
+        DriverProfile(
+            "text",
+            options={"blink_settings": "--blink-settings=imagesEnabled=false"},
+            block_resources=("image", "font", "media", "tracker"),
+            disable_images=True,
+            disable_javascript=True,
+        ),
+    )
+}
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+
+STARTUP_MODULES = ("sieve.__main__", "sieve.driver", "sieve.pool", "sieve.daemon")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr of `python -X importtime` into one `ImportTiming` per module"""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # column header
+        module = name.rstrip()
+        depth = (len(module) - len(module.lstrip())) // 2
+        timings.append(ImportTiming(module.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def profile_startup(modules: Sequence[str] = STARTUP_MODULES) -> list[ImportTiming]:
+    """Import `modules` in a fresh interpreter under `-X importtime`"""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def format_report(timings: Sequence[ImportTiming], top: int = 20) -> str:
+    """Total startup import time plus the slowest top-level and individual modules"""
+    total = sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+    top_level = sorted(
+        (timing for timing in timings if timing.depth == 0), key=lambda t: -t.cumulative_us
+    )
+    by_self = sorted(timings, key=lambda timing: -timing.self_us)
+
+    lines = [f"startup imports: {len(timings)} modules, {total / 1000:.1f}ms", ""]
+    lines.append(f"{'cumulative ms':>14}  top-level import")
+    lines += [f"{t.cumulative_us / 1000:>14.1f}  {t.module}" for t in top_level[:top]]
+    lines += ["", f"{'self ms':>14}  module"]
+    lines += [f"{t.self_us / 1000:>14.1f}  {t.module}" for t in by_self[:top]]
+    return "\n".join(lines)
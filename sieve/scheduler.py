@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from urllib.parse import urlsplit
+
+from sieve.driver import DriverProtocol
+from sieve.logger import get_logger
+from sieve.pool import DriverPool
+
+
+logger = get_logger(__name__)
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CrawlUnit:
+    query: str
+    page: int
+    url: str
+
+    @property
+    def domain(self) -> str:
+        return urlsplit(self.url).netloc
+
+
+@dataclass
+class UnitResult(Generic[T]):
+    unit: CrawlUnit
+    value: T | None = None
+    error: Exception | None = None
+    attempts: int = 0
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+class RateLimiter:
+    """Spaces out requests to each domain by a minimum interval in seconds"""
+
+    def __init__(self, default_interval: float, intervals: Mapping[str, float] | None = None):
+        self.default_interval = default_interval
+        self.intervals = dict(intervals or {})
+        self._next_slot: defaultdict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def wait(self, domain: str) -> None:
+        """Block until `domain` may be requested again"""
+        interval = self.intervals.get(domain, self.default_interval)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot[domain])
+            self._next_slot[domain] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Scheduler:
+    """Runs crawl units concurrently, one `DriverPool` session per worker
+
+    Each unit waits for its domain's rate limit, is retried with full-jitter exponential backoff
+    and is skipped once the global `deadline` (seconds from the start of `run`) has passed.
+    """
+
+    MAX_ATTEMPTS = 3
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 30.0
+    DOMAIN_INTERVAL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        pool: DriverPool,
+        workers: int | None = None,
+        rate_limiter: RateLimiter | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        self.pool = pool
+        self.workers = workers or pool.size
+        self.rate_limiter = rate_limiter or RateLimiter(self.DOMAIN_INTERVAL_SECONDS)
+        self.deadline = deadline
+
+    def run(
+        self,
+        units: Iterable[CrawlUnit],
+        job: Callable[[DriverProtocol, CrawlUnit], T],
+    ) -> list[UnitResult[T]]:
+        """Run `job` for every unit and return the results in submission order"""
+        deadline = None if self.deadline is None else time.monotonic() + self.deadline
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler") as pool:
+            futures = [pool.submit(self._run_unit, unit, job, deadline) for unit in units]
+            results = [future.result() for future in futures]
+
+        logger.info(
+            "[scheduler] %s units: %s ok, %s failed, %s skipped",
+            len(results),
+            sum(result.ok for result in results),
+            sum(result.error is not None for result in results),
+            sum(result.skipped for result in results),
+        )
+        return results
+
+    def _run_unit(
+        self,
+        unit: CrawlUnit,
+        job: Callable[[DriverProtocol, CrawlUnit], T],
+        deadline: float | None,
+    ) -> UnitResult[T]:
+        result: UnitResult[T] = UnitResult(unit)
+        while result.attempts < self.MAX_ATTEMPTS:
+            if self._remaining(deadline) == 0:
+                result.skipped = result.error is None
+                return result
+
+            result.attempts += 1
+            self.rate_limiter.wait(unit.domain)
+            try:
+                with self.pool.session(timeout=self._remaining(deadline)) as driver:
+                    result.value = job(driver, unit)
+                result.error = None
+                return result
+            except Exception as exc:
+                result.error = exc
+                logger.warning(
+                    "[scheduler] attempt %s failed: %s", result.attempts, unit.url, exc_info=True
+                )
+
+            if result.attempts < self.MAX_ATTEMPTS:
+                time.sleep(self._backoff(result.attempts, deadline))
+        return result
+
+    def _backoff(self, attempt: int, deadline: float | None) -> float:
+        cap = min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+        delay = random.uniform(0, cap)
+        remaining = self._remaining(deadline)
+        return delay if remaining is None else min(delay, remaining)
+
+    @staticmethod
+    def _remaining(deadline: float | None) -> float | None:
+        return None if deadline is None else max(deadline - time.monotonic(), 0)
@@ -0,0 +1,128 @@
+import itertools
+import os
+import re
+
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sieve.logger import get_logger
+from sieve.settings import ScreenshotFormatStr, ScreenshotModeStr, settings
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ScreenshotPolicy:
+    """How `Driver.save_screenshot` captures a page and how many captures are kept
+
+    `viewport` grabs only what is on screen, `full_page` the whole document up to `max_height` CSS
+    pixels, and `dom` saves the page source instead of an image. `quality` applies to jpeg/webp.
+    """
+
+    mode: ScreenshotModeStr = "full_page"
+    format: ScreenshotFormatStr = "png"
+    quality: int = 70
+    max_height: int = 12000
+    directory: str = "screenshots"
+    max_files: int = 50
+    max_bytes: int = 50 * 2**20
+
+    @classmethod
+    def from_settings(cls) -> "ScreenshotPolicy":
+        return cls(
+            mode=settings.screenshot_mode,
+            format=settings.screenshot_format,
+            quality=settings.screenshot_quality,
+            directory=settings.screenshot_dir,
+            max_files=settings.screenshot_max_files,
+            max_bytes=settings.screenshot_max_bytes,
+        )
+
+
+def capture_params(
+    policy: ScreenshotPolicy, content_size: Mapping[str, float] | None = None
+) -> dict[str, Any]:
+    """CDP `Page.captureScreenshot` parameters for `policy`
+
+    A `full_page` capture is clipped to `content_size`, the `cssContentSize` of
+    `Page.getLayoutMetrics`, cut at `max_height`.
+    """
+    params: dict[str, Any] = {"format": policy.format}
+    if policy.format != "png":
+        params["quality"] = policy.quality
+    if policy.mode == "full_page" and content_size is not None:
+        params["captureBeyondViewport"] = True
+        params["clip"] = {
+            "x": 0,
+            "y": 0,
+            "width": content_size["width"],
+            "height": min(content_size["height"], policy.max_height),
+            "scale": 1,
+        }
+    return params
+
+
+# a single writer thread keeps disk I/O and pruning off the scrape threads and serializes pruning
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+_SEQUENCE = itertools.count()
+
+
+class ScreenshotWriter:
+    """Writes captures under `policy.directory` with unique names, then prunes the oldest captures
+
+    Only files named like a capture are counted and pruned, anything else in the directory is left
+    alone.
+    """
+
+    # `path` names, for any stem
+    CAPTURE_NAME = re.compile(r".+-\d{8}T\d{6}-\d+-\d+\.(?:png|jpeg|webp|html)")
+
+    def __init__(self, policy: ScreenshotPolicy) -> None:
+        self.policy = policy
+        self.directory = Path(policy.directory)
+
+    def path(self, filename: str, extension: str) -> Path:
+        """`<stem>-<utc timestamp>-<pid>-<sequence>.<extension>` inside the screenshot directory"""
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = f"{Path(filename).stem}-{timestamp}-{os.getpid()}-{next(_SEQUENCE)}.{extension}"
+        return self.directory / name
+
+    def write(self, filename: str, data: bytes, extension: str) -> "Future[Path]":
+        path = self.path(filename, extension)
+        return _EXECUTOR.submit(self._write, path, data)
+
+    def _write(self, path: Path, data: bytes) -> Path:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            self.prune()
+        except OSError:
+            logger.exception("[driver] failed to write screenshot: %s", path)
+            raise
+        logger.info("[driver] screenshot saved: %s", path, extra={"screenshot_bytes": len(data)})
+        return path
+
+    def prune(self) -> None:
+        """Delete the oldest captures until at most `max_files` totalling `max_bytes` remain"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if self.CAPTURE_NAME.fullmatch(entry.name) and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        files.sort(reverse=True)
+
+        count = total_bytes = 0
+        for _, size, path in files:
+            count += 1
+            total_bytes += size
+            if count <= self.policy.max_files and total_bytes <= self.policy.max_bytes:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
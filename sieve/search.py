@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from datetime import date
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from sieve.db import connection
+from sieve.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+TEXT_SEARCH_CONFIG = "english"
+
+# title matches outrank company matches, which outrank description matches
+SEARCH_VECTOR = f"""
+setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A')
+|| setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(company, '')), 'B')
+|| setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(job_desc, '')), 'C')
+"""
+
+# idempotent, so safe to run against a database created before the search column existed; the
+# generated column is kept up to date by Postgres on every insert and update
+SCHEMA = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    ALTER TABLE postings ADD COLUMN IF NOT EXISTS search tsvector
+    GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS postings_search ON postings USING GIN (search)",
+    "CREATE INDEX IF NOT EXISTS postings_title_trgm ON postings USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS postings_company_trgm ON postings USING GIN (company gin_trgm_ops)",
+)
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """Position after the last hit of a page, `(rank, id)` in result order"""
+
+    rank: float
+    id: int
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    id: int
+    title: str
+    company: str
+    location: str
+    date: date
+    link: str
+    rank: float
+
+    @property
+    def cursor(self) -> SearchCursor:
+        return SearchCursor(self.rank, self.id)
+
+
+@dataclass
+class SearchPage:
+    hits: list[SearchHit]
+    next: SearchCursor | None
+
+
+def like_pattern(text: str) -> str:
+    """`ILIKE` pattern matching `text` anywhere, with `%`, `_` and `\\` taken literally"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class PostingSearch:
+    """Ranked full-text search over `postings` using the `search` column and its GIN index
+
+    Pages are keyset paginated on `(rank, id)`: the next page starts after the cursor of the last
+    hit instead of skipping `OFFSET` rows, so pages stay stable while postings are written. The
+    rank is computed per query, not indexed, so every page still scores every matching posting
+    before filtering on the cursor: a page costs in proportion to all the matches of the query,
+    whatever its depth, and broad queries stay expensive. `title` and `company` filters are
+    substring matches served by the trigram indexes.
+    """
+
+    PAGE_SIZE = 25
+    MAX_PAGE_SIZE = 200
+
+    def __init__(self, pool: ThreadedConnectionPool | None = None) -> None:
+        self.pool = pool
+
+    def ensure_schema(self) -> None:
+        """Add the search column and indexes if missing; the first run rewrites the table"""
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            for statement in SCHEMA:
+                cur.execute(statement)
+        logger.info("[search] schema ready")
+
+    def search(
+        self,
+        query: str,
+        after: SearchCursor | None = None,
+        limit: int | None = None,
+        title: str | None = None,
+        company: str | None = None,
+    ) -> SearchPage:
+        """One page of postings matching `query`, best first, starting after the `after` cursor
+
+        `query` uses web search syntax: quoted phrases, `or` and `-excluded` terms.
+        """
+        limit = min(limit or self.PAGE_SIZE, self.MAX_PAGE_SIZE)
+        filters = ["search @@ query"]
+        params: list[object] = [query]
+        if title:
+            filters.append("title ILIKE %s")
+            params.append(like_pattern(title))
+        if company:
+            filters.append("company ILIKE %s")
+            params.append(like_pattern(company))
+        keyset = ""
+        if after is not None:
+            # `real` so the cursor compares equal to the rank it was read from
+            keyset = "WHERE (rank, id) < (%s::real, %s)"
+            params += [after.rank, after.id]
+        # one row past the page tells whether there is a next page
+        params.append(limit + 1)
+
+        with connection(self.pool) as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT id, title, company, location, date, link, rank FROM (
+                    SELECT id, title, company, location, date, link,
+                    ts_rank_cd(search, query) AS rank
+                    FROM postings, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s) AS query
+                    WHERE {" AND ".join(filters)}
+                ) AS hits
+                {keyset}
+                ORDER BY rank DESC, id DESC
+                LIMIT %s
+                """,
+                params,
+            )
+            rows = cur.fetchall()
+
+        hits = [SearchHit(*row) for row in rows[:limit]]
+        next_cursor = hits[-1].cursor if len(rows) > limit else None
+        logger.debug("[search] %r: %s hits", query, len(hits), extra={"query": query})
+        return SearchPage(hits, next_cursor)
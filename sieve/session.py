@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import secrets
+import struct
+import time
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from sieve.exceptions import SystemException
+from sieve.http import BROWSER_HEADERS
+from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+# `sieve.driver` imports this module when the session cache is enabled
+if TYPE_CHECKING:
+    from sieve.driver import DriverProtocol
+
+
+logger = get_logger(__name__)
+
+
+# magic, format version, scrypt salt, AES-GCM nonce
+_HEADER = struct.Struct("!4sB16s12s")
+_MAGIC = b"SVSC"
+_VERSION = 2
+
+
+def _key(secret: bytes, salt: bytes) -> bytes:
+    return hashlib.scrypt(secret, salt=salt, n=2**14, r=8, p=1, dklen=32)
+
+
+def encrypt(plaintext: bytes, secret: bytes) -> bytes:
+    """AES-256-GCM under a key scrypt derives from `secret` and a random salt
+
+    The header carrying the salt and nonce is authenticated as associated data.
+    """
+    header = _HEADER.pack(_MAGIC, _VERSION, secrets.token_bytes(16), secrets.token_bytes(12))
+    _, _, salt, nonce = _HEADER.unpack(header)
+    return header + AESGCM(_key(secret, salt)).encrypt(nonce, plaintext, header)
+
+
+def decrypt(blob: bytes, secret: bytes) -> bytes:
+    """Inverse of `encrypt`, raises `ValueError` when `blob` was not sealed with `secret`"""
+    if len(blob) < _HEADER.size:
+        raise ValueError("Session cache is truncated")
+    magic, version, salt, nonce = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a session cache")
+    header = blob[: _HEADER.size]
+    try:
+        return AESGCM(_key(secret, salt)).decrypt(nonce, blob[_HEADER.size :], header)
+    except InvalidTag as exc:
+        raise ValueError("Session cache failed authentication") from exc
+
+
+def session_secret() -> bytes:
+    """Key material for the cache, `SESSION_SECRET` or else the LinkedIn credentials"""
+    if settings.session_secret is not None:
+        return settings.session_secret.get_secret_value().encode()
+    if settings.linkedin_email is None or settings.linkedin_pass is None:
+        raise SystemException("SESSION_SECRET or LINKEDIN_EMAIL & LINKEDIN_PASS REQUIRED")
+    credentials = (settings.linkedin_email, settings.linkedin_pass)
+    return "\x1f".join(value.get_secret_value() for value in credentials).encode()
+
+
+@dataclass
+class SessionState:
+    origin: str
+    cookies: list[dict] = field(default_factory=list)
+    local_storage: dict[str, str] = field(default_factory=dict)
+    saved_at: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.saved_at
+
+
+def http_probe(state: SessionState) -> bool:
+    """Check the cookies with one plain HTTP request, no browser involved
+
+    A logged in session gets the feed, a logged out one is redirected to the login page.
+    """
+    cookies = {cookie["name"]: cookie["value"] for cookie in state.cookies}
+    try:
+        response = httpx.get(
+            SessionCache.PROBE_URL,
+            headers=BROWSER_HEADERS,
+            cookies=cookies,
+            follow_redirects=False,
+            timeout=10.0,
+        )
+    except httpx.HTTPError:
+        logger.warning("[session] probe request failed", exc_info=True)
+        return False
+    return response.status_code == 200
+
+
+LOCAL_STORAGE_READ = "return Object.assign({}, window.localStorage);"
+LOCAL_STORAGE_WRITE = """
+for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);
+"""
+
+
+class SessionCache:
+    """Encrypted cookies + localStorage of a logged in browser, reused across drivers and runs
+
+    `rehydrate` copies a cached session into a new driver once `probe` confirms it is still
+    logged in; `ensure` also falls back to `login` and caches the fresh session. States older than
+    `ttl` seconds are never reused, and a passing probe is trusted for `PROBE_INTERVAL` seconds.
+    """
+
+    ORIGIN = "https://www.linkedin.com/"
+    PROBE_URL = "https://www.linkedin.com/feed/"
+    PROBE_INTERVAL = 300
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float | None = None,
+        probe: Callable[[SessionState], bool] = http_probe,
+        secret: bytes | None = None,
+    ) -> None:
+        self.path = Path(path or settings.session_cache_path)
+        self.ttl = ttl or settings.session_cache_ttl_hours * 3600
+        self.probe = probe
+        self._secret = secret
+        self._state: SessionState | None = None
+        self._probed_at = 0.0
+
+    @property
+    def secret(self) -> bytes:
+        if self._secret is None:
+            self._secret = session_secret()
+        return self._secret
+
+    def load(self) -> SessionState | None:
+        """The cached state, or `None` when missing, expired or unreadable"""
+        try:
+            plaintext = decrypt(self.path.read_bytes(), self.secret)
+            state = SessionState(**json.loads(plaintext))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError):
+            logger.warning("[session] ignoring unreadable session cache: %s", self.path)
+            return None
+        if state.age > self.ttl:
+            logger.info("[session] cached session expired")
+            return None
+        return state
+
+    def valid_state(self) -> SessionState | None:
+        """A loaded state that passed `probe` within the last `PROBE_INTERVAL` seconds"""
+        if self._state is not None and time.monotonic() - self._probed_at < self.PROBE_INTERVAL:
+            return self._state
+        self._state = self.load()
+        if self._state is not None and not self.probe(self._state):
+            logger.info("[session] cached session rejected by probe")
+            self._state = None
+        self._probed_at = time.monotonic()
+        return self._state
+
+    def save(self, driver: "DriverProtocol") -> SessionState:
+        """Capture the session of the logged in `driver` and write it encrypted"""
+        state = SessionState(
+            origin=self.ORIGIN,
+            cookies=driver.driver.get_cookies(),
+            local_storage=driver.driver.execute_script(LOCAL_STORAGE_READ) or {},
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        blob = encrypt(json.dumps(asdict(state)).encode(), self.secret)
+        # `O_CREAT`'s mode only applies to a new file, a stale temp file is tightened as well
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            os.fchmod(file.fileno(), 0o600)
+            file.write(blob)
+        os.replace(temp_path, self.path)
+        self._state, self._probed_at = state, time.monotonic()
+        logger.info("[session] cached %s cookies", len(state.cookies))
+        return state
+
+    def rehydrate(self, driver: "DriverProtocol") -> bool:
+        """Load a valid cached session into `driver`, returns whether there was one"""
+        state = self.valid_state()
+        if state is None:
+            return False
+        # cookies can only be set for the domain of the current page
+        driver.get(state.origin)
+        for cookie in state.cookies:
+            driver.driver.add_cookie(cookie)
+        if state.local_storage:
+            driver.driver.execute_script(LOCAL_STORAGE_WRITE, state.local_storage)
+        logger.info("[session] restored cached session")
+        return True
+
+    def ensure(self, driver: "DriverProtocol", login: Callable[["DriverProtocol"], None]) -> bool:
+        """Rehydrate `driver`, or run `login` and cache the result; returns whether it was cached"""
+        if self.rehydrate(driver):
+            return True
+        login(driver)
+        self.save(driver)
+        return False
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self._state = None
+
+
+SESSION_CACHE: SessionCache | None = None
+
+
+def get_session_cache() -> SessionCache:
+    """Shared cache, so drivers started by one process share a probe result"""
+    # pylint: disable = global-statement
+    global SESSION_CACHE
+    if SESSION_CACHE is None:
+        SESSION_CACHE = SessionCache()
+    return SESSION_CACHE
@@ -6,6 +6,10 @@ from pydantic import BaseSettings, SecretStr
 
 
 LogLevelStr = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+QueueOverflowStr = Literal["drop", "block"]
+DriverProfileStr = Literal["full", "lite", "text"]
+ScreenshotModeStr = Literal["viewport", "full_page", "dom"]
+ScreenshotFormatStr = Literal["png", "jpeg", "webp"]
 
 
 class Settings(BaseSettings):
@@ -14,15 +18,40 @@ class Settings(BaseSettings):
     hostname: str = "localhost"
     log_level: LogLevelStr = "DEBUG"
 
+    # daemon
+    daemon_interval_seconds: int = 300
+
+    # logging
+    log_queue_enabled: bool = False
+    log_queue_size: int = 10_000
+    log_queue_overflow: QueueOverflowStr = "drop"
+
     # db
     db_name: str = "sieve_db"
     db_user: SecretStr = SecretStr("sieve_user")
     db_pass: SecretStr = SecretStr("pass")
     db_host: str = "db"
+    db_pool_size: int = 4
+
+    # dedupe
+    dedupe_capacity: int = 1_000_000
+    dedupe_error_rate: float = 0.001
+    dedupe_snapshot_path: str = "cache/known_postings.bin"
+
+    # crawl
+    crawl_max_pages: int = 40
+    crawl_full_sweep_hours: int = 168
+
+    # tech
+    tech_dictionary_path: str | None = None
 
     # linkedin
     linkedin_email: SecretStr | None = None
     linkedin_pass: SecretStr | None = None
+    session_cache_enabled: bool = False
+    session_cache_path: str = "cache/session.bin"
+    session_cache_ttl_hours: int = 24
+    session_secret: SecretStr | None = None
 
     # datadog
     dd_site: SecretStr | None = None
@@ -31,6 +60,20 @@ class Settings(BaseSettings):
     # browserless
     driver_width: int = 1200
     driver_height: int = 800
+    max_concurrent_sessions: int = 1
+    driver_max_age_seconds: int = 1800
+    driver_max_uses: int = 50
+    driver_instrument: bool = False
+    driver_profile: DriverProfileStr = "full"
+    driver_track_transfer: bool = False
+
+    # screenshots
+    screenshot_mode: ScreenshotModeStr = "full_page"
+    screenshot_format: ScreenshotFormatStr = "png"
+    screenshot_quality: int = 70
+    screenshot_dir: str = "screenshots"
+    screenshot_max_files: int = 50
+    screenshot_max_bytes: int = 50 * 2**20
 
     @property
     def is_dev(self) -> bool:
@@ -0,0 +1,116 @@
+from collections.abc import Callable, Mapping
+from pathlib import Path
+
+from lxml import etree, html
+from selenium.common.exceptions import NoSuchElementException
+
+from sieve.driver import DriverProtocol, Record
+from sieve.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def parse_html(source: str, url: str | None = None) -> html.HtmlElement:
+    """Parse a page (or fragment) into an lxml tree with `<script>`/`<style>` text removed"""
+    root = html.document_fromstring(source or "<html></html>", base_url=url)
+    etree.strip_elements(root, "script", "style", "noscript", with_tail=False)
+    return root
+
+
+def node_text(node: object) -> str | None:
+    """Whitespace-normalized text of an XPath result, mirroring `Element.text`"""
+    if node is None:
+        return None
+    if isinstance(node, html.HtmlElement):
+        node = node.text_content()
+    return " ".join(str(node).split())
+
+
+class SnapshotElement:
+    def __init__(self, element: html.HtmlElement) -> None:
+        self._element = element
+
+    @property
+    def text(self) -> str:
+        return node_text(self._element) or ""
+
+    def screenshot(self, filename: str) -> bool:
+        # there are no pixels to capture offline
+        return False
+
+
+class SnapshotDriver:
+    """`DriverProtocol` implementation that answers XPath queries from a parsed HTML snapshot
+
+    `get` hands the url to `loader` for the page source (a live driver, saved fixtures, an HTTP
+    client...) and parses it once, so every following `element`/`extract` call runs in-process.
+    """
+
+    def __init__(self, loader: Callable[[str], str], source: str = "", url: str = "") -> None:
+        self._loader = loader
+        self.url = url
+        self._tree = parse_html(source, url or None)
+
+    @classmethod
+    def from_html(cls, source: str, url: str = "") -> "SnapshotDriver":
+        def no_loader(url: str) -> str:
+            raise NoSuchElementException(f"No snapshot available: {url}")
+
+        return cls(no_loader, source=source, url=url)
+
+    @classmethod
+    def from_files(cls, pages: Mapping[str, str | Path]) -> "SnapshotDriver":
+        """Replay saved pages, keyed by url"""
+        return cls(lambda url: Path(pages[url]).read_text(encoding="utf-8"))
+
+    @classmethod
+    def from_driver(cls, driver: DriverProtocol) -> "SnapshotDriver":
+        """Navigate with a live `driver` and take one `page_source` snapshot per page"""
+
+        def page_source(url: str) -> str:
+            driver.get(url)
+            source: str = driver.driver.page_source
+            return source
+
+        return cls(page_source, source=driver.driver.page_source, url=driver.driver.current_url)
+
+    @property
+    def driver(self) -> html.HtmlElement:
+        return self._tree
+
+    def get(self, url: str) -> None:
+        """Load and parse the page source for `url`"""
+        logger.info("[snapshot] GET: %s", url)
+        self._tree = parse_html(self._loader(url), url)
+        self.url = url
+
+    def element(self, xpath: str) -> SnapshotElement:
+        """Will return the first `SnapshotElement` that matches the `xpath`"""
+        elements = self.elements(xpath)
+        if not elements:
+            raise NoSuchElementException(f"No elements found: {xpath}")
+        return elements[0]
+
+    def elements(self, xpath: str) -> list[SnapshotElement]:
+        nodes = self._tree.xpath(xpath)
+        return [SnapshotElement(node) for node in nodes if isinstance(node, html.HtmlElement)]
+
+    def extract(self, container_xpath: str, fields: Mapping[str, str]) -> list[Record]:
+        """Same contract as `Driver.extract`, evaluated against the snapshot"""
+        records = []
+        for container in self._tree.xpath(container_xpath):
+            record: Record = {}
+            for name, xpath in fields.items():
+                result = container.xpath(xpath)
+                if isinstance(result, list):
+                    result = result[0] if result else None
+                record[name] = node_text(result)
+            records.append(record)
+        return records
+
+    def save_screenshot(self, filename: str) -> bool:
+        return False
+
+    def quit(self) -> None:
+        return None
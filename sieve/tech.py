@@ -0,0 +1,214 @@
+import json
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from sieve.logger import get_logger
+from sieve.settings import settings
+
+
+logger = get_logger(__name__)
+
+
+# canonical name -> aliases; the canonical name is matched too
+DEFAULT_DICTIONARY: dict[str, list[str]] = {
+    # languages
+    "python": ["python3"],
+    "java": [],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": [],
+    "golang": [],
+    "rust": [],
+    "c++": ["cpp"],
+    "c#": ["csharp"],
+    "ruby": [],
+    "php": [],
+    "scala": [],
+    "kotlin": [],
+    "swift": [],
+    "elixir": [],
+    "haskell": [],
+    "clojure": [],
+    "sql": [],
+    "bash": ["shell scripting"],
+    # frameworks
+    "django": [],
+    "flask": [],
+    "fastapi": [],
+    "pydantic": [],
+    "celery": [],
+    "rails": ["ruby on rails"],
+    "spring boot": ["spring framework"],
+    "node.js": ["nodejs"],
+    "express.js": ["expressjs"],
+    "react": ["react.js", "reactjs"],
+    "vue": ["vue.js", "vuejs"],
+    "angular": ["angularjs"],
+    "next.js": ["nextjs"],
+    ".net": ["dotnet", "asp.net"],
+    "graphql": [],
+    "grpc": [],
+    # data
+    "postgres": ["postgresql", "psql"],
+    "mysql": [],
+    "sqlite": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "elasticsearch": ["elastic search", "opensearch"],
+    "cassandra": [],
+    "dynamodb": [],
+    "snowflake": [],
+    "bigquery": [],
+    "redshift": [],
+    "kafka": [],
+    "rabbitmq": [],
+    "spark": ["pyspark", "apache spark"],
+    "airflow": ["apache airflow"],
+    "dbt": [],
+    "pandas": [],
+    "numpy": [],
+    "pytorch": ["torch"],
+    "tensorflow": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    # infrastructure
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": [],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ansible": [],
+    "linux": [],
+    "nginx": [],
+    "git": [],
+    "github actions": [],
+    "jenkins": [],
+    "ci/cd": ["cicd", "continuous integration"],
+    "datadog": [],
+    "prometheus": [],
+    "grafana": [],
+    "selenium": [],
+}
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class TechTagger:
+    """Finds every technology of a dictionary in a text in one pass, Aho-Corasick style
+
+    The aliases are compiled into a trie whose failure links are folded into the transitions, so
+    scanning costs one dict lookup per character however many aliases there are, instead of one
+    regex scan of the text per alias. Matching ignores case, and an alias starting or ending with a
+    letter, digit or `_` only matches at a word boundary on that side: "java" is not found in
+    "javascript", while "c++" is found in "c++17". Aliases that are also common English words
+    ("go", "express") are left out of the default dictionary.
+    """
+
+    # cap of the `postings.tech` column
+    MAX_LENGTH = 200
+
+    def __init__(self, dictionary: Mapping[str, Iterable[str]] | None = None) -> None:
+        dictionary = DEFAULT_DICTIONARY if dictionary is None else dictionary
+        # per state: transitions, and the (length, tech, check start, check end) of aliases ending
+        # there, including those reached through failure links
+        self._delta: list[dict[str, int]] = [{}]
+        self._outputs: list[tuple[tuple[int, str, bool, bool], ...]] = [()]
+        self.aliases = 0
+        for tech, aliases in dictionary.items():
+            for alias in {tech, *aliases}:
+                self._add(alias.lower(), tech)
+        self._link()
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "TechTagger":
+        """Tagger for a JSON object of `{"tech": ["alias", ...]}`"""
+        dictionary = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(dictionary)
+
+    @classmethod
+    def from_settings(cls) -> "TechTagger":
+        if settings.tech_dictionary_path:
+            return cls.from_file(settings.tech_dictionary_path)
+        return cls()
+
+    def _add(self, alias: str, tech: str) -> None:
+        alias = " ".join(alias.split())
+        if not alias:
+            return
+        state = 0
+        for char in alias:
+            if char not in self._delta[state]:
+                self._delta[state][char] = len(self._delta)
+                self._delta.append({})
+                self._outputs.append(())
+            state = self._delta[state][char]
+        output = (len(alias), tech, _is_word(alias[0]), _is_word(alias[-1]))
+        if output not in self._outputs[state]:
+            self._outputs[state] += (output,)
+            self.aliases += 1
+
+    def _link(self) -> None:
+        # breadth first, so the failure state of every node is complete before its children
+        fail = [0] * len(self._delta)
+        trie = [dict(transitions) for transitions in self._delta]
+        queue = deque(trie[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in trie[state].items():
+                queue.append(child)
+                fail[child] = self._delta[fail[state]].get(char, 0) if state else 0
+                self._outputs[child] += self._outputs[fail[child]]
+            if state:
+                self._delta[state] = self._delta[fail[state]] | trie[state]
+
+    def tag(self, text: str | None) -> list[str]:
+        """Technologies mentioned in `text`, in order of first mention"""
+        if not text:
+            return []
+        text = " ".join(text.lower().split())
+        delta, outputs = self._delta, self._outputs
+        found: dict[str, None] = {}
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for length, tech, check_start, check_end in outputs[state]:
+                if tech in found:
+                    continue
+                start = end - length
+                if check_start and start > 0 and _is_word(text[start - 1]):
+                    continue
+                if check_end and end < len(text) and _is_word(text[end]):
+                    continue
+                found[tech] = None
+        return list(found)
+
+    def tag_many(self, texts: Iterable[str | None]) -> list[list[str]]:
+        return [self.tag(text) for text in texts]
+
+    def column(self, text: str | None) -> str:
+        """`tag` formatted for `postings.tech`, stopping before `MAX_LENGTH`"""
+        value = ""
+        for tech in self.tag(text):
+            candidate = f"{value}, {tech}" if value else tech
+            if len(candidate) > self.MAX_LENGTH:
+                break
+            value = candidate
+        return value
+
+
+TECH_TAGGER: TechTagger | None = None
+
+
+def get_tech_tagger() -> TechTagger:
+    """Shared tagger, the automaton is built once per process"""
+    # pylint: disable = global-statement
+    global TECH_TAGGER
+    if TECH_TAGGER is None:
+        TECH_TAGGER = TechTagger.from_settings()
+        logger.info("[tech] %s aliases loaded", TECH_TAGGER.aliases)
+    return TECH_TAGGER
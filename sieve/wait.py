@@ -0,0 +1,140 @@
+import time
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from selenium.common.exceptions import WebDriverException
+
+from sieve.logger import get_logger
+from sieve.metrics import LatencyStat
+
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Remote
+    from selenium.webdriver.remote.webelement import WebElement
+
+
+logger = get_logger(__name__)
+
+
+# `selenium.webdriver.common.by.By.XPATH`, without importing `selenium.webdriver`
+BY_XPATH = "xpath"
+
+
+# Resolves with the first element matching `xpath` as soon as a DOM mutation produces one, or with
+# `null` once `timeoutMs` has elapsed
+OBSERVER_SCRIPT = """
+const [xpath, timeoutMs, done] = arguments;
+const find = () => {
+  const result = document.evaluate(
+    xpath, document, null, XPathResult.ORDERED_NODE_ITERATOR_TYPE, null
+  );
+  for (let node = result.iterateNext(); node; node = result.iterateNext()) {
+    if (node.nodeType === Node.ELEMENT_NODE) return node;
+  }
+  return null;
+};
+const found = find();
+if (found) return done(found);
+const observer = new MutationObserver(() => {
+  const node = find();
+  if (node) {
+    observer.disconnect();
+    clearTimeout(timer);
+    done(node);
+  }
+});
+const timer = setTimeout(() => {
+  observer.disconnect();
+  done(null);
+}, timeoutMs);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+"""
+
+
+@dataclass
+class WaitStat(LatencyStat):
+    timeouts: int = 0
+
+
+class XPathWaiter:
+    """Waits for an XPath to match using an in-page `MutationObserver`
+
+    When the observer script cannot run (navigation mid-wait, script timeout, no JS) it falls back
+    to polling `find_elements` with an exponential backoff that starts at `INITIAL_POLL_INTERVAL`.
+    Wait times are recorded per XPath in `stats`.
+    """
+
+    INITIAL_POLL_INTERVAL = 0.05
+    BACKOFF_FACTOR = 2
+    SLOW_WAIT_SECONDS = 1.0
+
+    def __init__(self) -> None:
+        self.stats: defaultdict[str, WaitStat] = defaultdict(WaitStat)
+
+    def wait(
+        self,
+        driver: "Remote",
+        xpath: str,
+        timeout: float,
+        max_interval: float,
+    ) -> "WebElement | None":
+        """Return the first element matching `xpath`, or `None` once `timeout` seconds pass"""
+        start = time.monotonic()
+        deadline = start + timeout
+        try:
+            element: "WebElement | None" = driver.execute_async_script(
+                OBSERVER_SCRIPT, xpath, int(timeout * 1000)
+            )
+        except WebDriverException:
+            logger.debug("[driver] observer wait failed, polling: %s", xpath, exc_info=True)
+            element = self._poll(driver, xpath, deadline, max_interval)
+
+        self.record(xpath, time.monotonic() - start, found=element is not None)
+        return element
+
+    def record(self, xpath: str, elapsed: float, found: bool) -> None:
+        """Count one wait for `xpath`, for waits made without `wait` too"""
+        stat = self.stats[xpath]
+        stat.record(elapsed)
+        if not found:
+            stat.timeouts += 1
+        elif elapsed >= self.SLOW_WAIT_SECONDS:
+            logger.info(
+                "[driver] slow selector: %s",
+                xpath,
+                extra={"xpath": xpath, "wait_seconds": round(elapsed, 3)},
+            )
+
+    def _poll(
+        self,
+        driver: "Remote",
+        xpath: str,
+        deadline: float,
+        max_interval: float,
+    ) -> "WebElement | None":
+        interval = self.INITIAL_POLL_INTERVAL
+        while True:
+            elements = driver.find_elements(by=BY_XPATH, value=xpath)
+            if elements:
+                return elements[0]
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(interval, max_interval, remaining))
+            interval *= self.BACKOFF_FACTOR
+
+    def summary(self) -> list[dict]:
+        """Per-XPath wait statistics, slowest total wait first"""
+        return [
+            {
+                "xpath": xpath,
+                "count": stat.count,
+                "timeouts": stat.timeouts,
+                "mean_seconds": round(stat.mean, 4),
+                "max_seconds": round(stat.max, 4),
+                "total_seconds": round(stat.total, 4),
+            }
+            for xpath, stat in sorted(self.stats.items(), key=lambda item: -item[1].total)
+        ]
@@ -82,9 +82,16 @@ def enable_logging():
     logging.disable(logging.CRITICAL)
 
 
+@fixture(autouse=True)
+def screenshot_dir(monkeypatch: MonkeyPatch, tmp_path):
+    screenshot_settings = _test_settings.copy(update={"screenshot_dir": str(tmp_path / "ss")})
+    monkeypatch.setattr("sieve.screenshot.settings", screenshot_settings)
+    yield tmp_path / "ss"
+
+
 @fixture(name="patch_driver")
 def patch_driver_(monkeypatch: MonkeyPatch):
-    monkeypatch.setattr("sieve.driver.Remote", MockRemote)
+    monkeypatch.setattr("selenium.webdriver.Remote", MockRemote)
     monkeypatch.setattr("sieve.driver.Driver.POLL_INTERVAL", 0)
     monkeypatch.setattr("sieve.driver.Driver.WAIT_TIME_SECONDS", 0.1)
 
@@ -1,6 +1,13 @@
+import base64
+import json
+
+from collections.abc import Mapping
+
+import httpx
+
 from pydantic.env_settings import SettingsSourceCallable
 
-from sieve.driver import ElementProtocol
+from sieve.driver import ElementProtocol, Record
 from sieve.settings import Settings
 
 
@@ -38,15 +45,56 @@ class TestElement:
         return True
 
 
+class MockSwitchTo:
+    def __init__(self, remote: "MockRemote") -> None:
+        self._remote = remote
+
+    def window(self, handle: str) -> None:
+        self._remote.current_window_handle = handle
+
+
+class MockCommandExecutor:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._commands: dict[str, tuple[str, str]] = {}
+
+
 class MockRemote:
+    SCREENSHOT = b"mock image"
+
     def __init__(self, *, command_executor, options) -> None:
-        self.command_executor = command_executor
+        self.command_executor = MockCommandExecutor(command_executor)
         self.options = options
         self.width = 1920
         self.height = 12000
+        self.url = ""
+        self.page_source = "<html><body>mock xpath</body></html>"
+        self.cookies: list[dict] = []
+        self.window_handles = ["tab-0"]
+        self.current_window_handle = "tab-0"
+        self.switch_to = MockSwitchTo(self)
+        self.quit_called = False
+        self.cdp_calls: list[tuple[str, dict]] = []
+        self.local_storage: dict[str, str] = {}
+
+    @property
+    def current_url(self) -> str:
+        return self.url
 
     def get(self, url: str) -> None:
-        return None
+        self.url = url
+
+    def close(self) -> None:
+        self.window_handles.remove(self.current_window_handle)
+
+    def delete_all_cookies(self) -> None:
+        self.cookies.clear()
+
+    def get_cookies(self) -> list[dict]:
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie: dict) -> None:
+        self.cookies.append(dict(cookie))
 
     def set_window_size(self, width: int, height: int) -> None:
         self.width = width
@@ -60,15 +108,40 @@ class MockRemote:
     def get_window_size(self, *args, **kwargs) -> dict[str, int]:
         return {"width": self.width, "height": self.height}
 
+    def execute_async_script(self, script: str, *args, **kwargs):
+        elements = self.find_elements(by="xpath", value=args[0])
+        return elements[0] if elements else None
+
     def execute_script(self, script: str, *args, **kwargs):
+        if "containerXPath" in script:
+            return [{name: "mock xpath" for name in args[1]}]
         if "offsetWidth" in script:
             return 1920
         if "offsetHeight" in script:
             return 3000
+        if "transferSize" in script:
+            return 2048
+        if "localStorage.setItem" in script:
+            self.local_storage.update(args[0])
+            return None
+        if "localStorage" in script:
+            return dict(self.local_storage)
         return None
 
+    def execute(self, driver_command: str, params: dict) -> dict:
+        assert driver_command in self.command_executor._commands
+        self.cdp_calls.append((params["cmd"], params["params"]))
+        if params["cmd"] == "Page.getLayoutMetrics":
+            return {"value": {"cssContentSize": {"x": 0, "y": 0, "width": 1920, "height": 30000}}}
+        if params["cmd"] == "Page.captureScreenshot":
+            return {"value": {"data": base64.b64encode(self.SCREENSHOT).decode()}}
+        return {"value": {}}
+
+    def get_screenshot_as_png(self) -> bytes:
+        return self.SCREENSHOT
+
     def quit(self) -> None:
-        return None
+        self.quit_called = True
 
 
 class TestDriver:
@@ -87,8 +160,148 @@ class TestDriver:
     def element(self, xpath: str) -> ElementProtocol:
         return TestElement(MockWebElement("mock xpath"))
 
+    def extract(self, container_xpath: str, fields: Mapping[str, str]) -> list[Record]:
+        return [{name: "mock xpath" for name in fields}]
+
     def save_screenshot(self, filename: str) -> bool:
         return True
 
     def quit(self) -> None:
         return self.driver.quit()
+
+
+class MockCursor:
+    def __init__(self, connection: "MockConnection") -> None:
+        self.connection = connection
+
+    def __enter__(self) -> "MockCursor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        return None
+
+    def execute(self, query: str, params=None) -> None:
+        self.connection.queries.append((" ".join(query.split()), params))
+
+    def fetchall(self) -> list[tuple]:
+        return self.connection.results.pop(0) if self.connection.results else []
+
+    def fetchone(self) -> tuple | None:
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class MockConnection:
+    def __init__(self, results: list[list[tuple]] | None = None) -> None:
+        self.queries: list[tuple[str, object]] = []
+        self.results = results or []
+        self.commits = 0
+
+    def __enter__(self) -> "MockConnection":
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        if exc_type is None:
+            self.commits += 1
+
+    def cursor(self, *args, **kwargs) -> MockCursor:
+        return MockCursor(self)
+
+
+class MockConnectionPool:
+    def __init__(self, connection: MockConnection) -> None:
+        self.connection = connection
+
+    def getconn(self) -> MockConnection:
+        return self.connection
+
+    def putconn(self, connection: MockConnection) -> None:
+        return None
+
+
+class MockWebDriverServer:
+    """browserless stand-in for `AsyncDriver`, mounted with `httpx.MockTransport`
+
+    Answers like `MockRemote`: `//body` matches a "body" element, any XPath in `missing` matches
+    nothing and every other XPath matches a "mock xpath" element.
+    """
+
+    ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+    SCREENSHOT = MockRemote.SCREENSHOT
+
+    def __init__(
+        self,
+        missing: set[str] | None = None,
+        cdp: bool = True,
+        observer: bool = True,
+    ) -> None:
+        self.missing = missing or set()
+        self.cdp = cdp
+        self.observer = observer
+        self.requests: list[tuple[str, str, dict | None]] = []
+        self.sessions: dict[str, dict] = {}
+        self.page_source = "<html><body>mock xpath</body></html>"
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url="http://browserless", transport=httpx.MockTransport(self))
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content) if request.content else None
+        path = request.url.path
+        self.requests.append((request.method, path, payload))
+
+        if path == "/session":
+            session_id = f"session-{len(self.sessions)}"
+            self.sessions[session_id] = {"url": "", "capabilities": payload, "open": True}
+            return self._ok({"sessionId": session_id, "capabilities": {}})
+
+        _, _, session_id, *command = path.split("/")
+        session = self.sessions[session_id]
+        route = "/".join(command)
+        if request.method == "DELETE" and not command:
+            session["open"] = False
+            return self._ok(None)
+        if route == "url":
+            session["url"] = payload["url"]
+            return self._ok(None)
+        if route == "execute/async" and not self.observer:
+            return httpx.Response(
+                500, json={"value": {"error": "javascript error", "message": "observer failed"}}
+            )
+        if route == "execute/async":
+            elements = self._elements(payload["args"][0])
+            return self._ok(elements[0] if elements else None)
+        if route == "elements":
+            return self._ok(self._elements(payload["value"]))
+        if route == "execute/sync":
+            return self._ok([{name: "mock xpath" for name in payload["args"][1]}])
+        if route.startswith("element/") and route.endswith("/text"):
+            return self._ok(route.split("/")[1])
+        if route.startswith("element/") and route.endswith("/screenshot"):
+            return self._ok(base64.b64encode(self.SCREENSHOT).decode())
+        if route == "screenshot":
+            return self._ok(base64.b64encode(self.SCREENSHOT).decode())
+        if route == "source":
+            return self._ok(self.page_source)
+        if route == "window/rect":
+            return self._ok(payload)
+        if route == "goog/cdp/execute" and self.cdp:
+            if payload["cmd"] == "Page.getLayoutMetrics":
+                return self._ok({"cssContentSize": {"x": 0, "y": 0, "width": 1920, "height": 900}})
+            if payload["cmd"] == "Page.captureScreenshot":
+                return self._ok({"data": base64.b64encode(self.SCREENSHOT).decode()})
+            return self._ok({})
+        return httpx.Response(404, json={"value": {"error": "unknown command", "message": route}})
+
+    def _elements(self, xpath: str) -> list[dict[str, str]]:
+        if xpath in self.missing:
+            return []
+        # element ids double as their text
+        return [{self.ELEMENT_KEY: "body" if "body" in xpath else "mock xpath"}]
+
+    @staticmethod
+    def _ok(value: object) -> httpx.Response:
+        return httpx.Response(200, json={"value": value})
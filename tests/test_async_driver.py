@@ -0,0 +1,162 @@
+import asyncio
+
+from pytest import MonkeyPatch, fixture, raises
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from sieve.async_driver import AsyncDriver, AsyncDriverProtocol
+from sieve.screenshot import ScreenshotPolicy
+from tests.mocks import MockSettings, MockWebDriverServer
+
+
+@fixture(autouse=True)
+def async_settings(monkeypatch: MonkeyPatch, dev_settings: MockSettings):
+    monkeypatch.setattr("sieve.async_driver.settings", dev_settings)
+    monkeypatch.setattr("sieve.async_driver.AsyncDriver.WAIT_TIME_SECONDS", 0.1)
+    monkeypatch.setattr("sieve.async_driver.AsyncDriver.POLL_INTERVAL", 0)
+
+
+def _run(server: MockWebDriverServer, scenario, **start_kwargs):
+    async def main():
+        async with server.client() as client:
+            driver = await AsyncDriver.start(client, **start_kwargs)
+            try:
+                return await scenario(driver)
+            finally:
+                await driver.quit()
+
+    return asyncio.run(main())
+
+
+def _paths(server: MockWebDriverServer) -> list[str]:
+    return [path.split("/", 3)[-1] for _, path, _ in server.requests]
+
+
+def test_async_driver_gets_elements_and_extracts():
+    async def scenario(driver: AsyncDriverProtocol):
+        await driver.get("https://test-url.test")
+        element = await driver.element("//*[text()='mock xpath']")
+        records = await driver.extract("//ul/li", {"title": ".//h3"})
+        return await element.text(), records
+
+    server = MockWebDriverServer()
+    text, records = _run(server, scenario)
+
+    assert text == "mock xpath"
+    assert records == [{"title": "mock xpath"}]
+    assert server.sessions["session-0"]["url"] == "https://test-url.test"
+    assert server.sessions["session-0"]["open"] is False
+    capabilities = server.requests[0][2]["capabilities"]["alwaysMatch"]
+    assert "--headless" in capabilities["goog:chromeOptions"]["args"]
+
+
+def test_async_driver_element_raises_and_screenshots_when_missing():
+    async def scenario(driver: AsyncDriver):
+        with raises(NoSuchElementException, match="No elements found: //missing"):
+            await driver.element("//missing")
+        return driver.last_screenshot
+
+    screenshot = _run(MockWebDriverServer(missing={"//missing"}), scenario)
+
+    assert screenshot.result().read_bytes() == MockWebDriverServer.SCREENSHOT
+
+
+def test_async_driver_polls_when_observer_script_fails():
+    async def scenario(driver: AsyncDriver):
+        return await (await driver.element("//h1")).text()
+
+    server = MockWebDriverServer(observer=False)
+
+    assert _run(server, scenario) == "mock xpath"
+    assert "elements" in _paths(server)
+
+
+def test_async_driver_screenshot_falls_back_without_cdp():
+    async def scenario(driver: AsyncDriver):
+        assert await driver.save_screenshot("ss.png") is True
+        return driver.last_screenshot.result()
+
+    server = MockWebDriverServer(cdp=False)
+    path = _run(server, scenario)
+
+    assert path.suffix == ".png"
+    assert "screenshot" in _paths(server)
+
+
+def test_async_driver_records_wait_stats():
+    async def scenario(driver: AsyncDriver):
+        await driver.element("//h1")
+        with raises(NoSuchElementException):
+            await driver.element("//missing")
+        return driver.wait_stats
+
+    stats = {
+        stat["xpath"]: stat for stat in _run(MockWebDriverServer(missing={"//missing"}), scenario)
+    }
+
+    assert stats["//h1"]["count"] == 1 and stats["//h1"]["timeouts"] == 0
+    assert stats["//missing"]["count"] == 1 and stats["//missing"]["timeouts"] == 1
+
+
+def test_async_driver_full_page_capture_is_clipped_to_the_content():
+    async def scenario(driver: AsyncDriver):
+        driver.screenshot_policy = ScreenshotPolicy(mode="full_page", format="png")
+        await driver.save_screenshot("ss.png")
+        return driver.last_screenshot.result()
+
+    server = MockWebDriverServer()
+    assert _run(server, scenario).suffix == ".png"
+    params = [
+        payload["params"]
+        for _, path, payload in server.requests
+        if path.endswith("cdp/execute") and payload["cmd"] == "Page.captureScreenshot"
+    ]
+    assert params[0]["clip"]["height"] == 900
+
+
+def test_async_driver_dom_snapshot():
+    async def scenario(driver: AsyncDriver):
+        driver.screenshot_policy = ScreenshotPolicy(mode="dom")
+        await driver.save_screenshot("ss.png")
+        return driver.last_screenshot.result()
+
+    assert _run(MockWebDriverServer(), scenario).read_text() == (
+        "<html><body>mock xpath</body></html>"
+    )
+
+
+def test_async_driver_applies_profile_blocking():
+    async def scenario(driver: AsyncDriver):
+        return None
+
+    server = MockWebDriverServer()
+    _run(server, scenario, profile="lite")
+
+    cdp = [payload["cmd"] for _, path, payload in server.requests if path.endswith("cdp/execute")]
+    assert cdp == ["Network.enable", "Network.setBlockedURLs"]
+
+
+def test_async_driver_raises_webdriver_errors():
+    async def scenario(driver: AsyncDriver):
+        with raises(WebDriverException, match="unknown command"):
+            await driver.command("POST", "/not-a-command")
+
+    _run(MockWebDriverServer(), scenario)
+
+
+def test_one_client_drives_many_sessions():
+    server = MockWebDriverServer()
+
+    async def crawl(client, page: int) -> str:
+        driver = await AsyncDriver.start(client)
+        await driver.get(f"https://test-url.test/{page}")
+        text = await (await driver.element("//h1")).text()
+        await driver.quit()
+        return text
+
+    async def main():
+        async with server.client() as client:
+            return await asyncio.gather(*(crawl(client, page) for page in range(25)))
+
+    assert asyncio.run(main()) == ["mock xpath"] * 25
+    assert len(server.sessions) == 25
+    assert not any(session["open"] for session in server.sessions.values())
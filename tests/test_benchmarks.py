@@ -0,0 +1,74 @@
+from benchmarks.bench_pipeline import CARD_FIELDS, CARDS, percentile, regressions
+from benchmarks.bench_tech import NaiveTagger, dictionary_of, make_descriptions
+from benchmarks.replay import ReplayRemote, page_loader
+from sieve.driver import Driver
+from sieve.tech import TechTagger
+
+
+RESULTS_HTML = """
+<ul class="jobs-search__results-list">
+  <li><h3 class="base-search-card__title">Python Engineer</h3></li>
+  <li><h3 class="base-search-card__title">Data Engineer</h3></li>
+</ul>
+"""
+DETAIL_HTML = "<div class='show-more-less-html__markup'>Build <b>APIs</b></div>"
+
+
+def _driver() -> tuple[Driver, ReplayRemote]:
+    loader = page_loader({"https://results": RESULTS_HTML, "https://detail": DETAIL_HTML})
+    remote = ReplayRemote(loader, latency={})
+    return Driver(remote), remote
+
+
+def test_replay_remote_serves_pages_and_counts_calls():
+    driver, remote = _driver()
+
+    driver.get("https://results?start=0")
+    cards = driver.extract(CARDS, CARD_FIELDS)
+    driver.get("https://detail/1")
+    text = driver.element("//div").text
+
+    assert [card["title"] for card in cards] == ["Python Engineer", "Data Engineer"]
+    assert text == "Build APIs"
+    assert remote.calls == {
+        "get": 2,
+        "execute_script": 1,
+        "execute_async_script": 1,
+        "get_element_text": 1,
+    }
+
+
+def test_replay_remote_screenshot():
+    driver, remote = _driver()
+    driver.get("https://detail/1")
+
+    assert driver.save_screenshot("ss.png") is True
+    assert remote.calls["cdp:Page.captureScreenshot"] == 1
+    assert remote.get_window_size() == {"width": 1200, "height": 800}
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([], 95) == 0
+
+
+def test_regressions_respect_direction_and_tolerance():
+    baseline = {"postings_per_sec": 100.0, "element_p95_ms": 10.0}
+    tolerance = {"default": 0.2, "element_p95_ms": 0.5}
+
+    assert (
+        regressions({"postings_per_sec": 85.0, "element_p95_ms": 14.0}, baseline, tolerance) == []
+    )
+    failures = regressions({"postings_per_sec": 70.0, "element_p95_ms": 16.0}, baseline, tolerance)
+    assert [failure.split(":")[0] for failure in failures] == ["postings_per_sec", "element_p95_ms"]
+
+
+def test_naive_tagger_agrees_with_the_automaton():
+    dictionary = dictionary_of(120)
+    tagger, naive = TechTagger(dictionary), NaiveTagger(dictionary)
+
+    for description in make_descriptions(20, dictionary):
+        assert tagger.tag(description) == naive.tag(description)
@@ -0,0 +1,121 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sieve.crawl import CrawlMark, CrawlMarks, IncrementalCrawl, card_key
+from sieve.driver import Record
+from tests.mocks import MockConnection, MockConnectionPool
+
+
+def _card(title: str, posted: str) -> Record:
+    return {"title": title, "company": "Acme", "date": posted}
+
+
+class MemoryMarks:
+    def __init__(self, mark: CrawlMark | None = None) -> None:
+        self.mark = mark
+        self.saved: list[CrawlMark] = []
+
+    def get(self, query: str) -> CrawlMark:
+        return self.mark or CrawlMark(query)
+
+    def save(self, mark: CrawlMark) -> None:
+        self.saved.append(mark)
+
+
+# newest first, five pages of two cards
+PAGES = [
+    [_card("e1", "2022-10-05"), _card("e2", "2022-10-05")],
+    [_card("d1", "2022-10-04"), _card("d2", "2022-10-04")],
+    [_card("c1", "2022-10-03"), _card("c2", "2022-10-03")],
+    [_card("b1", "2022-10-02"), _card("b2", "2022-10-02")],
+    [_card("a1", "2022-10-01"), _card("a2", "2022-10-01")],
+]
+
+
+def _fetch_page(fetched: list[int]):
+    def fetch_page(page: int) -> list[Record]:
+        fetched.append(page)
+        return PAGES[page] if page < len(PAGES) else []
+
+    return fetch_page
+
+
+def _recent_mark() -> CrawlMark:
+    return CrawlMark(
+        "python",
+        newest_date=date(2022, 10, 3),
+        newest_keys=frozenset({card_key(_card("c2", "2022-10-03"))}),
+        last_full_sweep=datetime.now(timezone.utc),
+    )
+
+
+def test_crawl_stops_at_seen_territory():
+    marks = MemoryMarks(_recent_mark())
+    fetched: list[int] = []
+
+    result = IncrementalCrawl(marks, max_pages=10).crawl("python", _fetch_page(fetched))
+
+    assert fetched == [0, 1, 2]
+    assert [card["title"] for card in result.cards] == ["e1", "e2", "d1", "d2", "c1"]
+    assert result.full_sweep is False
+    assert result.mark.newest_date == date(2022, 10, 5)
+    assert result.mark.newest_keys == {card_key(card) for card in PAGES[0]}
+
+
+def test_crawl_sweeps_everything_when_due():
+    stale = datetime.now(timezone.utc) - timedelta(days=8)
+    marks = MemoryMarks(CrawlMark("python", date(2022, 10, 3), last_full_sweep=stale))
+    fetched: list[int] = []
+
+    result = IncrementalCrawl(marks, max_pages=4).crawl("python", _fetch_page(fetched))
+
+    assert fetched == [0, 1, 2, 3]
+    assert len(result.cards) == 8
+    assert result.full_sweep is True
+    assert result.mark.last_full_sweep > stale
+
+
+def test_first_crawl_is_a_full_sweep():
+    marks = MemoryMarks()
+    fetched: list[int] = []
+
+    result = IncrementalCrawl(marks, max_pages=10).crawl("python", _fetch_page(fetched))
+
+    assert fetched == [0, 1, 2, 3, 4, 5]
+    assert result.pages == 6
+    assert len(result.cards) == 10
+
+
+def test_crawl_saves_the_mark_only_on_commit():
+    marks = MemoryMarks(_recent_mark())
+    crawl = IncrementalCrawl(marks, max_pages=10)
+
+    result = crawl.crawl("python", _fetch_page([]))
+    assert marks.saved == []
+
+    crawl.commit(result)
+    assert marks.saved == [result.mark]
+
+
+def test_mark_keeps_same_day_postings_apart():
+    mark = CrawlMark("python").advance([_card("x", "2022-10-05"), _card("old", "2022-10-01")])
+
+    assert mark.seen(_card("x", "2022-10-05"))
+    assert not mark.seen(_card("later", "2022-10-05"))
+    assert mark.seen(_card("old", "2022-10-01"))
+    assert not mark.seen(_card("undated", ""))
+
+    later = mark.advance([_card("later", "2022-10-05")])
+    assert later.newest_keys == {card_key(_card("x", "")), card_key(_card("later", ""))}
+
+
+def test_crawl_marks_round_trip_through_postgres():
+    conn = MockConnection(results=[[(date(2022, 10, 3), ["ab"], None)]])
+    marks = CrawlMarks(MockConnectionPool(conn))
+
+    mark = marks.get("python")
+    marks.save(mark)
+
+    assert mark == CrawlMark("python", date(2022, 10, 3), frozenset({"ab"}))
+    assert conn.queries[0][1] == ("python",)
+    assert "ON CONFLICT (query) DO UPDATE" in conn.queries[1][0]
+    assert conn.queries[1][1] == ("python", date(2022, 10, 3), ["ab"], None)
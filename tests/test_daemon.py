@@ -0,0 +1,125 @@
+import signal
+import threading
+import time
+
+from pytest import MonkeyPatch, fixture
+
+from sieve.daemon import Daemon
+from sieve.exceptions import SystemException
+from sieve.pool import DriverPool
+
+
+@fixture(name="pool")
+def pool_(monkeypatch: MonkeyPatch, dev_settings, patch_driver):
+    monkeypatch.setattr("sieve.driver.settings", dev_settings)
+    monkeypatch.setattr("sieve.daemon.signal.signal", lambda *args: None)
+    monkeypatch.setattr("sieve.daemon.ensure_schema", lambda: None)
+    yield DriverPool(size=1)
+
+
+def test_daemon_runs_on_interval_until_stopped(pool: DriverPool):
+    runs: list[float] = []
+
+    def job(job_pool):
+        assert job_pool is pool
+        runs.append(time.monotonic())
+        if len(runs) == 3:
+            daemon.stop(signal.SIGTERM)
+
+    daemon = Daemon(job, interval=0.02, pool=pool)
+    daemon.run()
+
+    assert daemon.ticks == 3
+    assert pool._closed is True
+    # ticks are scheduled from the start time, so the gaps do not include the job's runtime
+    assert runs[2] - runs[0] < 0.02 * 2 + 0.03
+
+
+def test_daemon_skips_ticks_missed_by_an_overrunning_job(pool: DriverPool):
+    runs: list[float] = []
+
+    def job(job_pool):
+        runs.append(time.monotonic())
+        if len(runs) == 1:
+            time.sleep(0.05)
+        else:
+            daemon.stop()
+
+    daemon = Daemon(job, interval=0.02, pool=pool)
+    daemon.run()
+
+    assert daemon.ticks == 2
+    assert runs[1] - runs[0] >= 0.05
+
+
+def test_daemon_keeps_running_after_a_failed_job(pool: DriverPool):
+    def job(job_pool):
+        if daemon.ticks == 1:
+            raise SystemException("ERROR")
+        daemon.stop()
+
+    daemon = Daemon(job, interval=0, pool=pool)
+    daemon.run()
+
+    assert daemon.ticks == 2
+
+
+def test_daemon_stop_lets_the_in_flight_job_finish(pool: DriverPool):
+    started, finished = threading.Event(), threading.Event()
+
+    def job(job_pool):
+        started.set()
+        time.sleep(0.05)
+        finished.set()
+
+    daemon = Daemon(job, interval=10, pool=pool)
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+    started.wait(1)
+    daemon.stop(signal.SIGTERM)
+    thread.join(1)
+
+    assert finished.is_set()
+    assert not thread.is_alive()
+    assert daemon.ticks == 1
+
+
+def test_daemon_warms_clients_before_the_first_tick(pool: DriverPool):
+    warmed: list[str] = []
+
+    def job(job_pool):
+        assert warmed == ["drivers", "db"]
+        daemon.stop()
+
+    daemon = Daemon(
+        job,
+        interval=0,
+        pool=pool,
+        warmers=[lambda: warmed.append("drivers"), lambda: warmed.append("db")],
+    )
+    daemon.run()
+
+    assert daemon.ticks == 1
+
+
+def test_daemon_warms_the_driver_pool_by_default(pool: DriverPool):
+    idle: list[int] = []
+
+    def job(job_pool):
+        idle.append(len(job_pool._idle))
+        daemon.stop()
+
+    daemon = Daemon(job, interval=0, pool=pool)
+    daemon.run()
+
+    assert idle == [1]
+
+
+def test_daemon_runs_when_warming_fails(pool: DriverPool):
+    def fail():
+        raise SystemException("ERROR")
+
+    daemon = Daemon(lambda job_pool: daemon.stop(), interval=0, pool=pool, warmers=[fail])
+    daemon.run()
+
+    assert daemon.ticks == 1
@@ -0,0 +1,131 @@
+from dataclasses import replace
+from datetime import date
+
+from psycopg2 import OperationalError
+from pytest import MonkeyPatch, fixture, raises
+
+from sieve.db import SCHEMA, FlushResult, Posting, PostingWriter, content_hash, ensure_schema
+from tests.mocks import MockConnection, MockConnectionPool
+
+
+def _posting(title: str, company: str = "Acme") -> Posting:
+    return Posting(
+        title=title,
+        location="Remote",
+        company=company,
+        salary=None,
+        date=date(2022, 10, 1),
+        link=f"https://www.linkedin.com/jobs/view/{title}",
+        job_desc="Python, Postgres",
+        tech="python, postgres",
+        source="linkedin",
+    )
+
+
+@fixture(name="staged_rows")
+def staged_rows_(monkeypatch: MonkeyPatch):
+    staged: list[list[tuple]] = []
+
+    def execute_values(cur, query, rows, page_size):
+        cur.execute(query)
+        staged.append(rows)
+
+    monkeypatch.setattr("sieve.db.execute_values", execute_values)
+    yield staged
+
+
+def test_writer_flushes_a_batch_through_staging_in_one_transaction(staged_rows):
+    conn = MockConnection(results=[[(True,), (True,), (False,)]])
+    writer = PostingWriter(pool=MockConnectionPool(conn))
+    for title in ("one", "two", "three", "four"):
+        writer.add(_posting(title))
+
+    result = writer.flush()
+
+    assert result == FlushResult(inserted=2, updated=1, skipped=1)
+    assert conn.commits == 1
+    assert [query for query, _ in conn.queries[: len(SCHEMA)]] == [
+        " ".join(statement.split()) for statement in SCHEMA
+    ]
+    del conn.queries[: len(SCHEMA)]
+    assert [query.split(" (")[0] for query, _ in conn.queries] == [
+        "CREATE TEMP TABLE postings_staging ON COMMIT DROP AS SELECT title, location, company, salary, date, link, job_desc, tech, source, content_hash FROM postings WITH NO DATA",
+        "INSERT INTO postings_staging",
+        "INSERT INTO postings",
+        "INSERT INTO posting_seen",
+    ]
+    upsert = conn.queries[2][0]
+    assert "ON CONFLICT (title, company) DO UPDATE" in upsert
+    assert "WHERE postings.content_hash IS DISTINCT FROM EXCLUDED.content_hash" in upsert
+    assert "last_seen" not in upsert
+    touch = conn.queries[3][0]
+    assert "ON CONFLICT (posting_id) DO UPDATE SET last_seen = EXCLUDED.last_seen" in touch
+    assert conn.queries[3][1] == (PostingWriter.LAST_SEEN_INTERVAL,)
+    assert [row[0] for row in staged_rows[0]] == ["one", "two", "three", "four"]
+    assert [row[-1] for row in staged_rows[0]] == [
+        content_hash(_posting(title)) for title in ("one", "two", "three", "four")
+    ]
+
+
+def test_writer_flushes_when_batch_is_full(staged_rows):
+    conn = MockConnection(results=[[(True,), (True,)], [(False,)]])
+    writer = PostingWriter(pool=MockConnectionPool(conn), batch_size=2)
+
+    assert writer.add(_posting("one")) is None
+    assert writer.add(_posting("two")) == FlushResult(inserted=2)
+    with writer:
+        writer.add(_posting("three"))
+
+    assert len(staged_rows) == 2
+    assert writer.totals == FlushResult(inserted=2, updated=1)
+    # the schema is only brought up to date by the first flush
+    assert sum(query.startswith("CREATE TABLE IF NOT EXISTS") for query, _ in conn.queries) == 4
+
+
+def test_writer_flush_without_postings_is_a_no_op():
+    conn = MockConnection()
+    assert PostingWriter(pool=MockConnectionPool(conn)).flush() == FlushResult()
+    assert conn.queries == []
+
+
+def test_ensure_schema_is_idempotent_ddl_in_one_transaction():
+    conn = MockConnection()
+
+    ensure_schema(MockConnectionPool(conn))
+
+    assert len(conn.queries) == len(SCHEMA)
+    assert all(" IF NOT EXISTS " in query for query, _ in conn.queries)
+    assert any("crawl_marks" in query for query, _ in conn.queries)
+    assert conn.commits == 1
+
+
+def test_content_hash_ignores_noise_but_not_changes():
+    posting = _posting("one")
+    original = content_hash(posting)
+
+    assert content_hash(replace(posting, job_desc="Python,\n  Postgres ")) == original
+    assert content_hash(replace(posting, link=f"{posting.link}?refId=abc&trk=x")) == original
+    assert content_hash(replace(posting, title="renamed")) == original
+    assert content_hash(replace(posting, job_desc="Python, Postgres, Kafka")) != original
+    assert content_hash(replace(posting, salary="$100k")) != original
+    assert content_hash(replace(posting, date=date(2022, 10, 2))) != original
+
+
+def test_writer_keeps_the_batch_when_a_flush_fails(monkeypatch: MonkeyPatch, staged_rows):
+    conn = MockConnection(results=[[(True,)]])
+    writer = PostingWriter(pool=MockConnectionPool(conn))
+    writer.add(_posting("one"))
+
+    def execute_values(cur, query, rows, page_size):
+        raise OperationalError("connection lost")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("sieve.db.execute_values", execute_values)
+        with raises(OperationalError):
+            writer.flush()
+
+    assert conn.commits == 0
+    assert writer.flush() == FlushResult(inserted=1)
+    # the rolled back schema statements ran again with the retry
+    assert sum(query == " ".join(SCHEMA[0].split()) for query, _ in conn.queries) == 2
+    assert writer.flush() == FlushResult()
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from sieve.dedupe import BloomFilter, KnownPostings, posting_key
+from tests.mocks import MockConnection, MockConnectionPool
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(posting_key(f"title {i}", "Acme"))
+
+    assert all(posting_key(f"title {i}", "Acme") in bloom for i in range(2000))
+    false_positives = sum(posting_key(f"title {i}", "Globex") in bloom for i in range(10_000))
+    assert false_positives < 200
+
+
+def test_posting_key_normalizes_whitespace():
+    assert posting_key(" Python  Engineer\n", "Acme") == posting_key("Python Engineer", "Acme")
+    assert posting_key("Python Engineer", "Acme") != posting_key("Python Engineer", "Globex")
+
+
+def test_known_postings_filters_listing_cards(tmp_path: Path):
+    known = KnownPostings(capacity=100, error_rate=0.001, snapshot_path=tmp_path / "known.bin")
+    known.add("Python Engineer", "Acme")
+
+    cards = [
+        {"title": "Python Engineer", "company": "Acme"},
+        {"title": "Data Engineer", "company": "Acme"},
+    ]
+    assert list(known.unseen(cards)) == [{"title": "Data Engineer", "company": "Acme"}]
+
+
+def test_known_postings_warm_start_only_reads_new_rows(tmp_path: Path):
+    snapshot_path = tmp_path / "known.bin"
+    conn = MockConnection(
+        results=[[(1, "Python Engineer", "Acme"), (2, "Data Engineer", "Globex")]]
+    )
+    known = KnownPostings(capacity=100, error_rate=0.001, snapshot_path=snapshot_path)
+    known.load(MockConnectionPool(conn))
+    known.save()
+
+    assert conn.queries[0][1] == (0,)
+    assert ("Python Engineer", "Acme") in known
+
+    conn = MockConnection(results=[[(3, "Django Developer", "Initech")]])
+    warm = KnownPostings(capacity=100, error_rate=0.001, snapshot_path=snapshot_path)
+    warm.load(MockConnectionPool(conn))
+
+    assert conn.queries[0][1] == (2,)
+    assert len(warm) == 3
+    assert ("Data Engineer", "Globex") in warm
+    assert ("Django Developer", "Initech") in warm
+    assert warm.last_id == 3
+
+
+def test_known_postings_rebuilds_when_snapshot_is_over_capacity(tmp_path: Path):
+    snapshot_path = tmp_path / "known.bin"
+    known = KnownPostings(capacity=2, error_rate=0.001, snapshot_path=snapshot_path)
+    known.add("Python Engineer", "Acme")
+    known.add("Data Engineer", "Globex")
+    known.last_id = 2
+    known.save()
+
+    conn = MockConnection(
+        results=[[(1, "Python Engineer", "Acme"), (2, "Data Engineer", "Globex")]]
+    )
+    warm = KnownPostings(capacity=2, error_rate=0.001, snapshot_path=snapshot_path)
+    warm.load(MockConnectionPool(conn))
+
+    assert conn.queries[0][1] == (0,)
+    assert warm.capacity == 4
+    assert len(warm) == 2
+
+
+def test_known_postings_ignores_unreadable_snapshot(tmp_path: Path):
+    snapshot_path = tmp_path / "known.bin"
+    snapshot_path.write_bytes(b"not a snapshot")
+
+    known = KnownPostings(capacity=100, error_rate=0.001, snapshot_path=snapshot_path)
+    known.load(MockConnectionPool(MockConnection()))
+
+    assert len(known) == 0
+    assert known.last_id == 0
@@ -1,39 +1,57 @@
+from pathlib import Path
+
 from pytest import LogCaptureFixture, MonkeyPatch, raises
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    WebDriverException,
+)
 
-from sieve.driver import DriverProtocol, init_driver
+from sieve.driver import Driver, init_driver
 from sieve.exceptions import SystemException
-from tests.mocks import MockRemote
+from sieve.screenshot import ScreenshotPolicy
+from tests.mocks import MockRemote, MockWebElement
+
+
+def _remote(driver: Driver) -> MockRemote:
+    """The mock `patch_driver` puts in place of `Remote`"""
+    assert isinstance(driver.driver, MockRemote)
+    return driver.driver
+
+
+def _last_screenshot(driver: Driver) -> Path:
+    assert driver.last_screenshot is not None
+    return driver.last_screenshot.result()
 
 
 def test_driver_init_for_dev_config(monkeypatch: MonkeyPatch, dev_settings):
     monkeypatch.setattr("sieve.driver.settings", dev_settings)
-    monkeypatch.setattr("sieve.driver.Remote", MockRemote)
+    monkeypatch.setattr("selenium.webdriver.Remote", MockRemote)
 
     driver = init_driver()
 
     assert hasattr(driver, "element")
     assert hasattr(driver, "_driver")
-    assert driver.driver.command_executor == "http://browserless:3000/webdriver"
+    assert driver.driver.command_executor.url == "http://browserless:3000/webdriver"
 
 
 def test_driver_init_for_prod_config(monkeypatch: MonkeyPatch, prod_settings):
     monkeypatch.setattr("sieve.driver.settings", prod_settings)
-    monkeypatch.setattr("sieve.driver.Remote", MockRemote)
+    monkeypatch.setattr("selenium.webdriver.Remote", MockRemote)
 
     driver = init_driver()
 
     assert hasattr(driver, "element")
     assert hasattr(driver, "_driver")
-    assert driver.driver.command_executor == "http://browserless:3000/webdriver"
+    assert driver.driver.command_executor.url == "http://browserless:3000/webdriver"
 
 
-def test_driver_xpath_returns_single_web_element(dev_driver: DriverProtocol):
+def test_driver_xpath_returns_single_web_element(dev_driver: Driver):
     element = dev_driver.element("//*[text()='mock xpath']")
     assert element.text == "mock xpath"
 
 
-def test_driver_xpath_raises_exception_when_element_not_found_in_time(dev_driver: DriverProtocol):
+def test_driver_xpath_raises_exception_when_element_not_found_in_time(dev_driver: Driver):
     setattr(dev_driver.driver, "find_elements", lambda *args, **kwargs: [])
     setattr(dev_driver, "save_screenshot", lambda *args, **kwargs: True)
 
@@ -44,7 +62,7 @@ def test_driver_xpath_raises_exception_when_element_not_found_in_time(dev_driver
 
 
 def test_driver_get_logs_request_url(
-    dev_driver: DriverProtocol,
+    dev_driver: Driver,
     caplog: LogCaptureFixture,
     enable_logging,
 ):
@@ -54,18 +72,188 @@ def test_driver_get_logs_request_url(
     assert "[driver] GET: https://test-url" in caplog.text
 
 
-def test_driver_save_screenshot_returns_true_on_success(dev_driver: DriverProtocol):
+def test_driver_save_screenshot_captures_viewport_through_cdp(dev_driver: Driver):
+    dev_driver.screenshot_policy = ScreenshotPolicy(mode="viewport", format="jpeg")
+    assert dev_driver.save_screenshot("test.png") is True
+
+    path = _last_screenshot(dev_driver)
+    assert path.name.startswith("test-") and path.suffix == ".jpeg"
+    assert path.read_bytes() == MockRemote.SCREENSHOT
+    assert _remote(dev_driver).cdp_calls == [
+        ("Page.captureScreenshot", {"format": "jpeg", "quality": 70})
+    ]
     assert dev_driver.driver.get_window_size() == {"width": 1200, "height": 800}
+
+
+def test_driver_save_screenshot_uses_unique_filenames(dev_driver: Driver):
+    dev_driver.save_screenshot("ss.png")
+    first = _last_screenshot(dev_driver)
+    dev_driver.save_screenshot("ss.png")
+    second = _last_screenshot(dev_driver)
+
+    assert first != second
+    assert first.exists() and second.exists()
+
+
+def test_driver_save_screenshot_full_page_clips_to_max_height(dev_driver: Driver):
+    dev_driver.screenshot_policy = ScreenshotPolicy(mode="full_page", format="webp", quality=50)
+
     assert dev_driver.save_screenshot("test.png") is True
+
+    cmd, params = _remote(dev_driver).cdp_calls[-1]
+    assert cmd == "Page.captureScreenshot"
+    assert params["captureBeyondViewport"] is True
+    assert params["clip"] == {"x": 0, "y": 0, "width": 1920, "height": 12000, "scale": 1}
+    assert params["format"] == "webp" and params["quality"] == 50
+
+
+def test_driver_save_screenshot_falls_back_without_cdp(dev_driver: Driver):
+    def no_cdp(*args, **kwargs):
+        raise WebDriverException("unknown command")
+
+    setattr(dev_driver.driver, "execute", no_cdp)
+    dev_driver.screenshot_policy = ScreenshotPolicy(mode="full_page")
+    sizes = []
+
+    def get_screenshot_as_png() -> bytes:
+        sizes.append(_remote(dev_driver).height)
+        return b"png"
+
+    setattr(dev_driver.driver, "get_screenshot_as_png", get_screenshot_as_png)
+
+    assert dev_driver.save_screenshot("test.png") is True
+    assert _last_screenshot(dev_driver).suffix == ".png"
+    assert sizes == [3000]
     assert dev_driver.driver.get_window_size() == {"width": 1200, "height": 800}
 
 
-def test_driver_save_screenshot_returns_false_on_exception(dev_driver: DriverProtocol):
-    def mock_element(*args, **kwargs):
+def test_driver_save_screenshot_dom_snapshot(dev_driver: Driver):
+    dev_driver.screenshot_policy = ScreenshotPolicy(mode="dom")
+
+    assert dev_driver.save_screenshot("test.png") is True
+
+    path = _last_screenshot(dev_driver)
+    assert path.suffix == ".html"
+    assert path.read_text() == "<html><body>mock xpath</body></html>"
+    assert _remote(dev_driver).cdp_calls == []
+
+
+def test_driver_save_screenshot_returns_false_on_exception(dev_driver: Driver):
+    def mock_execute(*args, **kwargs):
         raise SystemException("ERROR")
 
-    setattr(dev_driver, "element", mock_element)
+    setattr(dev_driver.driver, "execute", mock_execute)
 
-    assert dev_driver.driver.get_window_size() == {"width": 1200, "height": 800}
     assert not dev_driver.save_screenshot("test.png")
+    assert dev_driver.last_screenshot is None
     assert dev_driver.driver.get_window_size() == {"width": 1200, "height": 800}
+
+
+def test_driver_element_polls_when_observer_script_fails(dev_driver: Driver):
+    calls = []
+
+    def observer_unavailable(*args, **kwargs):
+        raise JavascriptException("document unloaded while waiting for result")
+
+    def find_elements(*args, **kwargs):
+        calls.append(kwargs["value"])
+        return [MockWebElement("mock xpath")] if len(calls) == 3 else []
+
+    setattr(dev_driver.driver, "execute_async_script", observer_unavailable)
+    setattr(dev_driver.driver, "find_elements", find_elements)
+
+    assert dev_driver.element("//div").text == "mock xpath"
+    assert calls == ["//div", "//div", "//div"]
+
+
+def test_driver_element_records_wait_stats(dev_driver: Driver):
+    setattr(dev_driver, "save_screenshot", lambda *args, **kwargs: True)
+    dev_driver.element("//div")
+    dev_driver.element("//div")
+    setattr(dev_driver.driver, "find_elements", lambda *args, **kwargs: [])
+    with raises(NoSuchElementException):
+        dev_driver.element("//span")
+
+    stats = {stat["xpath"]: stat for stat in dev_driver.wait_stats}
+    assert stats["//div"]["count"] == 2
+    assert stats["//div"]["timeouts"] == 0
+    assert stats["//span"]["count"] == 1
+    assert stats["//span"]["timeouts"] == 1
+
+
+def test_driver_extract_returns_one_record_per_container(dev_driver: Driver):
+    calls = []
+    execute_script = dev_driver.driver.execute_script
+
+    def record_calls(script, *args):
+        calls.append(args)
+        return execute_script(script, *args)
+
+    setattr(dev_driver.driver, "execute_script", record_calls)
+    records = dev_driver.extract(
+        "//ul[@class='jobs-search__results-list']/li",
+        {"title": ".//h3", "link": ".//a/@href"},
+    )
+
+    assert records == [{"title": "mock xpath", "link": "mock xpath"}]
+    assert len(calls) == 1
+
+
+def test_init_driver_applies_lite_profile(monkeypatch: MonkeyPatch, dev_settings, patch_driver):
+    monkeypatch.setattr("sieve.driver.settings", dev_settings)
+
+    driver = init_driver(profile="lite")
+
+    assert "--blink-settings=imagesEnabled=false" in driver.driver.options.arguments
+    assert "--headless" in driver.driver.options.arguments
+    prefs = driver.driver.options.experimental_options["prefs"]
+    assert prefs == {"profile.managed_default_content_settings.images": 2}
+    assert [cmd for cmd, _ in driver.driver.cdp_calls] == [
+        "Network.enable",
+        "Network.setBlockedURLs",
+    ]
+    blocked = driver.driver.cdp_calls[-1][1]["urls"]
+    assert "*.png*" in blocked and "*.woff*" in blocked and "*doubleclick.net*" in blocked
+
+
+def test_init_driver_text_profile_disables_javascript(
+    monkeypatch: MonkeyPatch, dev_settings, patch_driver
+):
+    monkeypatch.setattr(
+        "sieve.driver.settings", dev_settings.copy(update={"driver_profile": "text"})
+    )
+
+    driver = init_driver(option_overrides={"blink_settings": None})
+
+    prefs = driver.driver.options.experimental_options["prefs"]
+    assert prefs["profile.managed_default_content_settings.javascript"] == 2
+    assert not any("blink-settings" in arg for arg in driver.driver.options.arguments)
+
+
+def test_init_driver_full_profile_blocks_nothing(dev_driver: Driver):
+    assert _remote(dev_driver).cdp_calls == []
+    assert "prefs" not in _remote(dev_driver).options.experimental_options
+
+
+def test_driver_block_urls_without_cdp(dev_driver: Driver):
+    def no_cdp(*args, **kwargs):
+        raise WebDriverException("unknown command")
+
+    setattr(dev_driver.driver, "execute", no_cdp)
+
+    assert dev_driver.block_urls(["*.png"]) is False
+
+
+def test_driver_tracks_bytes_transferred(
+    dev_driver: Driver, caplog: LogCaptureFixture, enable_logging
+):
+    dev_driver.track_transfer = True
+
+    dev_driver.get("https://test-url.test/1")
+    dev_driver.get("https://test-url.test/2")
+    dev_driver.quit()
+
+    # the page being left is read before each `get` and at `quit`
+    assert dev_driver.bytes_transferred == 3 * 2048
+    assert dev_driver.pages == 2
+    assert "[driver] 6144 bytes transferred over 2 pages" in caplog.text
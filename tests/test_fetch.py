@@ -0,0 +1,82 @@
+import httpx
+
+from pytest import MonkeyPatch, fixture
+
+from sieve.driver import init_driver
+from sieve.fetch import Fetcher, FetchRule
+
+
+STATIC_PAGE = "<html><body><ul><li><h3>Python Engineer</h3></li></ul></body></html>"
+RENDERED_PAGE = "<html><body><div id='app'><h3>Rendered Engineer</h3></div></body></html>"
+
+
+@fixture(name="requests")
+def requests_():
+    yield []
+
+
+@fixture(name="fetcher")
+def fetcher_(monkeypatch: MonkeyPatch, dev_settings, patch_driver, requests):
+    monkeypatch.setattr("sieve.driver.settings", dev_settings)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        if request.url.path.startswith("/jobs/view"):
+            return httpx.Response(200, text=STATIC_PAGE)
+        if request.url.path.startswith("/throttled"):
+            return httpx.Response(429)
+        return httpx.Response(200, text="<html><body><div id='app'></div></body></html>")
+
+    def driver_factory():
+        driver = init_driver()
+        driver.driver.page_source = RENDERED_PAGE
+        return driver
+
+    fetcher = Fetcher(
+        rules=[FetchRule(r"/feed")],
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        driver_factory=driver_factory,
+    )
+    yield fetcher
+    fetcher.close()
+
+
+def test_fetcher_serves_static_pages_over_http(fetcher: Fetcher, requests):
+    page = fetcher.fetch("https://www.linkedin.com/jobs/view/3300000000", require=["//h3"])
+
+    assert page.element("//h3").text == "Python Engineer"
+    assert requests == ["https://www.linkedin.com/jobs/view/3300000000"]
+    assert fetcher._driver is None
+
+
+def test_fetcher_falls_back_to_browser_when_selectors_are_missing(fetcher: Fetcher):
+    page = fetcher.fetch("https://www.linkedin.com/jobs/search", require=["//h3"])
+
+    assert page.element("//h3").text == "Rendered Engineer"
+    assert fetcher.driver.driver.url == "https://www.linkedin.com/jobs/search"
+
+
+def test_fetcher_falls_back_to_browser_on_http_errors(fetcher: Fetcher):
+    page = fetcher.fetch("https://www.linkedin.com/throttled")
+
+    assert page.element("//h3").text == "Rendered Engineer"
+
+
+def test_fetcher_rules_route_urls_straight_to_the_browser(fetcher: Fetcher, requests):
+    page = fetcher.fetch("https://www.linkedin.com/feed/")
+
+    assert page.element("//h3").text == "Rendered Engineer"
+    assert requests == []
+
+
+def test_fetcher_reports_latency_and_fallback_rate_per_path(fetcher: Fetcher):
+    fetcher.fetch("https://www.linkedin.com/jobs/view/3300000000", require=["//h3"])
+    fetcher.fetch("https://www.linkedin.com/jobs/view/3300000007", require=["//h3"])
+    fetcher.fetch("https://www.linkedin.com/jobs/search", require=["//h3"])
+
+    summary = {stat["path"]: stat for stat in fetcher.summary()}
+    assert summary["/jobs/view/:id"]["http_count"] == 2
+    assert summary["/jobs/view/:id"]["browser_count"] == 0
+    assert summary["/jobs/view/:id"]["fallback_rate"] == 0
+    assert summary["/jobs/search"]["browser_count"] == 1
+    assert summary["/jobs/search"]["fallback_rate"] == 1
@@ -0,0 +1,83 @@
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from sieve.driver import Driver, init_driver
+from sieve.instrument import CommandStats, InstrumentedRemote
+from sieve.metrics import Histogram
+from tests.mocks import MockRemote, MockSettings
+
+
+def _driver() -> tuple[Driver, InstrumentedRemote]:
+    remote = InstrumentedRemote(MockRemote(command_executor="", options=None))
+    return Driver(remote), remote  # type: ignore[arg-type]
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for _ in range(90):
+        histogram.record(0.004)
+    for _ in range(10):
+        histogram.record(0.2)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 0.005
+    assert histogram.percentile(95) == 0.2  # capped at the observed max
+    assert sum(histogram.buckets) == 100
+
+
+def test_instrumented_remote_tags_commands_by_url_pattern_and_xpath():
+    driver, remote = _driver()
+
+    driver.get("https://www.linkedin.com/jobs/view/3300000000")
+    assert driver.element("//h1").text == "mock xpath"
+    driver.extract("//ul/li", {"title": ".//h3"})
+    driver.save_screenshot("ss.png")
+    driver.element("//body").screenshot("body.png")
+    driver.driver.set_window_size(1920, 1080)
+
+    keys = set(remote.stats.histograms)
+    assert ("get", "/jobs/view/:id", "") in keys
+    assert ("execute_async_script", "/jobs/view/:id", "//h1") in keys
+    assert ("text", "/jobs/view/:id", "//h1") in keys
+    assert ("execute_script", "/jobs/view/:id", "//ul/li") in keys
+    assert ("executeCdpCommand", "/jobs/view/:id", "Page.captureScreenshot") in keys
+    assert ("screenshot", "/jobs/view/:id", "//body") in keys
+    assert remote.stats.histograms[("set_window_size", "/jobs/view/:id", "")].count == 1
+    assert remote.window_handles == ["tab-0"]  # passed through untimed
+
+
+def test_instrumented_remote_logs_summary_on_quit(caplog: LogCaptureFixture, enable_logging):
+    driver, remote = _driver()
+    driver.get("https://test-url.test/jobs")
+    driver.quit()
+
+    assert remote._remote.quit_called
+    assert "[instrument] 2 webdriver calls" in caplog.text
+    row = next(record for record in caplog.records if getattr(record, "command", None) == "get")
+    assert row.url_pattern == "/jobs"
+    assert row.count == 1
+
+
+def test_command_stats_summary_sorted_by_total():
+    stats = CommandStats()
+    stats.record(("get", "/", ""), 0.5)
+    stats.record(("find_elements", "/", "//a"), 0.01)
+    stats.record(("find_elements", "/", "//a"), 0.02)
+
+    summary = stats.summary()
+
+    assert [row["command"] for row in summary] == ["get", "find_elements"]
+    assert summary[1]["count"] == 2
+    assert summary[1]["total_ms"] == 30.0
+
+
+def test_init_driver_wraps_remote_when_enabled(
+    monkeypatch: MonkeyPatch, dev_settings: MockSettings, patch_driver
+):
+    monkeypatch.setattr(
+        "sieve.driver.settings", dev_settings.copy(update={"driver_instrument": True})
+    )
+
+    driver = init_driver()
+
+    assert isinstance(driver.driver, InstrumentedRemote)
+    assert ("set_window_size", "about:blank", "") in driver.driver.stats.histograms
@@ -1,20 +1,37 @@
 import json
 import logging
+import queue
 import sys
+import threading
+import time
+
+from datetime import datetime, timezone
 
 from datadog_api_client.v2.model.http_log import HTTPLog
-from pytest import LogCaptureFixture, MonkeyPatch
+from pytest import CaptureFixture, LogCaptureFixture, MonkeyPatch, fixture
 
 from sieve.exceptions import SystemException
 from sieve.logger import (
     DatadogHandler,
     JsonFormatter,
+    QueueHandler,
+    QueueListener,
     RotatingFileHandler,
+    StreamFormatter,
     StreamHandler,
+    _json_encoder,
     get_logger,
+    shutdown_logging,
 )
 
 
+@fixture(autouse=True)
+def reset_shared_handlers():
+    shutdown_logging()
+    yield
+    shutdown_logging()
+
+
 def test_get_logger_returns_expected_logging_config_for_testing(
     monkeypatch: MonkeyPatch,
     test_settings,
@@ -51,16 +68,16 @@ def test_datadog_and_stream_handlers_log_output(
     dev_settings,
     enable_logging,
 ):
+    bodies: list[HTTPLog] = []
+
     class MockLogsApi:
         def __init__(self, api_client):
             self.api_client = api_client
 
         def submit_log(self, body, *args, **kwargs):
-            if '"level": "DEBUG"' in str(body):
-                assert '"extra_attribute": true' in str(body)
-            assert isinstance(body, HTTPLog)
+            bodies.append(body)
 
-    monkeypatch.setattr("sieve.logger.LogsApi", MockLogsApi)
+    monkeypatch.setattr("datadog_api_client.v2.api.logs_api.LogsApi", MockLogsApi)
     monkeypatch.setattr("sieve.logger.settings", dev_settings)
     monkeypatch.setattr("sieve.logger.DATADOG_CLIENT", "good_client")
 
@@ -72,12 +89,158 @@ def test_datadog_and_stream_handlers_log_output(
     except SystemException:
         logger.exception("EXCEPTION", stack_info=True)
 
+    for handler in logger.handlers:
+        handler.flush()
+
+    assert all(isinstance(body, HTTPLog) for body in bodies)
+    messages = [json.loads(item.message) for body in bodies for item in body.value]
+    assert [message["level"] for message in messages] == ["DEBUG", "ERROR"]
+    assert messages[0]["extra_attribute"] is True
+
     assert "MESSAGE" in caplog.text
     assert "Traceback" in caplog.text
     assert "ERROR" in caplog.text
     assert "Stack (most recent call last)" in caplog.text
 
 
+@fixture(name="datadog_handler")
+def datadog_handler_(monkeypatch: MonkeyPatch, dev_settings):
+    sent: list[HTTPLog] = []
+
+    class MockLogsApi:
+        def __init__(self, api_client):
+            self.api_client = api_client
+
+        def submit_log(self, body, *args, **kwargs):
+            sent.append(body)
+
+    monkeypatch.setattr("datadog_api_client.v2.api.logs_api.LogsApi", MockLogsApi)
+    monkeypatch.setattr("sieve.logger.settings", dev_settings)
+    monkeypatch.setattr("sieve.logger.DATADOG_CLIENT", "good_client")
+
+    handler = DatadogHandler()
+    handler.sent = sent  # type: ignore
+    yield handler
+    handler.close()
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("tests.test_logger", logging.INFO, __file__, 1, message, (), None)
+
+
+def test_datadog_handler_sends_queued_records_as_one_batch(datadog_handler):
+    for i in range(5):
+        datadog_handler.emit(_record(f"MESSAGE {i}"))
+    datadog_handler.flush()
+
+    assert len(datadog_handler.sent) == 1
+    messages = [json.loads(item.message)["message"] for item in datadog_handler.sent[0].value]
+    assert messages == [f"MESSAGE {i}" for i in range(5)]
+
+
+def test_datadog_handler_splits_batches_on_item_and_byte_limits(
+    monkeypatch: MonkeyPatch,
+    datadog_handler,
+):
+    monkeypatch.setattr(datadog_handler, "BATCH_MAX_ITEMS", 2)
+    for i in range(5):
+        datadog_handler.emit(_record(f"MESSAGE {i}"))
+    datadog_handler.flush()
+    assert [len(body.value) for body in datadog_handler.sent] == [2, 2, 1]
+
+    datadog_handler.sent.clear()
+    monkeypatch.setattr(datadog_handler, "BATCH_MAX_ITEMS", 1000)
+    monkeypatch.setattr(datadog_handler, "BATCH_MAX_BYTES", 1)
+    for i in range(3):
+        datadog_handler.emit(_record(f"MESSAGE {i}"))
+    datadog_handler.flush()
+    assert [len(body.value) for body in datadog_handler.sent] == [1, 1, 1]
+
+
+def test_datadog_handler_sends_batch_after_flush_interval(
+    monkeypatch: MonkeyPatch,
+    datadog_handler,
+):
+    monkeypatch.setattr(datadog_handler, "FLUSH_INTERVAL_SECONDS", 0.01)
+    datadog_handler.emit(_record("MESSAGE"))
+
+    timeout = time.monotonic() + 1
+    while not datadog_handler.sent and time.monotonic() < timeout:
+        time.sleep(0.01)
+
+    assert len(datadog_handler.sent) == 1
+
+
+def test_datadog_handler_drops_records_when_queue_is_full(
+    monkeypatch: MonkeyPatch,
+    dev_settings,
+):
+    monkeypatch.setattr("sieve.logger.settings", dev_settings)
+    monkeypatch.setattr("sieve.logger.DATADOG_CLIENT", "good_client")
+    monkeypatch.setattr(DatadogHandler, "QUEUE_MAX_SIZE", 2)
+    monkeypatch.setattr(DatadogHandler, "_start_worker", lambda self: None)
+
+    handler = DatadogHandler()
+    for i in range(5):
+        handler.emit(_record(f"MESSAGE {i}"))
+    handler.close()
+
+    assert handler.dropped == 3
+
+
+def test_datadog_handler_only_waits_on_async_results(monkeypatch: MonkeyPatch, datadog_handler):
+    # a synchronous client returns the response model, whose `get` takes a key
+    monkeypatch.setattr(
+        "datadog_api_client.v2.api.logs_api.LogsApi.submit_log", lambda self, body: {}
+    )
+    datadog_handler.emit(_record("MESSAGE"))
+    datadog_handler.flush()
+
+    assert datadog_handler.dropped == 0
+
+
+def test_datadog_handler_flush_returns_when_worker_is_dead(datadog_handler):
+    datadog_handler.emit(_record("MESSAGE"))
+    datadog_handler.close()
+    datadog_handler._queue.put_nowait("unsent")
+    # alive when `flush` starts, then exits without consuming the queue
+    datadog_handler._worker = threading.Thread(target=time.sleep, args=(0.2,))
+    datadog_handler._worker.start()
+
+    start = time.monotonic()
+    datadog_handler.flush()
+
+    assert time.monotonic() - start < 1
+
+
+def test_datadog_handler_close_sends_pending_records(datadog_handler):
+    datadog_handler.emit(_record("MESSAGE"))
+    datadog_handler.close()
+
+    assert len(datadog_handler.sent) == 1
+
+
+def test_datadog_handler_close_gives_up_when_the_queue_stays_full(
+    monkeypatch: MonkeyPatch, capsys: CaptureFixture, dev_settings
+):
+    monkeypatch.setattr("sieve.logger.settings", dev_settings)
+    monkeypatch.setattr("sieve.logger.DATADOG_CLIENT", "good_client")
+    monkeypatch.setattr(DatadogHandler, "QUEUE_MAX_SIZE", 1)
+    monkeypatch.setattr(DatadogHandler, "CLOSE_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(DatadogHandler, "_start_worker", lambda self: None)
+    handler = DatadogHandler(close_at_exit=False)
+    handler.emit(_record("MESSAGE"))
+    # a worker stuck sending, so nothing makes room for the stop sentinel
+    handler._worker = threading.Thread(target=time.sleep, args=(0.5,))
+    handler._worker.start()
+
+    start = time.monotonic()
+    handler.close()
+
+    assert time.monotonic() - start < 0.4
+    assert "DatadogHandler failed to stop" in capsys.readouterr().err
+
+
 def test_datadog_env_var_warning(
     monkeypatch: MonkeyPatch,
     caplog: LogCaptureFixture,
@@ -91,6 +254,35 @@ def test_datadog_env_var_warning(
     assert "* * * DD_API_KEY & DD_SITE REQUIRED" in caplog.text
 
 
+def test_datadog_env_var_warning_is_logged_once(
+    monkeypatch: MonkeyPatch,
+    caplog: LogCaptureFixture,
+    dev_settings,
+    enable_logging,
+):
+    monkeypatch.setattr("sieve.logger.settings", dev_settings)
+    monkeypatch.setattr("sieve.logger.settings.dd_api_key", None)
+    monkeypatch.setattr("sieve.logger.settings.dd_site", None)
+    get_logger("tests.first")
+    get_logger("tests.second")
+    assert caplog.text.count("* * * DD_API_KEY & DD_SITE REQUIRED") == 1
+
+
+def test_datadog_handler_behind_a_listener_is_not_closed_at_exit(
+    monkeypatch: MonkeyPatch, dev_settings
+):
+    registered: list[object] = []
+    monkeypatch.setattr("sieve.logger.settings", dev_settings)
+    monkeypatch.setattr("sieve.logger.DATADOG_CLIENT", "good_client")
+    monkeypatch.setattr("sieve.logger.atexit.register", registered.append)
+
+    handler = DatadogHandler(close_at_exit=False)
+    assert not registered
+
+    handler = DatadogHandler()
+    assert registered == [handler.close]
+
+
 def test_json_formatter_parses_debug_payload_correctly():
     formatter = JsonFormatter()
     record = logging.LogRecord(
@@ -145,3 +337,143 @@ def test_json_formatter_parses_exception_payload_correctly():
         "exception_message": "BAD VALUE",
         "exception_type": "SystemException",
     }
+
+
+def test_json_formatter_includes_extras_and_skips_attributes_set_by_other_formatters():
+    record = logging.makeLogRecord({"name": "tests.test_logger", "msg": "MESSAGE"})
+    StreamFormatter().format(record)
+    assert "asctime" in record.__dict__
+
+    assert "asctime" not in json.loads(JsonFormatter().format(record))
+
+    record.xpath = "//div"
+    assert json.loads(JsonFormatter().format(record))["xpath"] == "//div"
+
+
+def test_json_formatter_timestamp_matches_isoformat():
+    formatter = JsonFormatter()
+    for created in (1664582400.0, 1664582400.5, 1664582400.123456, 1664582401.999999):
+        record = logging.makeLogRecord({"created": created})
+        expected = datetime.fromtimestamp(created, tz=timezone.utc).isoformat()
+        assert json.loads(formatter.format(record))["timestamp"] == expected
+
+
+def test_json_formatter_falls_back_to_stdlib_json(monkeypatch: MonkeyPatch):
+    payload = {"message": "Zürich – remote", "tags": ["a", "b"], "count": 1}
+    expected = _json_encoder()[1](payload)
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    backend, fallback = _json_encoder()
+
+    assert backend == "json"
+    assert fallback(payload) == expected
+
+
+def test_get_logger_reuses_shared_handlers(monkeypatch: MonkeyPatch, test_settings):
+    monkeypatch.setattr("sieve.logger.settings", test_settings)
+    first = get_logger("tests.first")
+    handlers = list(first.handlers)
+
+    assert get_logger("tests.first").handlers == handlers
+    assert get_logger("tests.second").handlers == handlers
+    assert all(a is b for a, b in zip(get_logger("tests.second").handlers, handlers))
+
+
+def test_get_logger_queue_mode_formats_and_writes_off_thread(
+    monkeypatch: MonkeyPatch,
+    test_settings,
+    enable_logging,
+):
+    monkeypatch.setattr("sieve.logger.settings", test_settings)
+    monkeypatch.setattr("sieve.logger.settings.log_queue_enabled", True)
+    records: list[tuple[str, str]] = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            records.append((threading.current_thread().name, self.format(record)))
+
+    monkeypatch.setattr("sieve.logger.StreamHandler", RecordingHandler)
+    logger = get_logger("tests.queue")
+    assert [type(handler) for handler in logger.handlers] == [QueueHandler]
+
+    try:
+        raise SystemException("ERROR")
+    except SystemException:
+        logger.exception("MESSAGE %s", "ARG")
+    shutdown_logging()
+
+    thread_name, message = records[0]
+    assert thread_name != threading.current_thread().name
+    assert message.startswith("MESSAGE ARG\nTraceback")
+
+
+def test_queue_handler_drops_records_when_full():
+    log_queue: queue.Queue = queue.Queue(maxsize=1)
+    handler = QueueHandler(log_queue)
+    handler.handle(logging.makeLogRecord({"msg": "first", "levelno": logging.INFO}))
+    handler.handle(logging.makeLogRecord({"msg": "second", "levelno": logging.INFO}))
+
+    assert log_queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+class BlockingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+        self.records: list[str] = []
+        self.closed = False
+
+    def emit(self, record):
+        self.unblock.wait()
+        self.records.append(record.getMessage())
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def test_queue_listener_stop_waits_for_room_in_a_full_queue():
+    log_queue: queue.Queue = queue.Queue(maxsize=1)
+    handler = BlockingHandler()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    log_queue.put(logging.makeLogRecord({"msg": "first", "levelno": logging.INFO}))
+    log_queue.put(logging.makeLogRecord({"msg": "second", "levelno": logging.INFO}))
+
+    threading.Timer(0.05, handler.unblock.set).start()
+    listener.stop()
+
+    assert handler.records == ["first", "second"]
+
+
+def test_queue_listener_stop_gives_up_when_the_queue_stays_full(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(QueueListener, "STOP_TIMEOUT_SECONDS", 0.05)
+    log_queue: queue.Queue = queue.Queue(maxsize=1)
+    handler = BlockingHandler()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    log_queue.put(logging.makeLogRecord({"msg": "first", "levelno": logging.INFO}))
+    log_queue.put(logging.makeLogRecord({"msg": "second", "levelno": logging.INFO}))
+
+    try:
+        listener.stop()
+    finally:
+        handler.unblock.set()
+
+    assert listener._thread is None
+
+
+def test_shutdown_logging_closes_handlers_behind_the_listener(
+    monkeypatch: MonkeyPatch, test_settings
+):
+    monkeypatch.setattr("sieve.logger.settings", test_settings)
+    monkeypatch.setattr("sieve.logger.settings.log_queue_enabled", True)
+    handler = BlockingHandler()
+    handler.unblock.set()
+    monkeypatch.setattr("sieve.logger.StreamHandler", lambda: handler)
+    get_logger("tests.queue")
+
+    shutdown_logging()
+
+    assert handler.closed is True
@@ -0,0 +1,181 @@
+from datetime import date
+
+from pytest import MonkeyPatch, fixture
+
+from sieve.db import Posting, content_hash
+from sieve.neardup import (
+    LshBands,
+    LshIndex,
+    MinHash,
+    NearDuplicates,
+    card_shingles,
+    description_shingles,
+)
+from tests.mocks import MockConnection, MockConnectionPool
+
+
+DESCRIPTION = (
+    "We are hiring a senior Python engineer to build and run the data pipelines behind our "
+    "search product. You will design services on Postgres and Kafka, review code, mentor other "
+    "engineers and share an on-call rotation. Five years of backend experience required, remote "
+    "within the US, competitive salary and equity."
+)
+REPOST = DESCRIPTION.replace("senior", "staff").replace("equity.", "equity!")
+OTHER = (
+    "Our clinic is looking for a front desk coordinator to greet patients, schedule "
+    "appointments, answer phones and keep the waiting room running smoothly."
+)
+
+
+def _signed(signature: bytes | None) -> bytes:
+    assert signature is not None
+    return signature
+
+
+def _card(title: str, company: str = "Acme", location: str = "Remote") -> dict:
+    return {"title": title, "company": company, "location": location}
+
+
+@fixture(name="buckets")
+def buckets_(monkeypatch: MonkeyPatch):
+    inserted: list[list[tuple]] = []
+
+    def execute_values(cur, query, rows, page_size):
+        cur.execute(query)
+        inserted.append(rows)
+
+    monkeypatch.setattr("sieve.neardup.execute_values", execute_values)
+    yield inserted
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert description_shingles("One, two THREE four five six!", size=5) == {
+        "one two three four five",
+        "two three four five six",
+    }
+    assert description_shingles("Two words") == {"two words"}
+    assert description_shingles("") == set()
+    assert card_shingles("Go", "", "") == {"go"}
+
+
+def test_minhash_estimates_similarity():
+    minhash = MinHash()
+    original = _signed(minhash.signature(description_shingles(DESCRIPTION)))
+    repost = _signed(minhash.signature(description_shingles(REPOST)))
+    other = _signed(minhash.signature(description_shingles(OTHER)))
+
+    assert len(original) == 128 * 4
+    assert original == MinHash().signature(description_shingles(DESCRIPTION))
+    assert minhash.similarity(original, repost) > 0.7
+    assert minhash.similarity(original, other) < 0.1
+    assert minhash.signature([]) is None
+
+
+def test_lsh_index_finds_near_duplicates_only():
+    minhash = MinHash()
+    index = LshIndex(minhash, LshBands(), threshold=0.7)
+    index.add("original", _signed(minhash.signature(description_shingles(DESCRIPTION))))
+    index.add("other", _signed(minhash.signature(description_shingles(OTHER))))
+
+    matches = index.query(_signed(minhash.signature(description_shingles(REPOST))))
+
+    assert len(index) == 2
+    assert [key for key, _ in matches] == ["original"]
+    assert index.query(_signed(minhash.signature(description_shingles(DESCRIPTION))))[0][1] == 1.0
+
+
+def test_buckets_differ_by_kind():
+    signature = _signed(MinHash().signature({"a"}))
+    bands = LshBands()
+
+    assert len(bands.buckets(signature, "desc")) == bands.bands
+    assert not set(bands.buckets(signature, "desc")) & set(bands.buckets(signature, "card"))
+
+
+def test_novel_skips_cards_repeating_a_stored_posting():
+    detector = NearDuplicates()
+    stored = _signed(detector.card_signature(_card("Senior Python Engineer")))
+    cards = [_card("Senior Python Engineer (Remote)"), _card("Office Manager", "Clinic")]
+    first = detector.bands.buckets(_signed(detector.card_signature(cards[0])), "card")
+    shared = [bucket for bucket in detector.bands.buckets(stored, "card") if bucket in first]
+    conn = MockConnection(results=[[(bucket, 7, memoryview(stored)) for bucket in shared]])
+    detector.pool = MockConnectionPool(conn)
+
+    novel = list(detector.novel(cards))
+
+    assert novel == [cards[1]]
+    assert len(conn.queries) == 1
+    sql, params = conn.queries[0]
+    assert "FROM posting_buckets AS b JOIN posting_signatures AS s" in sql
+    second = detector.bands.buckets(_signed(detector.card_signature(cards[1])), "card")
+    assert params == (sorted(set(first + second)),)
+
+
+def test_novel_without_signatures_skips_the_lookup():
+    conn = MockConnection()
+    detector = NearDuplicates(MockConnectionPool(conn))
+
+    assert list(detector.novel([_card("", "", "")])) == [_card("", "", "")]
+    assert conn.queries == []
+
+
+def test_duplicate_of_compares_descriptions():
+    detector = NearDuplicates()
+    stored = detector.desc_signature(DESCRIPTION)
+    conn = MockConnection(results=[[(3, stored), (4, None)]])
+    detector.pool = MockConnectionPool(conn)
+
+    assert detector.duplicate_of(REPOST) == 3
+    assert detector.duplicate_of(None) is None
+    assert "SELECT posting_id, desc_signature FROM posting_signatures" in conn.queries[0][0]
+
+
+def _posting(title: str, job_desc: str | None = DESCRIPTION) -> Posting:
+    return Posting(
+        title=title,
+        location="Remote",
+        company="Acme",
+        salary=None,
+        date=date(2022, 10, 1),
+        link="https://www.linkedin.com/jobs/view/11",
+        job_desc=job_desc,
+        tech="python",
+        source="linkedin",
+    )
+
+
+def test_add_signs_and_indexes_changed_postings_in_one_transaction(buckets):
+    detector = NearDuplicates()
+    postings = [_posting("Senior Python Engineer"), _posting("Office Manager", None)]
+    desc = _signed(detector.desc_signature(DESCRIPTION))
+    card = _signed(detector.card_signature(_card("Senior Python Engineer")))
+    # only the first posting changed since it was last signed
+    conn = MockConnection(results=[[(11, memoryview(desc), memoryview(card))]])
+    detector.pool = MockConnectionPool(conn)
+
+    assert detector.add(postings) == 1
+
+    staged = buckets[0]
+    assert [row[:3] for row in staged] == [
+        (posting.title, posting.company, content_hash(posting)) for posting in postings
+    ]
+    assert staged[0][3:] == (desc, card)
+    assert staged[1][3] is None
+    assert "INSERT INTO posting_signatures" in conn.queries[2][0]
+    assert "WHERE posting_signatures.content_hash IS DISTINCT FROM" in conn.queries[2][0]
+    assert conn.queries[3] == ("DELETE FROM posting_buckets WHERE posting_id = ANY(%s)", ([11],))
+    assert len(buckets[1]) == 2 * detector.bands.bands
+    assert {posting_id for _, posting_id in buckets[1]} == {11}
+    assert not any("UPDATE postings" in sql for sql, _ in conn.queries)
+    assert conn.commits == 1
+
+
+def test_add_leaves_buckets_of_unchanged_postings_alone(buckets):
+    conn = MockConnection(results=[[]])
+    detector = NearDuplicates(MockConnectionPool(conn))
+
+    assert detector.add([_posting("Senior Python Engineer")]) == 0
+    assert len(buckets) == 1
+    assert not any("posting_buckets" in sql for sql, _ in conn.queries)
+    assert detector.add([]) == 0
+    assert conn.commits == 1
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from pytest import LogCaptureFixture, raises
+
+from sieve.pipeline import Pipeline, Stage
+from sieve.snapshot import SnapshotDriver
+
+
+PAGE = """
+<ul>{}</ul>
+"""
+
+
+def _page(page: int) -> str:
+    cards = "".join(f"<li><h3>job {page}-{card}</h3></li>" for card in range(3))
+    return PAGE.format(cards)
+
+
+def test_pipeline_streams_fetch_parse_dedupe_enrich_sink():
+    seen: set[str] = set()
+    stored: list[dict] = []
+    closed = []
+
+    def parse(source: str):
+        yield from SnapshotDriver.from_html(source).extract("//li", {"title": ".//h3"})
+
+    def unseen(card: dict) -> bool:
+        duplicate = card["title"] in seen
+        seen.add(card["title"])
+        return not duplicate
+
+    stats = Pipeline(
+        [
+            Stage.map("fetch", _page, workers=2),
+            Stage("parse", parse),
+            Stage.filter("dedupe", unseen),
+            Stage.map("enrich", lambda card: card | {"tech": "python"}, workers=3),
+            Stage.sink("sink", stored.append, close=lambda: closed.append(True)),
+        ]
+    ).run([0, 1, 2, 1])
+
+    assert len(stored) == 9
+    assert {card["tech"] for card in stored} == {"python"}
+    assert closed == [True]
+    assert [(stat.name, stat.items_in, stat.items_out) for stat in stats] == [
+        ("fetch", 4, 4),
+        ("parse", 4, 12),
+        ("dedupe", 12, 9),
+        ("enrich", 9, 9),
+        ("sink", 9, 0),
+    ]
+
+
+def test_slow_sink_throttles_the_source():
+    produced = 0
+    in_flight = []
+    lock = threading.Lock()
+
+    def source():
+        nonlocal produced
+        for item in range(200):
+            with lock:
+                produced += 1
+            yield item
+
+    def slow_sink(item: int) -> None:
+        with lock:
+            in_flight.append(produced - item)
+        time.sleep(0.001)
+
+    Pipeline(
+        [
+            Stage.map("fetch", lambda item: item, queue_size=5),
+            Stage.sink("sink", slow_sink, queue_size=5),
+        ]
+    ).run(source())
+
+    # two queues of 5, one item in each worker and one waiting on a full queue
+    assert max(in_flight) <= 5 + 5 + 3
+    assert len(in_flight) == 200
+
+
+def test_failing_items_are_logged_and_dropped(caplog: LogCaptureFixture, enable_logging):
+    def parse(item: int):
+        if item == 2:
+            raise ValueError("bad page")
+        yield item
+
+    stored: list[int] = []
+    stats = Pipeline([Stage("parse", parse), Stage.sink("sink", stored.append)]).run(range(4))
+
+    assert stored == [0, 1, 3]
+    assert stats[0].errors == 1
+    assert "[pipeline] parse failed on an item" in caplog.text
+    assert "[pipeline] sink: 3 in, 0 out, 0 errors" in caplog.text
+
+
+def test_pipeline_needs_stages():
+    with raises(ValueError):
+        Pipeline([])
@@ -0,0 +1,106 @@
+import threading
+
+from pytest import MonkeyPatch, fixture, raises
+
+from sieve.driver import init_driver
+from sieve.exceptions import SystemException
+from sieve.pool import DriverPool
+
+
+@fixture(name="pool")
+def pool_(monkeypatch: MonkeyPatch, dev_settings, patch_driver):
+    monkeypatch.setattr("sieve.driver.settings", dev_settings)
+    pool = DriverPool(size=2, max_age=60, max_uses=3, factory=init_driver)
+    yield pool
+    pool.close()
+
+
+def test_pool_reuses_warm_sessions(pool: DriverPool):
+    pool.warm()
+    assert len(pool._idle) == 2
+
+    with pool.session() as driver:
+        first = driver
+    with pool.session() as driver:
+        assert driver is first
+
+    assert pool._open == 2
+
+
+def test_pool_resets_tabs_and_cookies_between_jobs(pool: DriverPool):
+    with pool.session() as driver:
+        driver.driver.window_handles.append("tab-1")
+        driver.driver.cookies.append({"name": "li_at"})
+        driver.get("https://test-url.test")
+
+    assert driver.driver.window_handles == ["tab-0"]
+    assert driver.driver.cookies == []
+    assert driver.driver.url == DriverPool.RESET_URL
+
+
+def test_pool_keeps_cached_login_cookies_between_jobs(pool: DriverPool, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("sieve.pool.settings.session_cache_enabled", True)
+    with pool.session() as driver:
+        driver.driver.cookies.append({"name": "li_at"})
+
+    assert driver.driver.cookies == [{"name": "li_at"}]
+
+
+def test_pool_recycles_sessions_after_max_uses(pool: DriverPool):
+    for _ in range(pool.max_uses):
+        with pool.session() as driver:
+            first = driver
+
+    assert first.driver.quit_called is True
+    with pool.session() as driver:
+        assert driver is not first
+
+
+def test_pool_recycles_sessions_after_max_age(monkeypatch: MonkeyPatch, pool: DriverPool):
+    with pool.session() as driver:
+        first = driver
+
+    monkeypatch.setattr(pool, "max_age", 0)
+    with pool.session() as driver:
+        assert driver is not first
+    assert first.driver.quit_called is True
+
+
+def test_pool_replaces_unhealthy_sessions(pool: DriverPool):
+    with pool.session() as driver:
+        first = driver
+
+    # a crashed browser reports no open windows
+    first.driver.window_handles = []
+    with pool.session() as driver:
+        assert driver is not first
+
+    assert first.driver.quit_called is True
+
+
+def test_pool_blocks_until_a_session_is_returned(pool: DriverPool):
+    pool.size = 1
+    released = threading.Event()
+
+    with pool.session() as driver:
+        with raises(SystemException, match="Timed out waiting for a driver session"):
+            with pool.session(timeout=0.01):
+                pass
+
+        def wait_for_session():
+            with pool.session(timeout=1) as other:
+                assert other is driver
+                released.set()
+
+        thread = threading.Thread(target=wait_for_session)
+        thread.start()
+
+    thread.join()
+    assert released.is_set()
+
+
+def test_pool_raises_when_closed(pool: DriverPool):
+    pool.close()
+    with raises(SystemException, match="DriverPool is closed"):
+        with pool.session():
+            pass
@@ -0,0 +1,37 @@
+from sieve.profiling import ImportTiming, format_report, parse_importtime, profile_startup
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:       500 |        500 |     sieve.settings
+import time:      2000 |       2500 |   sieve.logger
+import time:       100 |       2600 | sieve.__main__
+"""
+
+
+def test_parse_importtime_reads_timings_and_nesting():
+    assert parse_importtime(IMPORTTIME_OUTPUT) == [
+        ImportTiming("_io", 120, 120, 1),
+        ImportTiming("io", 300, 420, 0),
+        ImportTiming("sieve.settings", 500, 500, 2),
+        ImportTiming("sieve.logger", 2000, 2500, 1),
+        ImportTiming("sieve.__main__", 100, 2600, 0),
+    ]
+
+
+def test_format_report_totals_top_level_imports():
+    report = format_report(parse_importtime(IMPORTTIME_OUTPUT), top=1)
+
+    assert report.startswith("startup imports: 5 modules, 3.0ms")
+    assert "2.6  sieve.__main__" in report
+    assert "2.0  sieve.logger" in report
+    assert "io\n" not in report
+
+
+def test_profile_startup_imports_modules_in_a_fresh_interpreter():
+    modules = {timing.module for timing in profile_startup(["sieve.settings"])}
+
+    assert "sieve.settings" in modules
+    assert "selenium.webdriver" not in modules
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from pytest import MonkeyPatch, fixture
+
+from sieve.driver import init_driver
+from sieve.exceptions import SystemException
+from sieve.pool import DriverPool
+from sieve.scheduler import CrawlUnit, RateLimiter, Scheduler
+
+
+@fixture(name="pool")
+def pool_(monkeypatch: MonkeyPatch, dev_settings, patch_driver):
+    monkeypatch.setattr("sieve.driver.settings", dev_settings)
+    monkeypatch.setattr(Scheduler, "BACKOFF_BASE_SECONDS", 0)
+    pool = DriverPool(size=3, factory=init_driver)
+    yield pool
+    pool.close()
+
+
+def _units(count: int, domain: str = "www.linkedin.com") -> list[CrawlUnit]:
+    return [
+        CrawlUnit("python", page, f"https://{domain}/jobs/search?keywords=python&start={page * 25}")
+        for page in range(count)
+    ]
+
+
+def test_scheduler_runs_units_concurrently_across_sessions(pool: DriverPool):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def job(driver, unit):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return unit.page
+
+    scheduler = Scheduler(pool, rate_limiter=RateLimiter(0))
+    results = scheduler.run(_units(6), job)
+
+    assert [result.value for result in results] == [0, 1, 2, 3, 4, 5]
+    assert all(result.ok for result in results)
+    assert peak[0] == 3
+
+
+def test_scheduler_retries_failed_units(pool: DriverPool):
+    attempts: dict[int, int] = {}
+
+    def job(driver, unit):
+        attempts[unit.page] = attempts.get(unit.page, 0) + 1
+        if unit.page == 1 and attempts[unit.page] < 3:
+            raise SystemException("ERROR")
+        if unit.page == 2:
+            raise SystemException("ERROR")
+        return unit.page
+
+    results = Scheduler(pool, rate_limiter=RateLimiter(0)).run(_units(3), job)
+
+    assert [(result.ok, result.attempts) for result in results] == [
+        (True, 1),
+        (True, 3),
+        (False, Scheduler.MAX_ATTEMPTS),
+    ]
+    assert str(results[2].error) == "ERROR"
+
+
+def test_scheduler_skips_units_after_the_deadline(pool: DriverPool):
+    def job(driver, unit):
+        time.sleep(0.05)
+        return unit.page
+
+    results = Scheduler(pool, workers=1, rate_limiter=RateLimiter(0), deadline=0.01).run(
+        _units(3), job
+    )
+
+    assert results[0].ok
+    assert [result.skipped for result in results[1:]] == [True, True]
+
+
+def test_rate_limiter_spaces_requests_per_domain():
+    limiter = RateLimiter(0.05, intervals={"fast.test": 0})
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait("fast.test")
+    assert time.monotonic() - start < 0.05
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait("www.linkedin.com")
+    assert time.monotonic() - start >= 0.1
@@ -0,0 +1,78 @@
+import os
+
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from sieve.screenshot import ScreenshotPolicy, ScreenshotWriter, capture_params
+
+
+def _write(writer: ScreenshotWriter, data: bytes, mtime: int) -> Path:
+    path = writer.write("ss.png", data, "jpeg").result()
+    os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+def test_screenshot_policy_from_settings(screenshot_dir: Path):
+    policy = ScreenshotPolicy.from_settings()
+
+    assert policy.mode == "full_page"
+    assert policy.format == "png"
+    assert policy.directory == str(screenshot_dir)
+
+
+def test_capture_params_follow_the_policy():
+    assert capture_params(ScreenshotPolicy(mode="viewport", format="png")) == {"format": "png"}
+    assert capture_params(ScreenshotPolicy(mode="viewport", format="jpeg", quality=50)) == {
+        "format": "jpeg",
+        "quality": 50,
+    }
+
+    params = capture_params(
+        ScreenshotPolicy(mode="full_page", max_height=100), {"width": 1920, "height": 3000}
+    )
+    assert params["captureBeyondViewport"] is True
+    assert params["clip"] == {"x": 0, "y": 0, "width": 1920, "height": 100, "scale": 1}
+
+
+def test_writer_keeps_at_most_max_files(tmp_path: Path):
+    writer = ScreenshotWriter(ScreenshotPolicy(directory=str(tmp_path), max_files=2))
+
+    paths = [_write(writer, b"x", mtime) for mtime in (1, 2, 3)]
+    writer.prune()
+
+    assert [path.exists() for path in paths] == [False, True, True]
+
+
+def test_writer_keeps_at_most_max_bytes(tmp_path: Path):
+    writer = ScreenshotWriter(ScreenshotPolicy(directory=str(tmp_path), max_bytes=10))
+
+    old = _write(writer, b"x" * 6, 1)
+    new = _write(writer, b"x" * 6, 2)
+    writer.prune()
+
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_writer_only_prunes_its_own_captures(tmp_path: Path):
+    writer = ScreenshotWriter(ScreenshotPolicy(directory=str(tmp_path), max_files=1))
+    other = tmp_path / "notes.txt"
+    other.write_bytes(b"x")
+    os.utime(other, ns=(1, 1))
+
+    old = _write(writer, b"x", 2)
+    new = _write(writer, b"x", 3)
+    writer.prune()
+
+    assert other.exists()
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_writer_logs_and_raises_on_write_errors(tmp_path: Path, monkeypatch: MonkeyPatch):
+    blocked = tmp_path / "file"
+    blocked.write_text("not a directory")
+    writer = ScreenshotWriter(ScreenshotPolicy(directory=str(blocked)))
+
+    assert writer.write("ss.png", b"x", "png").exception() is not None
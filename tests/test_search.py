@@ -0,0 +1,58 @@
+from datetime import date
+
+from sieve.search import SCHEMA, PostingSearch, SearchCursor, like_pattern
+from tests.mocks import MockConnection, MockConnectionPool
+
+
+def _row(posting_id: int, rank: float) -> tuple:
+    return (
+        posting_id,
+        f"Python Engineer {posting_id}",
+        "Acme",
+        "Remote",
+        date(2022, 10, 1),
+        f"https://www.linkedin.com/jobs/view/{posting_id}",
+        rank,
+    )
+
+
+def test_ensure_schema_runs_every_statement_in_one_transaction():
+    conn = MockConnection()
+
+    PostingSearch(MockConnectionPool(conn)).ensure_schema()
+
+    assert len(conn.queries) == len(SCHEMA)
+    assert "GENERATED ALWAYS AS" in conn.queries[1][0]
+    assert conn.commits == 1
+
+
+def test_search_returns_a_page_and_the_cursor_of_its_last_hit():
+    conn = MockConnection(results=[[_row(9, 0.5), _row(7, 0.5), _row(3, 0.1)]])
+
+    page = PostingSearch(MockConnectionPool(conn)).search("python -java", limit=2)
+
+    assert [hit.id for hit in page.hits] == [9, 7]
+    assert page.next == SearchCursor(0.5, 7)
+    sql, params = conn.queries[0]
+    assert "websearch_to_tsquery('english', %s)" in sql
+    assert "ORDER BY rank DESC, id DESC LIMIT %s" in sql
+    assert "OFFSET" not in sql
+    assert params == ["python -java", 3]
+
+
+def test_search_continues_after_a_cursor_with_filters():
+    conn = MockConnection(results=[[_row(2, 0.1)]])
+
+    page = PostingSearch(MockConnectionPool(conn)).search(
+        "python", after=SearchCursor(0.1, 3), title="engineer", company="100%"
+    )
+
+    assert page.next is None
+    sql, params = conn.queries[0]
+    assert "title ILIKE %s AND company ILIKE %s" in sql
+    assert "WHERE (rank, id) < (%s::real, %s)" in sql
+    assert params == ["python", "%engineer%", "%100\\%%", 0.1, 3, PostingSearch.PAGE_SIZE + 1]
+
+
+def test_like_pattern_escapes_wildcards():
+    assert like_pattern("c_sharp\\") == "%c\\_sharp\\\\%"
@@ -0,0 +1,149 @@
+import json
+import os
+import stat
+
+from pathlib import Path
+
+import httpx
+
+from pytest import MonkeyPatch, raises
+
+from sieve.driver import DriverProtocol
+from sieve.exceptions import SystemException
+from sieve.http import BROWSER_HEADERS
+from sieve.session import SessionCache, SessionState, decrypt, encrypt, http_probe, session_secret
+from tests.mocks import MockSettings
+
+
+SECRET = b"test secret"
+COOKIE = {"name": "li_at", "value": "token", "domain": ".linkedin.com", "path": "/"}
+
+
+def _cache(tmp_path: Path, probe=lambda state: True, **kwargs) -> SessionCache:
+    return SessionCache(tmp_path / "session.bin", ttl=3600, probe=probe, secret=SECRET, **kwargs)
+
+
+def _log_in(driver: DriverProtocol) -> None:
+    driver.driver.add_cookie(COOKIE)
+    driver.driver.local_storage["voyager-web:theme"] = "dark"
+
+
+def test_encrypt_round_trip_and_authentication():
+    blob = encrypt(b'{"cookies": []}', SECRET)
+
+    assert decrypt(blob, SECRET) == b'{"cookies": []}'
+    assert b"cookies" not in blob
+    assert encrypt(b"same", SECRET) != encrypt(b"same", SECRET)
+    with raises(ValueError, match="authentication"):
+        decrypt(blob, b"wrong secret")
+    with raises(ValueError, match="authentication"):
+        decrypt(blob[:-1] + bytes([blob[-1] ^ 1]), SECRET)
+
+
+def test_ensure_logs_in_once_then_rehydrates(tmp_path: Path, dev_driver, prod_driver):
+    logins = []
+    cache = _cache(tmp_path)
+
+    assert cache.ensure(dev_driver, lambda driver: logins.append(_log_in(driver))) is False
+    assert cache.ensure(prod_driver, lambda driver: logins.append(_log_in(driver))) is True
+
+    assert len(logins) == 1
+    assert prod_driver.driver.cookies == [COOKIE]
+    assert prod_driver.driver.local_storage == {"voyager-web:theme": "dark"}
+    assert prod_driver.driver.url == SessionCache.ORIGIN
+    assert "li_at" not in (tmp_path / "session.bin").read_bytes().decode(errors="ignore")
+
+
+def test_new_cache_reads_the_state_written_by_another(tmp_path: Path, dev_driver, prod_driver):
+    _log_in(dev_driver)
+    _cache(tmp_path).save(dev_driver)
+
+    assert _cache(tmp_path).rehydrate(prod_driver) is True
+    assert prod_driver.driver.cookies == [COOKIE]
+
+
+def test_rejected_or_expired_sessions_are_not_reused(tmp_path: Path, dev_driver, prod_driver):
+    _log_in(dev_driver)
+    _cache(tmp_path).save(dev_driver)
+
+    assert _cache(tmp_path, probe=lambda state: False).rehydrate(prod_driver) is False
+
+    state = json.loads(decrypt((tmp_path / "session.bin").read_bytes(), SECRET))
+    state["saved_at"] -= 7200
+    (tmp_path / "session.bin").write_bytes(encrypt(json.dumps(state).encode(), SECRET))
+    assert _cache(tmp_path).load() is None
+    assert prod_driver.driver.cookies == []
+
+
+def test_probe_result_is_reused(tmp_path: Path, dev_driver, prod_driver):
+    probes: list[SessionState] = []
+    _log_in(dev_driver)
+    cache = _cache(tmp_path, probe=lambda state: probes.append(state) or True)
+    cache.clear()
+    _cache(tmp_path).save(dev_driver)
+
+    cache.rehydrate(dev_driver)
+    cache.rehydrate(prod_driver)
+
+    assert len(probes) == 1
+
+
+def test_saved_cache_is_only_readable_by_the_owner(tmp_path: Path, dev_driver):
+    stale = tmp_path / "session.tmp"
+    stale.write_bytes(b"")
+    os.chmod(stale, 0o644)
+
+    _log_in(dev_driver)
+    _cache(tmp_path).save(dev_driver)
+
+    assert stat.S_IMODE((tmp_path / "session.bin").stat().st_mode) == 0o600
+
+
+def test_http_probe_sends_browser_headers(monkeypatch: MonkeyPatch):
+    requests: list[dict] = []
+
+    def get(url, **kwargs):
+        requests.append(kwargs)
+        return httpx.Response(200)
+
+    monkeypatch.setattr("sieve.session.httpx.get", get)
+
+    assert http_probe(SessionState(SessionCache.ORIGIN, cookies=[COOKIE])) is True
+    assert requests[0]["headers"] == BROWSER_HEADERS
+    assert requests[0]["cookies"] == {"li_at": "token"}
+
+
+def test_unreadable_cache_is_ignored(tmp_path: Path):
+    (tmp_path / "session.bin").write_bytes(b"garbage")
+
+    assert _cache(tmp_path).load() is None
+
+
+def test_session_secret_comes_from_settings(monkeypatch: MonkeyPatch, dev_settings: MockSettings):
+    monkeypatch.setattr("sieve.session.settings", dev_settings)
+    assert session_secret() == b"dev_user\x1fdev_pass"
+
+    monkeypatch.setattr(
+        "sieve.session.settings", dev_settings.copy(update={"linkedin_email": None})
+    )
+    with raises(SystemException):
+        session_secret()
+
+
+def test_init_driver_rehydrates_from_the_shared_cache(
+    monkeypatch: MonkeyPatch, dev_settings: MockSettings, patch_driver, tmp_path: Path
+):
+    from sieve.driver import init_driver
+
+    monkeypatch.setattr(
+        "sieve.driver.settings", dev_settings.copy(update={"session_cache_enabled": True})
+    )
+    cache = _cache(tmp_path)
+    monkeypatch.setattr("sieve.session.SESSION_CACHE", cache)
+    logged_in = init_driver()
+    _log_in(logged_in)
+    cache.save(logged_in)
+
+    driver = init_driver()
+
+    assert driver.driver.cookies == [COOKIE]
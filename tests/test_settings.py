@@ -12,17 +12,44 @@ def test_settings_defaults():
         "app_env": "dev",
         "hostname": "localhost",
         "log_level": "DEBUG",
+        "daemon_interval_seconds": 300,
+        "log_queue_enabled": False,
+        "log_queue_size": 10_000,
+        "log_queue_overflow": "drop",
         "db_name": "sieve_db",
         "db_user": SecretStr("sieve_user"),
         "db_pass": SecretStr("pass"),
         "db_host": "db",
+        "db_pool_size": 4,
+        "dedupe_capacity": 1_000_000,
+        "dedupe_error_rate": 0.001,
+        "dedupe_snapshot_path": "cache/known_postings.bin",
+        "crawl_max_pages": 40,
+        "crawl_full_sweep_hours": 168,
+        "tech_dictionary_path": None,
         "linkedin_email": None,
         "linkedin_pass": None,
+        "session_cache_enabled": False,
+        "session_cache_path": "cache/session.bin",
+        "session_cache_ttl_hours": 24,
+        "session_secret": None,
         "dd_site": None,
         "dd_api_key": None,
         "app_name": "sieve",
         "driver_width": 1200,
         "driver_height": 800,
+        "max_concurrent_sessions": 1,
+        "driver_max_age_seconds": 1800,
+        "driver_max_uses": 50,
+        "driver_instrument": False,
+        "driver_profile": "full",
+        "driver_track_transfer": False,
+        "screenshot_mode": "full_page",
+        "screenshot_format": "png",
+        "screenshot_quality": 70,
+        "screenshot_dir": "screenshots",
+        "screenshot_max_files": 50,
+        "screenshot_max_bytes": 52428800,
     }
 
 
@@ -33,18 +60,45 @@ def test_test_settings(monkeypatch: MonkeyPatch, test_settings: MockSettings):
     assert settings.dict() == {
         "app_env": "test",
         "log_level": "DEBUG",
+        "daemon_interval_seconds": 300,
+        "log_queue_enabled": False,
+        "log_queue_size": 10_000,
+        "log_queue_overflow": "drop",
         "hostname": "localhost",
         "linkedin_email": SecretStr("test_user"),
         "linkedin_pass": SecretStr("test_pass"),
+        "session_cache_enabled": False,
+        "session_cache_path": "cache/session.bin",
+        "session_cache_ttl_hours": 24,
+        "session_secret": None,
         "db_name": "test_db",
         "db_user": SecretStr("test_user"),
         "db_pass": SecretStr("test_pass"),
         "db_host": "localhost",
+        "db_pool_size": 4,
+        "dedupe_capacity": 1_000_000,
+        "dedupe_error_rate": 0.001,
+        "dedupe_snapshot_path": "cache/known_postings.bin",
+        "crawl_max_pages": 40,
+        "crawl_full_sweep_hours": 168,
+        "tech_dictionary_path": None,
         "dd_site": SecretStr("test.datadog.site"),
         "dd_api_key": SecretStr("test_api_key"),
         "app_name": "test_service",
         "driver_width": 1200,
         "driver_height": 800,
+        "max_concurrent_sessions": 1,
+        "driver_max_age_seconds": 1800,
+        "driver_max_uses": 50,
+        "driver_instrument": False,
+        "driver_profile": "full",
+        "driver_track_transfer": False,
+        "screenshot_mode": "full_page",
+        "screenshot_format": "png",
+        "screenshot_quality": 70,
+        "screenshot_dir": "screenshots",
+        "screenshot_max_files": 50,
+        "screenshot_max_bytes": 52428800,
     }
     assert test_settings.is_dev is False
     assert test_settings.is_test is True
@@ -58,18 +112,45 @@ def test_dev_settings(monkeypatch: MonkeyPatch, dev_settings: MockSettings):
     assert settings.dict() == {
         "app_env": "dev",
         "log_level": "DEBUG",
+        "daemon_interval_seconds": 300,
+        "log_queue_enabled": False,
+        "log_queue_size": 10_000,
+        "log_queue_overflow": "drop",
         "hostname": "dev_host",
         "linkedin_email": SecretStr("dev_user"),
         "linkedin_pass": SecretStr("dev_pass"),
+        "session_cache_enabled": False,
+        "session_cache_path": "cache/session.bin",
+        "session_cache_ttl_hours": 24,
+        "session_secret": None,
         "db_name": "dev_db",
         "db_user": SecretStr("dev_user"),
         "db_pass": SecretStr("dev_pass"),
         "db_host": "dev_host",
+        "db_pool_size": 4,
+        "dedupe_capacity": 1_000_000,
+        "dedupe_error_rate": 0.001,
+        "dedupe_snapshot_path": "cache/known_postings.bin",
+        "crawl_max_pages": 40,
+        "crawl_full_sweep_hours": 168,
+        "tech_dictionary_path": None,
         "dd_site": SecretStr("dev.datadog.site"),
         "dd_api_key": SecretStr("dev_api_key"),
         "app_name": "dev_service",
         "driver_width": 1200,
         "driver_height": 800,
+        "max_concurrent_sessions": 1,
+        "driver_max_age_seconds": 1800,
+        "driver_max_uses": 50,
+        "driver_instrument": False,
+        "driver_profile": "full",
+        "driver_track_transfer": False,
+        "screenshot_mode": "full_page",
+        "screenshot_format": "png",
+        "screenshot_quality": 70,
+        "screenshot_dir": "screenshots",
+        "screenshot_max_files": 50,
+        "screenshot_max_bytes": 52428800,
     }
     assert dev_settings.is_dev is True
     assert dev_settings.is_test is False
@@ -83,18 +164,45 @@ def test_prod_settings(monkeypatch: MonkeyPatch, prod_settings: MockSettings):
     assert settings.dict() == {
         "app_env": "prod",
         "log_level": "INFO",
+        "daemon_interval_seconds": 300,
+        "log_queue_enabled": False,
+        "log_queue_size": 10_000,
+        "log_queue_overflow": "drop",
         "hostname": "prod_host",
         "linkedin_email": SecretStr("prod_user"),
         "linkedin_pass": SecretStr("prod_pass"),
+        "session_cache_enabled": False,
+        "session_cache_path": "cache/session.bin",
+        "session_cache_ttl_hours": 24,
+        "session_secret": None,
         "db_name": "prod_db",
         "db_user": SecretStr("prod_user"),
         "db_pass": SecretStr("prod_pass"),
         "db_host": "prod_host",
+        "db_pool_size": 4,
+        "dedupe_capacity": 1_000_000,
+        "dedupe_error_rate": 0.001,
+        "dedupe_snapshot_path": "cache/known_postings.bin",
+        "crawl_max_pages": 40,
+        "crawl_full_sweep_hours": 168,
+        "tech_dictionary_path": None,
         "dd_site": SecretStr("prod.datadog.site"),
         "dd_api_key": SecretStr("prod_api_key"),
         "app_name": "prod_service",
         "driver_width": 1200,
         "driver_height": 800,
+        "max_concurrent_sessions": 1,
+        "driver_max_age_seconds": 1800,
+        "driver_max_uses": 50,
+        "driver_instrument": False,
+        "driver_profile": "full",
+        "driver_track_transfer": False,
+        "screenshot_mode": "full_page",
+        "screenshot_format": "png",
+        "screenshot_quality": 70,
+        "screenshot_dir": "screenshots",
+        "screenshot_max_files": 50,
+        "screenshot_max_bytes": 52428800,
     }
     assert prod_settings.is_dev is False
     assert prod_settings.is_test is False
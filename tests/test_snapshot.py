@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from pytest import raises
+from selenium.common.exceptions import NoSuchElementException
+
+from sieve.driver import DriverProtocol
+from sieve.snapshot import SnapshotDriver
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+RESULTS_URL = "https://www.linkedin.com/jobs/search?keywords=python"
+DETAIL_URL = "https://www.linkedin.com/jobs/view/3300000000"
+
+CARD_FIELDS = {
+    "title": ".//h3[contains(@class, 'base-search-card__title')]",
+    "company": ".//h4[contains(@class, 'base-search-card__subtitle')]",
+    "location": ".//span[contains(@class, 'job-search-card__location')]",
+    "salary": ".//span[contains(@class, 'job-search-card__salary-info')]",
+    "date": ".//time/@datetime",
+    "link": ".//a[contains(@class, 'base-card__full-link')]/@href",
+}
+
+
+def _snapshot_driver() -> SnapshotDriver:
+    return SnapshotDriver.from_files(
+        {
+            RESULTS_URL: FIXTURES / "search_results.html",
+            DETAIL_URL: FIXTURES / "job_detail.html",
+        }
+    )
+
+
+def test_snapshot_driver_extracts_result_cards():
+    driver = _snapshot_driver()
+    driver.get(RESULTS_URL)
+
+    records = driver.extract("//ul[contains(@class, 'jobs-search__results-list')]/li", CARD_FIELDS)
+
+    assert len(records) == 25
+    assert records[0] == {
+        "title": "Python Engineer",
+        "company": "Acme",
+        "location": "Remote",
+        "salary": "$140,000.00 - $180,000.00",
+        "date": "2022-10-01",
+        "link": "https://www.linkedin.com/jobs/view/python-engineer-at-acme-3300000000?trk=public_jobs",
+    }
+    assert records[1]["salary"] is None
+
+
+def test_snapshot_driver_element_text_skips_scripts_and_styles():
+    driver = _snapshot_driver()
+    driver.get(DETAIL_URL)
+
+    assert driver.element("//h1").text == "Python Engineer"
+    description = driver.element("//div[contains(@class, 'show-more-less-html__markup')]").text
+    assert description.startswith("Acme is hiring a Python Engineer to build")
+    assert "__tracking" not in driver.element("//body").text
+
+
+def test_snapshot_driver_element_raises_when_not_found():
+    driver = SnapshotDriver.from_html("<html><body><p>text</p></body></html>")
+
+    with raises(NoSuchElementException, match="No elements found: //h1"):
+        driver.element("//h1")
+    assert driver.elements("//p/text()") == []
+
+
+def test_snapshot_driver_from_driver_parses_page_source_once_per_page(
+    dev_driver: DriverProtocol,
+):
+    dev_driver.driver.page_source = "<html><body><h1>first</h1></body></html>"
+    driver = SnapshotDriver.from_driver(dev_driver)
+    dev_driver.driver.page_source = "<html><body><h1>second</h1></body></html>"
+
+    assert driver.element("//h1").text == "first"
+
+    driver.get("https://test-url.test")
+    assert dev_driver.driver.url == "https://test-url.test"
+    assert driver.element("//h1").text == "second"
@@ -0,0 +1,59 @@
+import json
+
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from sieve.tech import TechTagger, get_tech_tagger
+from tests.mocks import MockSettings
+
+
+def test_tag_finds_aliases_in_order_of_first_mention():
+    tagger = TechTagger()
+
+    tags = tagger.tag(
+        "Ruby on\nRails and PostgreSQL today, Python3 and k8s tomorrow. Also Postgres, python."
+    )
+
+    assert tags == ["ruby", "rails", "postgres", "python", "kubernetes"]
+
+
+def test_tag_respects_word_boundaries():
+    tagger = TechTagger()
+
+    assert tagger.tag("JavaScript, not java.") == ["javascript", "java"]
+    assert tagger.tag("Javascript only") == ["javascript"]
+    assert tagger.tag("mysql") == ["mysql"]
+    assert tagger.tag("Modern C++17, C# and ASP.NET") == ["c++", "c#", ".net"]
+    assert tagger.tag("gitlab dockerized sparkling") == []
+    assert tagger.tag(None) == []
+
+
+def test_overlapping_aliases_are_all_found():
+    tagger = TechTagger({"spark": ["apache spark"], "apache": [], "park": []})
+
+    assert tagger.tag("apache spark") == ["apache", "spark"]
+    assert tagger.tag_many(["sparks", "park"]) == [[], ["park"]]
+
+
+def test_column_fits_postings_tech(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(TechTagger, "MAX_LENGTH", 20)
+    tagger = TechTagger()
+
+    assert tagger.column("python, django, postgres and redis") == "python, django"
+
+
+def test_dictionary_from_settings(
+    monkeypatch: MonkeyPatch, dev_settings: MockSettings, tmp_path: Path
+):
+    dictionary = tmp_path / "tech.json"
+    dictionary.write_text(json.dumps({"sieve": ["sieve-scraper"]}), encoding="utf-8")
+    monkeypatch.setattr(
+        "sieve.tech.settings", dev_settings.copy(update={"tech_dictionary_path": str(dictionary)})
+    )
+    monkeypatch.setattr("sieve.tech.TECH_TAGGER", None)
+
+    tagger = get_tech_tagger()
+
+    assert tagger.tag("the Sieve-Scraper repo, python") == ["sieve"]
+    assert get_tech_tagger() is tagger